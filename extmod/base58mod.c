@@ -0,0 +1,154 @@
+/*
+  mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+  Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+
+  This program is free software: you can redistribute it and/or modify it under
+  the terms of the GNU General Public License as published by the Free Software
+  Foundation, either version 3 of the License, or (at your option) any later
+  version.
+
+  This program is distributed in the hope that it will be useful, but WITHOUT
+  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+  FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+  details.
+
+  You should have received a copy of the GNU General Public License along with
+  this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+/*
+  Base58 encoding and decoding of byte strings.  As with Bitcoin Core's
+  EncodeBase58()/DecodeBase58(), each leading zero byte is represented by a
+  leading '1'.  Checksums are handled by the caller (mmgen/protocol.py).
+*/
+
+#include <Python.h>
+
+static const char b58digits[] = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz";
+
+static int b58map[256];
+
+static PyObject * do_encode(const unsigned char *data, Py_ssize_t len) {
+	Py_ssize_t zeroes = 0, length = 0, size, i, j;
+	while (zeroes < len && data[zeroes] == 0) zeroes++;
+	size = (len - zeroes) * 138 / 100 + 1; /* log(256) / log(58), rounded up */
+	unsigned char *b58 = PyMem_Malloc(size);
+	if (b58 == NULL) return PyErr_NoMemory();
+	memset(b58, 0, size);
+	for (i = zeroes; i < len; i++) {
+		int carry = data[i];
+		for (j = 0; (carry != 0 || j < length) && j < size; j++) {
+			carry += 256 * b58[size-1-j];
+			b58[size-1-j] = carry % 58;
+			carry /= 58;
+		}
+		length = j;
+	}
+	j = size - length;
+	while (j < size && b58[j] == 0) j++;
+	PyObject *ret = PyString_FromStringAndSize(NULL, zeroes + size - j);
+	if (ret != NULL) {
+		char *out = PyString_AS_STRING(ret);
+		memset(out, '1', zeroes);
+		for (i = zeroes; j < size; i++, j++) out[i] = b58digits[b58[j]];
+	}
+	PyMem_Free(b58);
+	return ret;
+}
+
+static PyObject * do_decode(const char *s, Py_ssize_t len) {
+	Py_ssize_t zeroes = 0, length = 0, size, i, j;
+	while (zeroes < len && s[zeroes] == '1') zeroes++;
+	size = (len - zeroes) * 733 / 1000 + 1; /* log(58) / log(256), rounded up */
+	unsigned char *b256 = PyMem_Malloc(size);
+	if (b256 == NULL) return PyErr_NoMemory();
+	memset(b256, 0, size);
+	for (i = zeroes; i < len; i++) {
+		int carry = b58map[(unsigned char)s[i]];
+		if (carry == -1) {
+			PyMem_Free(b256);
+			PyErr_Format(PyExc_ValueError, "'%c': invalid base58 character", s[i]);
+			return NULL;
+		}
+		for (j = 0; (carry != 0 || j < length) && j < size; j++) {
+			carry += 58 * b256[size-1-j];
+			b256[size-1-j] = carry % 256;
+			carry /= 256;
+		}
+		length = j;
+	}
+	j = size - length;
+	while (j < size && b256[j] == 0) j++;
+	PyObject *ret = PyString_FromStringAndSize(NULL, zeroes + size - j);
+	if (ret != NULL) {
+		char *out = PyString_AS_STRING(ret);
+		memset(out, 0, zeroes);
+		memcpy(out + zeroes, b256 + j, size - j);
+	}
+	PyMem_Free(b256);
+	return ret;
+}
+
+static PyObject * encode(PyObject *self, PyObject *args) {
+	const unsigned char * data;
+	int len;
+	if (!PyArg_ParseTuple(args, "t#", &data, &len))
+		return NULL;
+	return do_encode(data, len);
+}
+
+static PyObject * decode(PyObject *self, PyObject *args) {
+	const char * s;
+	int len;
+	if (!PyArg_ParseTuple(args, "s#", &s, &len))
+		return NULL;
+	return do_decode(s, len);
+}
+
+/* Apply encode or decode to each item of a sequence, returning a list */
+static PyObject * map_seq(PyObject *args, int encode) {
+	PyObject *seq, *fast, *ret, *item;
+	Py_ssize_t n, i;
+	char *buf;
+	Py_ssize_t len;
+	if (!PyArg_ParseTuple(args, "O", &seq))
+		return NULL;
+	fast = PySequence_Fast(seq, "argument must be a sequence");
+	if (fast == NULL) return NULL;
+	n = PySequence_Fast_GET_SIZE(fast);
+	ret = PyList_New(n);
+	if (ret == NULL) goto err;
+	for (i = 0; i < n; i++) {
+		if (PyString_AsStringAndSize(PySequence_Fast_GET_ITEM(fast, i), &buf, &len) == -1)
+			goto err;
+		item = encode ? do_encode((unsigned char *)buf, len) : do_decode(buf, len);
+		if (item == NULL) goto err;
+		PyList_SET_ITEM(ret, i, item);
+	}
+	Py_DECREF(fast);
+	return ret;
+err:
+	Py_DECREF(fast);
+	Py_XDECREF(ret);
+	return NULL;
+}
+
+static PyObject * encode_many(PyObject *self, PyObject *args) { return map_seq(args, 1); }
+static PyObject * decode_many(PyObject *self, PyObject *args) { return map_seq(args, 0); }
+
+static PyMethodDef base58Methods[] = {
+	{"encode", encode, METH_VARARGS, "Encode a byte string to base58"},
+	{"decode", decode, METH_VARARGS, "Decode a base58 string to a byte string"},
+	{"encode_many", encode_many, METH_VARARGS, "Encode a sequence of byte strings to base58"},
+	{"decode_many", decode_many, METH_VARARGS, "Decode a sequence of base58 strings to byte strings"},
+	{NULL, NULL, 0, NULL} /* Sentinel */
+};
+
+PyMODINIT_FUNC initbase58(void) {
+	PyObject *m;
+	int i;
+	for (i = 0; i < 256; i++) b58map[i] = -1;
+	for (i = 0; i < 58; i++) b58map[(unsigned char)b58digits[i]] = i;
+	m = Py_InitModule("base58", base58Methods);
+	if (m == NULL) return;
+}
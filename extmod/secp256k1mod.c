@@ -19,6 +19,15 @@
 #include <Python.h>
 #include <secp256k1.h>
 
+static secp256k1_context * get_ctx(void) {
+	static secp256k1_context *ctx = NULL;
+	if (ctx == NULL) {
+	/*	puts ("Initializing context"); */
+		ctx = secp256k1_context_create(SECP256K1_CONTEXT_SIGN | SECP256K1_CONTEXT_VERIFY);
+	}
+	return ctx;
+}
+
 static PyObject * priv2pub(PyObject *self, PyObject *args) {
 	const unsigned char * privkey;
 	const int klen;
@@ -32,11 +41,7 @@ static PyObject * priv2pub(PyObject *self, PyObject *args) {
 	secp256k1_pubkey pubkey;
 	size_t pubkeyclen = compressed == 1 ? 33: 65;
 	unsigned char pubkeyc[pubkeyclen];
-	static secp256k1_context *ctx = NULL;
-	if (ctx == NULL) {
-	/*	puts ("Initializing context"); */
-		ctx = secp256k1_context_create(SECP256K1_CONTEXT_SIGN | SECP256K1_CONTEXT_VERIFY);
-	}
+	secp256k1_context *ctx = get_ctx();
 	if (secp256k1_ec_pubkey_create(ctx, &pubkey, privkey) != 1) {
 		PyErr_SetString(PyExc_RuntimeError, "Public key creation failed");
 		return NULL;
@@ -49,8 +54,109 @@ static PyObject * priv2pub(PyObject *self, PyObject *args) {
 	return Py_BuildValue("s#", pubkeyc,pubkeyclen);
 }
 
+/*
+  Batch version of priv2pub(): 'privkeys' is a buffer of N concatenated 32-byte
+  private keys, the return value a string of N concatenated serialized pubkeys.
+  The GIL is released while the keys are processed.
+*/
+static PyObject * priv2pub_batch(PyObject *self, PyObject *args) {
+	const unsigned char * privkeys;
+	const int klen;
+	const int compressed;
+	if (!PyArg_ParseTuple(args, "t#I", &privkeys, &klen, &compressed))
+		return NULL;
+	if (klen % 32) {
+		PyErr_SetString(PyExc_ValueError, "Private key data length not a multiple of 32 bytes");
+		return NULL;
+	}
+	size_t nkeys = klen / 32;
+	size_t pubkeyclen = compressed == 1 ? 33: 65;
+	PyObject *ret = PyString_FromStringAndSize(NULL, nkeys * pubkeyclen);
+	if (ret == NULL) return NULL;
+	unsigned char *out = (unsigned char *)PyString_AS_STRING(ret);
+	secp256k1_context *ctx = get_ctx();
+	secp256k1_pubkey pubkey;
+	size_t i, outlen;
+	int err = 0;
+	Py_BEGIN_ALLOW_THREADS
+	for (i = 0; i < nkeys; i++) {
+		outlen = pubkeyclen;
+		if (secp256k1_ec_pubkey_create(ctx, &pubkey, privkeys + i*32) != 1) { err = 1; break; }
+		if (secp256k1_ec_pubkey_serialize(ctx, out + i*pubkeyclen, &outlen, &pubkey,
+				compressed == 1 ? SECP256K1_EC_COMPRESSED: SECP256K1_EC_UNCOMPRESSED) != 1) { err = 2; break; }
+	}
+	Py_END_ALLOW_THREADS
+	if (err) {
+		Py_DECREF(ret);
+		PyErr_Format(PyExc_RuntimeError, "Public key %s failed for key #%zu",
+			err == 1 ? "creation" : "serialization", i);
+		return NULL;
+	}
+	return ret;
+}
+
+/*
+  Sign a 32-byte message hash, returning a DER-encoded signature.  libsecp256k1
+  uses RFC6979 nonces and always produces lower-S signatures, as required by
+  the Bitcoin network's standardness rules.
+*/
+static PyObject * sign(PyObject *self, PyObject *args) {
+	const unsigned char * msghash;
+	const unsigned char * privkey;
+	const int mlen, klen;
+	if (!PyArg_ParseTuple(args, "t#t#", &msghash, &mlen, &privkey, &klen))
+		return NULL;
+	if (mlen != 32) {
+		PyErr_SetString(PyExc_ValueError, "Message hash length not 32 bytes");
+		return NULL;
+	}
+	if (klen != 32) {
+		PyErr_SetString(PyExc_ValueError, "Private key length not 32 bytes");
+		return NULL;
+	}
+	secp256k1_ecdsa_signature sig;
+	unsigned char der[72];
+	size_t derlen = sizeof(der);
+	secp256k1_context *ctx = get_ctx();
+	if (secp256k1_ecdsa_sign(ctx, &sig, msghash, privkey, NULL, NULL) != 1) {
+		PyErr_SetString(PyExc_RuntimeError, "Signing failed");
+		return NULL;
+	}
+	if (secp256k1_ecdsa_signature_serialize_der(ctx, der, &derlen, &sig) != 1) {
+		PyErr_SetString(PyExc_RuntimeError, "Signature serialization failed");
+		return NULL;
+	}
+	return Py_BuildValue("s#", der, derlen);
+}
+
+/* Verify a DER-encoded signature, returning True only for valid lower-S signatures */
+static PyObject * verify(PyObject *self, PyObject *args) {
+	const unsigned char * dersig;
+	const unsigned char * msghash;
+	const unsigned char * pubkeyc;
+	const int slen, mlen, plen;
+	if (!PyArg_ParseTuple(args, "t#t#t#", &dersig, &slen, &msghash, &mlen, &pubkeyc, &plen))
+		return NULL;
+	if (mlen != 32) {
+		PyErr_SetString(PyExc_ValueError, "Message hash length not 32 bytes");
+		return NULL;
+	}
+	secp256k1_ecdsa_signature sig;
+	secp256k1_pubkey pubkey;
+	secp256k1_context *ctx = get_ctx();
+	if (secp256k1_ecdsa_signature_parse_der(ctx, &sig, dersig, slen) != 1 ||
+		secp256k1_ec_pubkey_parse(ctx, &pubkey, pubkeyc, plen) != 1)
+		Py_RETURN_FALSE;
+	if (secp256k1_ecdsa_verify(ctx, &sig, msghash, &pubkey) != 1)
+		Py_RETURN_FALSE;
+	Py_RETURN_TRUE;
+}
+
 static PyMethodDef secp256k1Methods[] = {
 	{"priv2pub", priv2pub, METH_VARARGS, "Generate pubkey from privkey using libsecp256k1"},
+	{"priv2pub_batch", priv2pub_batch, METH_VARARGS, "Generate pubkeys from a buffer of privkeys using libsecp256k1"},
+	{"sign", sign, METH_VARARGS, "Sign a message hash with a privkey using libsecp256k1"},
+	{"verify", verify, METH_VARARGS, "Verify a DER signature of a message hash using libsecp256k1"},
 	{NULL, NULL, 0, NULL} /* Sentinel */
 };
 
@@ -0,0 +1,127 @@
+/*
+  mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+  Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+
+  This program is free software: you can redistribute it and/or modify it under
+  the terms of the GNU General Public License as published by the Free Software
+  Foundation, either version 3 of the License, or (at your option) any later
+  version.
+
+  This program is distributed in the hope that it will be useful, but WITHOUT
+  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+  FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+  details.
+
+  You should have received a copy of the GNU General Public License along with
+  this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+/*
+  The raw SHA256 compression function: a single 64-byte block is processed
+  with the standard initial hash values and no padding, and the resulting
+  hash state returned as 32 bytes.  Used for Zcash z-address generation
+  (see mmgen/sha256.py).
+*/
+
+#include <Python.h>
+#include <stdint.h>
+
+static const uint32_t K[64] = {
+	0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+	0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+	0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+	0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+	0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+	0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+	0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+	0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+static const uint32_t H0[8] = {
+	0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+};
+
+#define ROR(x,n) (((x) >> (n)) | ((x) << (32 - (n))))
+
+static void do_compress(const unsigned char *block, unsigned char *out) {
+	uint32_t W[64], a, b, c, d, e, f, g, h, t1, t2;
+	int i;
+	for (i = 0; i < 16; i++)
+		W[i] = (uint32_t)block[i*4] << 24 | (uint32_t)block[i*4+1] << 16 |
+				(uint32_t)block[i*4+2] << 8 | (uint32_t)block[i*4+3];
+	for (i = 16; i < 64; i++)
+		W[i] = (ROR(W[i-2],17) ^ ROR(W[i-2],19) ^ (W[i-2] >> 10)) + W[i-7] +
+				(ROR(W[i-15],7) ^ ROR(W[i-15],18) ^ (W[i-15] >> 3)) + W[i-16];
+	a = H0[0]; b = H0[1]; c = H0[2]; d = H0[3];
+	e = H0[4]; f = H0[5]; g = H0[6]; h = H0[7];
+	for (i = 0; i < 64; i++) {
+		t1 = h + (ROR(e,6) ^ ROR(e,11) ^ ROR(e,25)) + ((e & f) ^ (~e & g)) + K[i] + W[i];
+		t2 = (ROR(a,2) ^ ROR(a,13) ^ ROR(a,22)) + ((a & b) ^ (a & c) ^ (b & c));
+		h = g; g = f; f = e; e = d + t1;
+		d = c; c = b; b = a; a = t1 + t2;
+	}
+	uint32_t H[8] = { a, b, c, d, e, f, g, h };
+	for (i = 0; i < 8; i++) {
+		H[i] += H0[i];
+		out[i*4]   = H[i] >> 24;
+		out[i*4+1] = H[i] >> 16;
+		out[i*4+2] = H[i] >> 8;
+		out[i*4+3] = H[i];
+	}
+}
+
+static PyObject * compress_str(const char *buf, Py_ssize_t len) {
+	if (len != 64) {
+		PyErr_Format(PyExc_ValueError, "%d: incorrect block length (must be 64)", (int)len);
+		return NULL;
+	}
+	PyObject *ret = PyString_FromStringAndSize(NULL, 32);
+	if (ret != NULL) do_compress((const unsigned char *)buf, (unsigned char *)PyString_AS_STRING(ret));
+	return ret;
+}
+
+static PyObject * compress(PyObject *self, PyObject *args) {
+	const char * buf;
+	int len;
+	if (!PyArg_ParseTuple(args, "t#", &buf, &len))
+		return NULL;
+	return compress_str(buf, len);
+}
+
+static PyObject * compress_many(PyObject *self, PyObject *args) {
+	PyObject *seq, *fast, *ret, *item;
+	Py_ssize_t n, i, len;
+	char *buf;
+	if (!PyArg_ParseTuple(args, "O", &seq))
+		return NULL;
+	fast = PySequence_Fast(seq, "argument must be a sequence");
+	if (fast == NULL) return NULL;
+	n = PySequence_Fast_GET_SIZE(fast);
+	ret = PyList_New(n);
+	if (ret == NULL) goto err;
+	for (i = 0; i < n; i++) {
+		if (PyString_AsStringAndSize(PySequence_Fast_GET_ITEM(fast, i), &buf, &len) == -1)
+			goto err;
+		item = compress_str(buf, len);
+		if (item == NULL) goto err;
+		PyList_SET_ITEM(ret, i, item);
+	}
+	Py_DECREF(fast);
+	return ret;
+err:
+	Py_DECREF(fast);
+	Py_XDECREF(ret);
+	return NULL;
+}
+
+static PyMethodDef sha256compressMethods[] = {
+	{"compress", compress, METH_VARARGS, "Apply the SHA256 compression function to a 64-byte block"},
+	{"compress_many", compress_many, METH_VARARGS, "Apply the SHA256 compression function to a sequence of 64-byte blocks"},
+	{NULL, NULL, 0, NULL} /* Sentinel */
+};
+
+PyMODINIT_FUNC initsha256compress(void) {
+	PyObject *m;
+	m = Py_InitModule("sha256compress", sha256compressMethods);
+	if (m == NULL) return;
+}
@@ -31,6 +31,44 @@ pnm = g.proj_name
 def dmsg_sc(desc,data):
 	if g.debug_addrlist: Msg(u'sc_debug_{}: {}'.format(desc,data))
 
+# Worker process target for parallel address generation.  Entries are sent back to
+# the parent in chunks, followed by None.  Exceptions are passed to the parent too.
+def _mp_gen_worker(conn,al,secs,kg,ag):
+	try:
+		n = al.mp_chunk_len
+		for i in range(0,len(secs),n):
+			conn.send(list(al.gen_entries(secs[i:i+n],kg,ag)))
+		conn.send(None)
+	except Exception as e:
+		conn.send(e)
+	conn.close()
+
+# Worker process target for parallel key-to-address checking.  For each chunk, the
+# number of entries checked and the position of the first bad entry (or None) are
+# sent to the parent.  The worker stops at the first bad entry.
+def _mp_check_worker(conn,al,data,kg,ag):
+	try:
+		n = al.mp_chunk_len
+		for i in range(0,len(data),n):
+			bad = al.find_key_mismatch(data[i:i+n],kg,ag)
+			conn.send((len(data[i:i+n]),None if bad is None else i+bad))
+			if bad is not None: break
+		conn.send(None)
+	except Exception as e:
+		conn.send(e)
+	conn.close()
+
+# Data objects returned by the workers have already been checked, so don't run their
+# constructors (and thus the checks) again when unpickling them in the parent
+def _mp_unpickle_str_obj(cls,s,d):
+	me = str.__new__(cls,s)
+	me.__dict__.update(d)
+	return me
+
+import copy_reg
+for _cls in (PrivKey,WifKey,CoinAddr,ZcashViewKey,MoneroViewKey,WalletPassword):
+	copy_reg.pickle(_cls,lambda o: (_mp_unpickle_str_obj,(type(o),str(o),o.__dict__)))
+
 class AddrGenerator(MMGenObject):
 	def __new__(cls,addr_type):
 		if type(addr_type) == str: # allow override w/o check
@@ -52,11 +90,14 @@ class AddrGenerator(MMGenObject):
 		me.desc = gen_methods
 		return me
 
+	def to_addrs(self,pubhexes): # overridden by generators with a batch method
+		return [self.to_addr(pubhex) for pubhex in pubhexes]
+
 class AddrGeneratorP2PKH(AddrGenerator):
 	def to_addr(self,pubhex):
-		from mmgen.protocol import hash160
+		from mmgen.protocol import hash160_bin
 		assert type(pubhex) == PubKey
-		return CoinAddr(g.proto.pubhash2addr(hash160(pubhex),p2sh=False))
+		return CoinAddr(g.proto.pubhash_bin2addr(hash160_bin(unhexlify(pubhex)),p2sh=False))
 
 	def to_segwit_redeem_script(self,pubhex):
 		raise NotImplementedError,'Segwit redeem script not supported by this address type'
@@ -64,17 +105,22 @@ class AddrGeneratorP2PKH(AddrGenerator):
 class AddrGeneratorSegwit(AddrGenerator):
 	def to_addr(self,pubhex):
 		assert pubhex.compressed,'Uncompressed public keys incompatible with Segwit'
-		return CoinAddr(g.proto.pubhex2segwitaddr(pubhex))
+		return CoinAddr(g.proto.pubkey_bin2segwitaddr(unhexlify(pubhex)))
 
 	def to_segwit_redeem_script(self,pubhex):
 		assert pubhex.compressed,'Uncompressed public keys incompatible with Segwit'
-		return HexStr(g.proto.pubhex2redeem_script(pubhex))
+		return HexStr(hexlify(g.proto.pubkey_bin2redeem_script(unhexlify(pubhex))))
 
 class AddrGeneratorBech32(AddrGenerator):
 	def to_addr(self,pubhex):
 		assert pubhex.compressed,'Uncompressed public keys incompatible with Segwit'
-		from mmgen.protocol import hash160
-		return CoinAddr(g.proto.pubhash2bech32addr(hash160(pubhex)))
+		from mmgen.protocol import hash160_bin
+		return CoinAddr(g.proto.pubhash_bin2bech32addr(hash160_bin(unhexlify(pubhex))))
+
+	def to_addrs(self,pubhexes):
+		assert all(pubhex.compressed for pubhex in pubhexes),'Uncompressed public keys incompatible with Segwit'
+		from mmgen.protocol import hash160_bin
+		return map(CoinAddr,g.proto.pubhashes_bin2bech32addrs([hash160_bin(unhexlify(p)) for p in pubhexes]))
 
 	def to_segwit_redeem_script(self,pubhex):
 		raise NotImplementedError,'Segwit redeem script not supported by this address type'
@@ -83,7 +129,7 @@ class AddrGeneratorEthereum(AddrGenerator):
 	def to_addr(self,pubhex):
 		assert type(pubhex) == PubKey
 		import sha3
-		return CoinAddr(sha3.keccak_256(pubhex[2:].decode('hex')).digest()[12:].encode('hex'))
+		return CoinAddr(hexlify(sha3.keccak_256(unhexlify(pubhex[2:])).digest()[12:]))
 
 	def to_wallet_passwd(self,sk_hex):
 		from mmgen.protocol import hash256
@@ -98,24 +144,32 @@ class AddrGeneratorZcashZ(AddrGenerator):
 	addr_width = 95
 	vk_width = 97
 
+	def zblock(self,key,t): # input block for the raw compression function
+		return chr(ord(key[0]) | 0xc0) + key[1:] + chr(t) + '\0'*31
+
 	def zhash256(self,s,t):
-		s = map(ord,s+'\0'*32)
-		s[0] |= 0xc0
-		s[32] = t
-		from mmgen.sha256 import Sha256
-		return Sha256(map(chr,s),preprocess=False).digest()
+		from mmgen.sha256 import sha256_compress
+		return sha256_compress(self.zblock(s,t))
 
 	def to_addr(self,pubhex): # pubhex is really privhex
-		key = pubhex.decode('hex')
-		assert len(key) == 32,'{}: incorrect privkey length'.format(len(key))
+		return self.to_addrs([pubhex])[0]
+
+	def to_addrs(self,pubhexes): # pubhexes are really privhexes
+		keys = [pubhex.decode('hex') for pubhex in pubhexes]
+		for key in keys:
+			assert len(key) == 32,'{}: incorrect privkey length'.format(len(key))
 		if g.platform == 'win':
 			ydie(1,'Zcash z-addresses not supported on Windows platform')
 		from nacl.bindings import crypto_scalarmult_base
-		p2 = crypto_scalarmult_base(self.zhash256(key,1))
-		from mmgen.protocol import _b58chk_encode
-		ret = _b58chk_encode(g.proto.addr_ver_num['zcash_z'][0] + hexlify(self.zhash256(key,0)+p2))
-		assert len(ret) == self.addr_width,'Invalid Zcash z-address length'
-		return CoinAddr(ret)
+		from mmgen.sha256 import sha256_compress_many
+		from mmgen.protocol import b58chk_encode_many
+		h = sha256_compress_many([self.zblock(key,t) for t in (0,1) for key in keys])
+		n,ver_num = len(keys),unhexlify(g.proto.addr_ver_num['zcash_z'][0])
+		data = [ver_num + h[i] + crypto_scalarmult_base(h[n+i]) for i in range(n)]
+		ret = b58chk_encode_many(data)
+		for a in ret:
+			assert len(a) == self.addr_width,'Invalid Zcash z-address length'
+		return map(CoinAddr,ret)
 
 	def to_viewkey(self,pubhex): # pubhex is really privhex
 		key = pubhex.decode('hex')
@@ -124,8 +178,8 @@ class AddrGeneratorZcashZ(AddrGenerator):
 		vk[32] &= 0xf8
 		vk[63] &= 0x7f
 		vk[63] |= 0x40
-		from mmgen.protocol import _b58chk_encode
-		ret = _b58chk_encode(g.proto.addr_ver_num['viewkey'][0] + hexlify(''.join(map(chr,vk))))
+		from mmgen.protocol import b58chk_encode
+		ret = b58chk_encode(unhexlify(g.proto.addr_ver_num['viewkey'][0]) + ''.join(map(chr,vk)))
 		assert len(ret) == self.vk_width,'Invalid Zcash view key length'
 		return ZcashViewKey(ret)
 
@@ -141,6 +195,9 @@ class AddrGeneratorMonero(AddrGenerator):
 		return a + b
 
 	def to_addr(self,sk_hex): # sk_hex instead of pubhex
+		return self.to_addrs([sk_hex])[0]
+
+	def to_addrs(self,sk_hexes):
 
 		# ed25519ll, a low-level ctypes wrapper for Ed25519 digital signatures by
 		# Daniel Holth <dholth@fastmail.fm> - http://bitbucket.org/dholth/ed25519ll/
@@ -148,29 +205,35 @@ class AddrGeneratorMonero(AddrGenerator):
 			assert not opt.use_internal_ed25519_mod
 			from ed25519ll.djbec import scalarmult,edwards,encodepoint,B
 		except:
-			from mmgen.ed25519 import scalarmult,edwards,encodepoint,B
-
-		# Source and license for scalarmultbase function:
-		#   https://github.com/bigreddmachine/MoneroPy/blob/master/moneropy/crypto/ed25519.py
-		# Copyright (c) 2014-2016, The Monero Project
-		# All rights reserved.
-		def scalarmultbase(e):
-			if e == 0: return [0, 1]
-			Q = scalarmult(B, e//2)
-			Q = edwards(Q, Q)
-			if e & 1: Q = edwards(Q, B)
-			return Q
+			# internal module: fixed-base precomputed table, one inversion per batch
+			from mmgen.ed25519 import scalarmultbase_many,encodepoint_fast as encodepoint
+		else:
+			# Source and license for scalarmultbase function:
+			#   https://github.com/bigreddmachine/MoneroPy/blob/master/moneropy/crypto/ed25519.py
+			# Copyright (c) 2014-2016, The Monero Project
+			# All rights reserved.
+			def scalarmultbase(e):
+				if e == 0: return [0, 1]
+				Q = scalarmult(B, e//2)
+				Q = edwards(Q, Q)
+				if e & 1: Q = edwards(Q, B)
+				return Q
+			scalarmultbase_many = lambda es: map(scalarmultbase,es)
 
 		def hex2int_le(hexstr):
 			return int(hexstr.decode('hex')[::-1].encode('hex'),16)
 
-		vk_hex = self.to_viewkey(sk_hex)
-		pk_str  = encodepoint(scalarmultbase(hex2int_le(sk_hex)))
-		pvk_str = encodepoint(scalarmultbase(hex2int_le(vk_hex)))
-		addr_p1 = g.proto.addr_ver_num['monero'][0].decode('hex') + pk_str + pvk_str
+		n = len(sk_hexes)
+		vk_hexes = [self.to_viewkey(sk_hex) for sk_hex in sk_hexes]
+		pts = scalarmultbase_many([hex2int_le(h) for h in sk_hexes + vk_hexes])
+		ver_num = g.proto.addr_ver_num['monero'][0].decode('hex')
 
 		import sha3
-		return CoinAddr(self.b58enc(addr_p1 + sha3.keccak_256(addr_p1).digest()[:4]))
+		ret = []
+		for i in range(n):
+			addr_p1 = ver_num + encodepoint(pts[i]) + encodepoint(pts[n+i])
+			ret.append(CoinAddr(self.b58enc(addr_p1 + sha3.keccak_256(addr_p1).digest()[:4])))
+		return ret
 
 	def to_wallet_passwd(self,sk_hex):
 		from mmgen.protocol import hash256
@@ -199,7 +262,7 @@ class KeyGenerator(MMGenObject):
 				if not opt.key_generator or opt.key_generator == 2 or generator == 2:
 					return super(cls,cls).__new__(KeyGeneratorSecp256k1)
 			else:
-				msg('Using (slow) native Python ECDSA library for address generation')
+				msg('Using native Python secp256k1 code for address generation')
 				return super(cls,cls).__new__(KeyGeneratorPython)
 		elif pubkey_type in ('zcash_z','monero'):
 			me = super(cls,cls).__new__(KeyGeneratorDummy)
@@ -208,6 +271,9 @@ class KeyGenerator(MMGenObject):
 		else:
 			raise ValueError,'{}: invalid pubkey_type argument'.format(pubkey_type)
 
+	def to_pubhexes(self,privhexes):
+		return [self.to_pubhex(k) for k in privhexes]
+
 	@classmethod
 	def test_for_secp256k1(self,silent=False):
 		try:
@@ -217,9 +283,8 @@ class KeyGenerator(MMGenObject):
 		except:
 			return False
 
-import ecdsa
 class KeyGeneratorPython(KeyGenerator):
-	desc = 'mmgen-python-ecdsa'
+	desc = 'mmgen-python'
 	# From electrum:
 	# secp256k1, http://www.oid-info.com/get/1.3.132.0.10
 	_p = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2FL
@@ -228,31 +293,100 @@ class KeyGeneratorPython(KeyGenerator):
 	_a = 0x0000000000000000000000000000000000000000000000000000000000000000L
 	_Gx = 0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798L
 	_Gy = 0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8L
-	_curve_secp256k1 = ecdsa.ellipticcurve.CurveFp(_p,_a,_b)
-	_generator_secp256k1 = ecdsa.ellipticcurve.Point(_curve_secp256k1,_Gx,_Gy,_r)
-	_oid_secp256k1 = (1,3,132,0,10)
-	_secp256k1 = ecdsa.curves.Curve('secp256k1',_curve_secp256k1,_generator_secp256k1,_oid_secp256k1)
+	_tbl = None # _tbl[i][j] is j*16**i*G in affine coordinates, created on first use
+
+	# Generator point multiples are found by adding one precomputed table entry for each
+	# radix-16 digit of the private key.  The sum is kept in Jacobian coordinates (X,Y,Z),
+	# with x=X/Z**2, y=Y/Z**3, so no inversions are required until conversion back to
+	# affine form, where a batch of points shares a single inversion.
+
+	@classmethod
+	def get_table(cls):
+		if cls._tbl is None:
+			p = cls._p
+			def add_affine(P,Q):
+				if P == Q: l = 3 * P[0] * P[0] * pow(2*P[1],p-2,p) % p
+				else:      l = (Q[1] - P[1]) * pow(Q[0]-P[0],p-2,p) % p
+				x = (l*l - P[0] - Q[0]) % p
+				return (x,(l*(P[0]-x) - P[1]) % p)
+			tbl,P = [],(cls._Gx,cls._Gy)
+			for i in range(64):
+				row = [None,P]
+				for j in range(14): row.append(add_affine(row[-1],P))
+				tbl.append(row)
+				P = add_affine(row[-1],P) # 16**(i+1)*G
+			cls._tbl = tbl
+		return cls._tbl
+
+	def privnum2jacobian(self,numpriv):
+		assert 0 < numpriv < self._r,'private key out of range'
+		p,acc = self._p,None
+		for row in self.get_table():
+			j = numpriv & 15
+			numpriv >>= 4
+			if not j: continue
+			x2,y2 = row[j]
+			if acc is None:
+				acc = (x2,y2,1)
+				continue
+			# mixed addition (Z2=1).  As all digits of the key occupy different positions,
+			# and the key is less than the group order, the points are never equal or opposite
+			X1,Y1,Z1 = acc
+			Z1Z1 = Z1 * Z1 % p
+			H = (x2 * Z1Z1 - X1) % p
+			r = 2 * (y2 * Z1 * Z1Z1 - Y1) % p
+			assert H,'point doubling in fixed-base multiplication'
+			HH = H * H % p
+			I = 4 * HH
+			J = H * I % p
+			V = X1 * I % p
+			X3 = (r * r - J - 2*V) % p
+			acc = (X3,(r * (V - X3) - 2 * Y1 * J) % p,((Z1 + H)**2 - Z1Z1 - HH) % p)
+		return acc
+
+	def privnums2points(self,nums):
+		"return the affine points numpriv*G for all private key numbers in 'nums'"
+		p = self._p
+		pts = [self.privnum2jacobian(n) for n in nums]
+		# Montgomery's trick: invert the product of all Z coords, then recover each inverse
+		acc,prods = 1,[]
+		for X,Y,Z in pts:
+			prods.append(acc)
+			acc = acc * Z % p
+		acc = pow(acc,p-2,p)
+		ret = [None] * len(pts)
+		for i in range(len(pts)-1,-1,-1):
+			X,Y,Z = pts[i]
+			zi = acc * prods[i] % p
+			acc = acc * Z % p
+			zi2 = zi * zi % p
+			ret[i] = (X * zi2 % p,Y * zi2 * zi % p)
+		return ret
 
 	# devdoc/guide_wallets.md:
 	# Uncompressed public keys start with 0x04; compressed public keys begin with
 	# 0x03 or 0x02 depending on whether they're greater or less than the midpoint
 	# of the curve.
-	def privnum2pubhex(self,numpriv,compressed=False):
-		pko = ecdsa.SigningKey.from_secret_exponent(numpriv,self._secp256k1)
-		# pubkey = 32-byte X coord + 32-byte Y coord (unsigned big-endian)
-		pubkey = hexlify(pko.get_verifying_key().to_string())
-		if compressed: # discard Y coord, replace with appropriate version byte
-			# even Y: <0, odd Y: >0 -- https://bitcointalk.org/index.php?topic=129652.0
-			p = ('03','02')[pubkey[-1] in '02468ace']
-			return p+pubkey[:64]
+	@staticmethod
+	def point2pubhex(P,compressed):
+		if compressed: # even Y: 02, odd Y: 03 -- https://bitcointalk.org/index.php?topic=129652.0
+			return '{:02x}{:064x}'.format(2 + (P[1] & 1),P[0])
 		else:
-			return '04'+pubkey
+			return '04{:064x}{:064x}'.format(*P)
+
+	def privnum2pubhex(self,numpriv,compressed=False):
+		return self.point2pubhex(self.privnums2points([numpriv])[0],compressed)
 
 	def to_pubhex(self,privhex):
 		assert type(privhex) == PrivKey
 		return PubKey(self.privnum2pubhex(
 			int(privhex,16),compressed=privhex.compressed),compressed=privhex.compressed)
 
+	def to_pubhexes(self,privhexes):
+		assert all(type(k) == PrivKey for k in privhexes)
+		pts = self.privnums2points([int(k,16) for k in privhexes])
+		return [PubKey(self.point2pubhex(P,k.compressed),compressed=k.compressed) for P,k in zip(pts,privhexes)]
+
 class KeyGeneratorSecp256k1(KeyGenerator):
 	desc = 'mmgen-secp256k1'
 	def to_pubhex(self,privhex):
@@ -260,6 +394,22 @@ class KeyGeneratorSecp256k1(KeyGenerator):
 		from mmgen.secp256k1 import priv2pub
 		return PubKey(hexlify(priv2pub(unhexlify(privhex),int(privhex.compressed))),compressed=privhex.compressed)
 
+	def to_pubhexes(self,privhexes):
+		try: from mmgen.secp256k1 import priv2pub_batch
+		except ImportError: # extension module built from older source
+			return KeyGenerator.to_pubhexes(self,privhexes)
+		# flat keylists may contain both compressed and uncompressed keys
+		out = [None] * len(privhexes)
+		for c in (True,False):
+			idxs = [i for i,k in enumerate(privhexes) if k.compressed == c]
+			if not idxs: continue
+			assert all(type(privhexes[i]) == PrivKey for i in idxs)
+			pubs = hexlify(priv2pub_batch(unhexlify(''.join(privhexes[i] for i in idxs)),int(c)))
+			n = (130,66)[c]
+			for j,i in enumerate(idxs):
+				out[i] = PubKey(pubs[j*n:(j+1)*n],compressed=c)
+		return out
+
 class KeyGeneratorDummy(KeyGenerator):
 	desc = 'mmgen-dummy'
 	def to_pubhex(self,privhex):
@@ -284,13 +434,14 @@ class AddrListChksum(str,Hilite):
 	color = 'pink'
 	trunc_ok = False
 
-	def __new__(cls,addrlist):
-		ea = addrlist.al_id.mmtype.extra_attrs # add viewkey and passwd to the mix, if present
-		lines = [' '.join(
-					addrlist.chksum_rec_f(e) +
-					tuple(getattr(e,a) for a in ea if getattr(e,a))
-				) for e in addrlist.data]
-		return str.__new__(cls,make_chksum_N(' '.join(lines), nchars=16, sep=True))
+	def __new__(cls,addrlist,recs=None): # recs: precomputed checksum records (see parse_file_body)
+		if recs is None:
+			ea = addrlist.al_id.mmtype.extra_attrs # add viewkey and passwd to the mix, if present
+			recs = [' '.join(
+						addrlist.chksum_rec_f(e) +
+						tuple(getattr(e,a) for a in ea if getattr(e,a))
+					) for e in addrlist.data]
+		return str.__new__(cls,make_chksum_N(' '.join(recs), nchars=16, sep=True))
 
 class AddrListIDStr(unicode,Hilite):
 	color = 'green'
@@ -298,13 +449,13 @@ class AddrListIDStr(unicode,Hilite):
 	def __new__(cls,addrlist,fmt_str=None):
 		idxs = [e.idx for e in addrlist.data]
 		prev = idxs[0]
-		ret = prev,
+		ret = [prev]
 		for i in idxs[1:]:
 			if i == prev + 1:
-				if i == idxs[-1]: ret += '-', i
+				if i == idxs[-1]: ret += ['-',i]
 			else:
-				if prev != ret[-1]: ret += '-', prev
-				ret += ',', i
+				if prev != ret[-1]: ret += ['-',prev]
+				ret += [',',i]
 			prev = i
 		s = ''.join(map(unicode,ret))
 
@@ -318,6 +469,78 @@ class AddrListIDStr(unicode,Hilite):
 
 		return unicode.__new__(cls,ret)
 
+class SeedChainCache(MMGenObject):
+	"""
+	Encrypted on-disk cache of seed chain states, saved every 'interval' rounds.
+	Both the filename and the encryption key are derived from the scrambled seed,
+	so the cache is tied to Seed ID, address type and scramble key and is useless
+	to anyone not in possession of the seed.
+	"""
+	file_header = 'MMGenSeedChainCache'
+	ext = 'chaincache'
+	chk_len = 8
+
+	def __init__(self,scr_seed,sid,interval=None,persistent=True):
+		self.interval = interval or g.seed_chain_checkpoint_interval
+		self.persistent = persistent # if False, checkpoints are kept in memory only
+		self.states = [] # states[n] is the seed chain state after (n+1)*interval rounds
+		self.modified = False
+		if not persistent: return
+		import hmac
+		self.key = hmac.new(scr_seed,'seed chain cache key',sha256).digest()
+		fn_id = make_chksum_8(hmac.new(scr_seed,'seed chain cache filename',sha256).digest())
+		self.dir = os.path.join(g.data_dir,'seed_chain_cache')
+		self.fn = os.path.join(self.dir,'{}-{}.{}'.format(sid,fn_id,self.ext))
+		self.load()
+
+	def load(self):
+		try:
+			with open(self.fn,'rb') as f: data = f.read()
+		except: return
+		try:
+			hdr,enc_data = data.split('\n',1)
+			label,interval,nstates = hdr.split()
+			assert label == self.file_header,'bad header'
+			if int(interval) != self.interval: return # rebuild cache with new interval
+			from mmgen.crypto import decrypt_data
+			dec_data = decrypt_data(enc_data,self.key,desc='seed chain cache')
+			chk,states = dec_data[:self.chk_len],dec_data[self.chk_len:]
+			assert sha256(states).digest()[:self.chk_len] == chk,'checksum mismatch'
+			assert len(states) == int(nstates) * 64,'bad data length'
+		except Exception as e:
+			msg(u"Ignoring invalid seed chain cache file '{}' ({})".format(self.fn,e[0]))
+			return
+		self.states = [states[i:i+64] for i in range(0,len(states),64)]
+		vmsg(u"Loaded {} seed chain checkpoint{} from '{}'".format(
+				len(self.states),suf(self.states,'s'),self.fn))
+
+	def get(self,num):
+		"return (round,state) for the closest checkpoint preceding round 'num', or (0,None)"
+		n = min((num - 1) // self.interval,len(self.states))
+		return (n * self.interval,self.states[n-1]) if n else (0,None)
+
+	def add(self,num,state):
+		# chain is walked from the last checkpoint or from the start, so no gaps can occur
+		if num == (len(self.states) + 1) * self.interval:
+			self.states.append(state)
+			self.modified = True
+
+	def save(self):
+		if not (self.persistent and self.modified): return
+		states = ''.join(self.states)
+		from mmgen.crypto import encrypt_data
+		enc_data = encrypt_data(sha256(states).digest()[:self.chk_len]+states,self.key,
+					desc='seed chain cache',verify=False)
+		check_or_create_dir(self.dir)
+		tmp_fn = self.fn + '.tmp'
+		fd = os.open(tmp_fn,os.O_WRONLY|os.O_CREAT|os.O_TRUNC,0600)
+		with os.fdopen(fd,'wb') as f:
+			f.write('{} {} {}\n'.format(self.file_header,self.interval,len(self.states)) + enc_data)
+		os.rename(tmp_fn,self.fn)
+		self.modified = False
+		vmsg(u"Saved {} seed chain checkpoint{} to '{}'".format(
+				len(self.states),suf(self.states,'s'),self.fn))
+
 class AddrList(MMGenObject): # Address info for a single seed ID
 	msgs = {
 	'file_header': """
@@ -349,18 +572,27 @@ Removed {{}} duplicate WIF key{{}} from keylist (also in {pnm} key-address file
 	has_keys = False
 	ext      = 'addrs'
 	scramble_hash_rounds = 10  # not too many rounds, so hand decoding can still be feasible
+	mp_chunk_len = 1000        # entries per message sent by parallel generation workers
+	kg_batch_len = 100         # privkeys per KeyGenerator.to_pubhexes() call
 	chksum_rec_f = lambda foo,e: (str(e.idx), e.addr)
+	_indexes = None # lookup tables for entry(), coinaddr() etc.  See index()
+	key_cache = None # a SeedKeyCache, if generating for one.  See generate()
 
 	def __init__(self,addrfile='',al_id='',adata=[],seed='',addr_idxs='',src='',
-					addrlist='',keylist='',mmtype=None,do_chksum=True,chksum_only=False):
+					addrlist='',keylist='',mmtype=None,do_chksum=True,chksum_only=False,key_cache=None):
 
 		self.update_msgs()
+		self.key_cache = key_cache
 		mmtype = mmtype or g.proto.dfl_mmtype
 		assert mmtype in MMGenAddrType.mmtypes,'{}: mmtype not in {}'.format(mmtype,repr(MMGenAddrType.mmtypes))
 
 		if seed and addr_idxs:   # data from seed + idxs
 			self.al_id,src = AddrListID(seed.sid,mmtype),'gen'
 			adata = self.generate(seed,addr_idxs)
+		elif addrfile and chksum_only: # checksum records from MMGen address file
+			self.chksum = AddrListChksum(self,self.parse_file(addrfile,chksum_only=True))
+			Msg(self.chksum)
+			return
 		elif addrfile:           # data from MMGen address file
 			adata = self.parse_file(addrfile) # sets self.al_id
 		elif al_id and adata:    # data from tracking wallet
@@ -410,52 +642,165 @@ Removed {{}} duplicate WIF key{{}} from keylist (also in {pnm} key-address file
 		seed = self.scramble_seed(seed)
 		dmsg_sc('seed',seed[:8].encode('hex'))
 
-		compressed = self.al_id.mmtype.compressed
-		pubkey_type = self.al_id.mmtype.pubkey_type
-
-		gen_wallet_passwd = type(self) == KeyAddrList and 'wallet_passwd' in self.al_id.mmtype.extra_attrs
-		gen_viewkey       = type(self) == KeyAddrList and 'viewkey' in self.al_id.mmtype.extra_attrs
+		# with a key cache, the chain is resumed from checkpoints of earlier walks
+		cc = self.key_cache.get_chain(seed) if self.key_cache else None
 
 		if self.gen_addrs:
 			kg = KeyGenerator(self.al_id.mmtype)
 			ag = AddrGenerator(self.al_id.mmtype)
+		else:
+			kg,ag = None,None
 
-		t_addrs,num,pos,out = len(addrnums),0,0,AddrListList()
-		le = self.entry_type
+		t_addrs = len(addrnums)
+		out = self.gen_list(self.gen_secs(seed,addrnums,cc),t_addrs,kg,ag)
+
+		qmsg('\r{}: {} {}{} generated{}'.format(
+				self.al_id.hl(),t_addrs,self.gen_desc,suf(t_addrs,self.gen_desc_pl),' '*15))
+		return out
+
+	def gen_list(self,secs,t_addrs,kg,ag):
+		"generate the entries for (index,secret) pairs 'secs', in opt.jobs processes if possible"
+		jobs = min(opt.jobs or 1,t_addrs)
+
+		if jobs > 1 and g.platform != 'win': # worker processes must be forked
+			return self.generate_parallel(secs,t_addrs,kg,ag,jobs)
+
+		out = AddrListList()
+		for pos,e in enumerate(self.gen_entries(secs,kg,ag),1):
+			if not g.debug:
+				qmsg_r('\rGenerating {} #{} ({} of {})'.format(self.gen_desc,e.idx,pos,t_addrs))
+			out.append(e)
+		return out
+
+	def gen_secs(self,seed,addrnums,cc=None):
+		"walk the seed chain, yielding (index,secret) for each requested index"
+		t_addrs,num,pos = len(addrnums),0,0
+
+		# with a checkpoint cache, skip ahead to the checkpoint closest to each index
+		if not cc and opt.checkpoint_cache:
+			cc = SeedChainCache(seed,self.al_id.sid)
+		skip = bool(cc)
 
 		while pos != t_addrs:
+			if skip:
+				r,state = cc.get(addrnums[pos])
+				if r > num: num,seed = r,state
+				skip = False
+
 			seed = sha512(seed).digest()
 			num += 1 # round
 
+			if cc and not num % cc.interval: cc.add(num,seed)
+
 			if num != addrnums[pos]: continue
 
 			pos += 1
+			skip = bool(cc)
 
-			if not g.debug:
-				qmsg_r('\rGenerating {} #{} ({} of {})'.format(self.gen_desc,num,pos,t_addrs))
+			# Secret key is double sha256 of seed hash round /num/
+			yield num,sha256(sha256(seed).digest()).digest()
 
-			e = le(idx=num)
+		if cc: cc.save()
 
-			# Secret key is double sha256 of seed hash round /num/
-			e.sec = PrivKey(sha256(sha256(seed).digest()).digest(),compressed=compressed,pubkey_type=pubkey_type)
+	def gen_entries(self,secs,kg,ag):
+
+		compressed = self.al_id.mmtype.compressed
+		pubkey_type = self.al_id.mmtype.pubkey_type
+
+		# lists generated for a key cache hold keys and addresses only
+		gen_extras = type(self) == KeyAddrList and not self.key_cache
+		gen_wallet_passwd = gen_extras and 'wallet_passwd' in self.al_id.mmtype.extra_attrs
+		gen_viewkey       = gen_extras and 'viewkey' in self.al_id.mmtype.extra_attrs
+
+		le = self.entry_type
+
+		from itertools import islice
+		secs = iter(secs)
+
+		while True:
+			# pubkeys are generated a batch at a time, so a key generator with a batch
+			# API can process many keys per call
+			batch = [le(idx=num,sec=PrivKey(sec,compressed=compressed,pubkey_type=pubkey_type))
+						for num,sec in islice(secs,self.kg_batch_len)]
+			if not batch: break
 
 			if self.gen_addrs:
-				pubhex = kg.to_pubhex(e.sec)
-				e.addr = ag.to_addr(pubhex)
-				if gen_viewkey:
-					e.viewkey = ag.to_viewkey(pubhex)
-				if gen_wallet_passwd:
-					e.wallet_passwd = ag.to_wallet_passwd(e.sec)
+				pubhexes = kg.to_pubhexes([e.sec for e in batch])
+				addrs = ag.to_addrs(pubhexes)
 
 			if type(self) == PasswordList:
-				e.passwd = unicode(self.make_passwd(e.sec)) # TODO - own type
-				dmsg('Key {:>03}: {}'.format(pos,e.passwd))
-
-			out.append(e)
-			if g.debug_addrlist: Msg('generate():\n{}'.format(e.pformat()))
+				passwds = self.make_passwds([e.sec for e in batch])
+
+			for n,e in enumerate(batch):
+
+				if self.gen_addrs:
+					e.addr = addrs[n]
+					if gen_viewkey:
+						e.viewkey = ag.to_viewkey(pubhexes[n])
+					if gen_wallet_passwd:
+						e.wallet_passwd = ag.to_wallet_passwd(e.sec)
+
+				if type(self) == PasswordList:
+					e.passwd = unicode(passwds[n]) # TODO - own type
+					dmsg('Key {:>03}: {}'.format(e.idx,e.passwd))
+
+				if g.debug_addrlist: Msg('generate():\n{}'.format(e.pformat()))
+				yield e
+
+	def generate_parallel(self,secs,t_addrs,kg,ag,jobs):
+		"""
+		The seed chain is walked once in the parent process, and contiguous ranges of
+		secrets are handed to forked worker processes for key, pubkey and address
+		derivation.  Results are merged in index order, so the resulting list is
+		identical to that produced by the serial code path.
+		"""
+		# NB: multiprocessing.Pool can't be used here, as its helper threads deadlock
+		# on the import lock held by launch() while the main_*.py module is executing
+		from multiprocessing import Process,Pipe
+		from select import select
+		secs = list(secs)
+		rng_len = -(-t_addrs // jobs)
+		procs,chunks = [],{}
+		for i in range(0,t_addrs,rng_len):
+			r,w = Pipe(duplex=False)
+			p = Process(target=_mp_gen_worker,args=(w,self,secs[i:i+rng_len],kg,ag))
+			p.daemon = True
+			p.start()
+			w.close()
+			procs.append((p,r))
+			chunks[r] = []
+
+		# A chunk is much larger than the pipe buffer, so a worker whose pipe isn't read
+		# blocks until it is.  All pipes are therefore read as data arrives, and the
+		# chunks buffered per worker until all workers are done.
+		pending,done = set(chunks),0
+		try:
+			while pending:
+				for r in select(list(pending),[],[])[0]:
+					ret = r.recv()
+					if ret is None:
+						pending.remove(r)
+					elif isinstance(ret,Exception):
+						raise ret
+					else:
+						chunks[r].append(ret)
+						done += len(ret)
+						if not g.debug:
+							qmsg_r('\rGenerating {} ({} of {}, {} jobs)'.format(
+								self.gen_desc,done,t_addrs,len(procs)))
+		except EOFError:
+			die(2,'Address generation worker process exited unexpectedly')
+		finally:
+			for p,r in procs:
+				if p.is_alive(): p.terminate()
+			for p,r in procs:
+				p.join()
+
+		out = AddrListList()
+		for p,r in procs:
+			for ret in chunks[r]:
+				out.extend(ret)
 
-		qmsg('\r{}: {} {}{} generated{}'.format(
-				self.al_id.hl(),t_addrs,self.gen_desc,suf(t_addrs,self.gen_desc_pl),' '*15))
 		return out
 
 	def check_format(self,addr): return True # format is checked when added to list entry object
@@ -501,48 +846,65 @@ Removed {{}} duplicate WIF key{{}} from keylist (also in {pnm} key-address file
 	def comments(self):
 		return [e.label for e in self.data]
 
+	def index(self,attr,last_wins=False):
+		"""
+		Return a dict mapping values of entry attribute 'attr' to entries, building
+		it on first use.  Of entries with the same value, the first one wins, as with
+		a linear search, or the last one if 'last_wins' is set.  Methods that add,
+		remove or change the key attribute of entries must call reset_indexes().
+		"""
+		if self._indexes is None: self._indexes = {}
+		key = (attr,last_wins)
+		if key not in self._indexes:
+			d = {}
+			for e in (self.data if last_wins else reversed(self.data)):
+				k = getattr(e,attr)
+				if k is not None: d[k] = e
+			self._indexes[key] = d
+		return self._indexes[key]
+
+	def reset_indexes(self):
+		self._indexes = None
+
 	def entry(self,idx):
-		for e in self.data:
-			if idx == e.idx: return e
+		return self.index('idx').get(idx)
 
 	def coinaddr(self,idx):
-		for e in self.data:
-			if idx == e.idx: return e.addr
+		e = self.entry(idx)
+		return e.addr if e else None
 
 	def comment(self,idx):
-		for e in self.data:
-			if idx == e.idx: return e.label
+		e = self.entry(idx)
+		return e.label if e else None
 
 	def set_comment(self,idx,comment):
-		for e in self.data:
-			if idx == e.idx:
-				e.label = comment
+		e = self.entry(idx)
+		if e: e.label = comment
 
 	def make_reverse_dict(self,coinaddrs):
-		d,b = MMGenDict(),coinaddrs
-		for e in self.data:
-			try:
-				d[b[b.index(e.addr)]] = MMGenID('{}:{}'.format(self.al_id,e.idx)),e.label
-			except: pass
+		d,ai = MMGenDict(),self.index('addr',last_wins=True) # as when the dict was built from self.data
+		for a in coinaddrs:
+			if a in ai:
+				d[a] = MMGenID('{}:{}'.format(self.al_id,ai[a].idx)),ai[a].label
 		return d
 
 	def remove_dup_keys(self,cmplist):
 		assert self.has_keys
-		pop_list = []
-		for n,d in enumerate(self.data):
-			for e in cmplist.data:
-				if e.sec.wif == d.sec.wif:
-					pop_list.append(n)
-		for n in reversed(pop_list): self.data.pop(n)
-		if pop_list:
-			vmsg(self.msgs['removed_dup_keys'].format(len(pop_list),suf(removed,'s')))
+		cmp_wifs = set(e.sec.wif for e in cmplist.data)
+		n_data = len(self.data)
+		self.data[:] = [d for d in self.data if d.sec.wif not in cmp_wifs]
+		self.reset_indexes()
+		removed = n_data - len(self.data)
+		if removed:
+			vmsg(self.msgs['removed_dup_keys'].format(removed,suf(removed,'s')))
 
 	def add_wifs(self,key_list):
 		if not key_list: return
+		secs = dict((e.addr,e.sec) for e in key_list.data if e.addr and e.sec)
 		for d in self.data:
-			for e in key_list.data:
-				if e.addr and e.sec and e.addr == d.addr:
-					d.sec = e.sec
+			if d.addr in secs:
+				d.sec = secs[d.addr]
+		self.reset_indexes()
 
 	def list_missing(self,key):
 		return [d.addr for d in self.data if not getattr(d,key)]
@@ -553,10 +915,15 @@ Removed {{}} duplicate WIF key{{}} from keylist (also in {pnm} key-address file
 		kg = KeyGenerator(t.pubkey_type)
 		ag = AddrGenerator(t.gen_method)
 		d = self.data
-		for n,e in enumerate(d,1):
-			qmsg_r('\rGenerating addresses from keylist: {}/{}'.format(n,len(d)))
-			e.addr = ag.to_addr(kg.to_pubhex(e.sec))
-			if g.debug_addrlist: Msg('generate_addrs_from_keys():\n{}'.format(e.pformat()))
+		n = 0
+		for i in range(0,len(d),self.kg_batch_len):
+			batch = d[i:i+self.kg_batch_len]
+			for e,pubhex in zip(batch,kg.to_pubhexes([e.sec for e in batch])):
+				n += 1
+				qmsg_r('\rGenerating addresses from keylist: {}/{}'.format(n,len(d)))
+				e.addr = ag.to_addr(pubhex)
+				if g.debug_addrlist: Msg('generate_addrs_from_keys():\n{}'.format(e.pformat()))
+		self.reset_indexes()
 		qmsg('\rGenerated addresses from keylist: {}/{} '.format(n,len(d)))
 
 	def format(self,enable_comments=False):
@@ -599,51 +966,144 @@ Removed {{}} duplicate WIF key{{}} from keylist (also in {pnm} key-address file
 		out.append('}')
 		self.fmt_data = '\n'.join([l.rstrip() for l in out]) + '\n'
 
-	def parse_file_body(self,lines):
-
-		ret = AddrListList()
-		le = self.entry_type
+	def parse_file_records(self,lines):
+		"""
+		Generator yielding the fields of each entry in an address file body as the
+		tuple (idx,main_attr,label,wif,extra_attrs), with no object construction.
+		'wif' is None if the list has no keys, 'extra_attrs' a list of (key,val) pairs
+		"""
+		it = iter(lines)
 
 		def get_line():
-			ret = lines.pop(0).split(None,2)
+			l = next(it,None)
+			assert l is not None,'Unexpected end of {} data'.format(self.data_desc)
+			ret = l.split(None,2)
 			if ret[0] == 'orig_hex:': # hacky
-				return lines.pop(0).split(None,2)
+				return get_line()
 			return ret
 
-		while lines:
-			d = get_line()
+		mmtype = self.al_id.mmtype
+		extra_attrs = [k for k in ('viewkey','wallet_passwd') if k in mmtype.extra_attrs]
+
+		for l in it:
+			d = l.split(None,2)
 
 			assert is_mmgen_idx(d[0]),"'{}': invalid address num. in line: '{}'".format(d[0],' '.join(d))
 			assert self.check_format(d[1]),"'{}': invalid {}".format(d[1],self.data_desc)
 
-			if len(d) != 3: d.append('')
-			a = le(**{'idx':int(d[0]),self.main_attr:d[1],'label':d[2]})
+			idx,main,label,wif,extra = d[0],d[1],(d[2] if len(d) == 3 else ''),None,[]
 
 			if self.has_keys: # order: wif,(orig_hex),viewkey,wallet_passwd
 				d = get_line()
-				assert d[0] == self.al_id.mmtype.wif_label,"Invalid line in file: '{}'".format(' '.join(d))
-				a.sec = PrivKey(wif=d[1])
-				for k,dtype in (('viewkey',ViewKey),('wallet_passwd',WalletPassword)):
-					if k in self.al_id.mmtype.extra_attrs:
-						d = get_line()
-						assert d[0] == k+':',"Invalid line in file: '{}'".format(' '.join(d))
-						setattr(a,k,dtype(d[1]))
+				assert d[0] == mmtype.wif_label,"Invalid line in file: '{}'".format(' '.join(d))
+				wif = d[1]
+				for k in extra_attrs:
+					d = get_line()
+					assert d[0] == k+':',"Invalid line in file: '{}'".format(' '.join(d))
+					extra.append((k,d[1]))
+
+			yield idx,main,label,wif,extra
+
+	def parse_file_body(self,lines,chksum_only=False):
+
+		# the checksum records are built from the file data as-is, matching AddrListChksum
+		if chksum_only:
+			return [' '.join([str(int(idx)),main] + ([wif] if wif else []) + [v for k,v in extra])
+						for idx,main,label,wif,extra in self.parse_file_records(lines)]
 
+		ret = AddrListList()
+		le = self.entry_type
+		dtypes = {'viewkey':ViewKey,'wallet_passwd':WalletPassword}
+
+		for idx,main,label,wif,extra in self.parse_file_records(lines):
+			a = le(**{'idx':int(idx),self.main_attr:main,'label':label})
+			if wif:
+				a.sec = PrivKey(wif=wif)
+				for k,v in extra:
+					setattr(a,k,dtypes[k](v))
 			ret.append(a)
 
-		if self.has_keys and keypress_confirm('Check key-to-address validity?'):
-			kg = KeyGenerator(self.al_id.mmtype)
-			ag = AddrGenerator(self.al_id.mmtype)
-			llen = len(ret)
-			for n,e in enumerate(ret):
-				msg_r('\rVerifying keys {}/{}'.format(n+1,llen))
-				assert e.addr == ag.to_addr(kg.to_pubhex(e.sec)),(
-					"Key doesn't match address!\n  {}\n  {}".format(e.sec.wif,e.addr))
-			msg(' - done')
+		if self.has_keys and (opt.check_keys or keypress_confirm('Check key-to-address validity?')):
+			self.check_keys(ret)
 
 		return ret
 
-	def parse_file(self,fn,buf=[],exit_on_error=True):
+	def find_key_mismatch(self,data,kg,ag):
+		"return the position of the first entry in 'data' whose key doesn't generate its address"
+		addrs = ag.to_addrs(kg.to_pubhexes([e.sec for e in data]))
+		for n,e in enumerate(data):
+			if e.addr != addrs[n]: return n
+		return None
+
+	def check_keys(self,data):
+		kg = KeyGenerator(self.al_id.mmtype)
+		ag = AddrGenerator(self.al_id.mmtype)
+		llen = len(data)
+		jobs = min(opt.jobs or 1,-(-llen // self.mp_chunk_len))
+
+		if jobs > 1 and g.platform != 'win': # worker processes must be forked
+			bad = self.check_keys_parallel(data,kg,ag,jobs)
+		else:
+			n,bad = self.kg_batch_len,None
+			for i in range(0,llen,n):
+				bad = self.find_key_mismatch(data[i:i+n],kg,ag)
+				if bad is not None:
+					bad += i
+					break
+				msg_r('\rVerifying keys {}/{}'.format(min(i+n,llen),llen))
+
+		if bad is not None:
+			msg('')
+			e = data[bad]
+			raise AssertionError,"Key doesn't match address at index {}!\n  {}\n  {}".format(e.idx,e.sec.wif,e.addr)
+		msg(' - done')
+
+	def check_keys_parallel(self,data,kg,ag,jobs):
+		"""
+		The entries are split into contiguous ranges, each checked by a forked worker
+		process.  All workers are terminated as soon as any of them reports a bad entry,
+		whose position in 'data' is returned.
+		"""
+		from multiprocessing import Process,Pipe
+		from select import select
+		llen = len(data)
+		rng_len = -(-llen // jobs)
+		procs,offsets = [],{}
+		for i in range(0,llen,rng_len):
+			r,w = Pipe(duplex=False)
+			p = Process(target=_mp_check_worker,args=(w,self,data[i:i+rng_len],kg,ag))
+			p.daemon = True
+			p.start()
+			w.close()
+			procs.append(p)
+			offsets[r] = i
+
+		checked,bad = 0,None
+		try:
+			while offsets and bad is None:
+				for r in select(offsets.keys(),[],[])[0]:
+					ret = r.recv()
+					if ret is None:
+						del offsets[r]
+					elif isinstance(ret,Exception):
+						raise ret
+					elif ret[1] is not None:
+						bad = offsets[r] + ret[1]
+						break
+					else:
+						checked += ret[0]
+						msg_r('\rVerifying keys {}/{} ({} jobs)'.format(checked,llen,len(procs)))
+		except EOFError:
+			die(2,'Key checking worker process exited unexpectedly')
+		finally:
+			for p in procs:
+				if p.is_alive(): p.terminate()
+			for p in procs:
+				p.join()
+
+		return bad
+
+	def parse_file(self,fn,buf=[],exit_on_error=True,chksum_only=False):
 
 		def parse_addrfile_label(lbl): # we must maintain backwards compat, so parse is tricky
 			al_coin,al_mmtype = None,None
@@ -677,6 +1137,7 @@ Removed {{}} duplicate WIF key{{}} from keylist (also in {pnm} key-address file
 			assert base_coin == g.proto.base_coin, m.format(base_coin,g.proto.base_coin)
 
 		lines = get_lines_from_file(fn,self.data_desc+' data',trim_comments=True)
+		from itertools import islice
 
 		try:
 			assert len(lines) >= 3,  'Too few lines in address file ({})'.format(len(lines))
@@ -705,7 +1166,7 @@ Removed {{}} duplicate WIF key{{}} from keylist (also in {pnm} key-address file
 
 			self.al_id = AddrListID(SeedID(sid=sid),mmtype)
 
-			data = self.parse_file_body(lines[1:-1])
+			data = self.parse_file_body(islice(lines,1,len(lines)-1),chksum_only=chksum_only)
 			assert issubclass(type(data),list),'Invalid file body data'
 		except Exception as e:
 			m = 'Invalid address list file ({})'.format(e[0])
@@ -726,6 +1187,56 @@ class KeyAddrList(AddrList):
 	ext      = 'akeys'
 	chksum_rec_f = lambda foo,e: (str(e.idx), e.addr, e.sec.wif)
 
+class SeedKeyCache(MMGenObject):
+	"""
+	Keys and addresses generated from a single seed, kept for the life of the program.
+	Entries already generated are reused, and checkpoints of each seed chain walked
+	are kept, so a later request resumes the walk from the closest checkpoint instead
+	of from round 1.  Chains are keyed by scrambled seed, so address types sharing a
+	scrambled seed share a chain.  Keys are generated without addresses, which are
+	derived only for entries returned by get_kal(), and only once.  Viewkeys and wallet
+	passwords are not generated.
+	"""
+	chain_interval = 1000 # rounds between in-memory checkpoints
+
+	def __init__(self,seed):
+		self.seed = seed
+		self.chains = {}  # SeedChainCache objects, by scrambled seed
+		self.entries = {} # AddrListEntry objects, by address type and index
+
+	def get_chain(self,scr_seed):
+		if scr_seed not in self.chains:
+			self.chains[scr_seed] = (
+				SeedChainCache(scr_seed,self.seed.sid) if opt.checkpoint_cache else
+				SeedChainCache(scr_seed,self.seed.sid,interval=self.chain_interval,persistent=False))
+		return self.chains[scr_seed]
+
+	def get_keys(self,mmtype,idxs):
+		"return entries for the indexes 'idxs', generating only those not cached.  Addresses may be missing"
+		mmtype = MMGenAddrType(mmtype)
+		d = self.entries.setdefault(mmtype,{})
+		idxs = sorted(set(idxs))
+		new_idxs = [i for i in idxs if i not in d]
+		if new_idxs:
+			kl = KeyList(seed=self.seed,addr_idxs=AddrIdxList(idx_list=new_idxs),mmtype=mmtype,key_cache=self)
+			d.update((e.idx,e) for e in kl.data)
+		return [d[i] for i in idxs]
+
+	def get_kal(self,mmtype,idxs):
+		"return a KeyAddrList for the indexes 'idxs', deriving addresses only for entries lacking them"
+		mmtype = MMGenAddrType(mmtype)
+		al_id = AddrListID(self.seed.sid,mmtype)
+		entries = self.get_keys(mmtype,idxs)
+		todo = [e for e in entries if not e.addr]
+		if todo:
+			kal = KeyAddrList(al_id=al_id,adata=AddrListList(todo),key_cache=self)
+			secs = [(e.idx,unhexlify(e.sec)) for e in todo]
+			d = self.entries[mmtype]
+			d.update((e.idx,e) for e in kal.gen_list(secs,len(secs),KeyGenerator(mmtype),AddrGenerator(mmtype)))
+			qmsg('\r{}: {} address{} derived{}'.format(al_id.hl(),len(todo),suf(todo,'es'),' '*15))
+			entries = [d[e.idx] for e in entries]
+		return KeyAddrList(al_id=al_id,adata=AddrListList(entries))
+
 class KeyList(AddrList):
 	msgs = {
 	'file_header': """
@@ -785,7 +1296,11 @@ Record this checksum: it will be used to verify the password file in the future
 
 		self.update_msgs()
 
-		if infile:
+		if infile and chksum_only:
+			self.chksum = AddrListChksum(self,self.parse_file(infile,chksum_only=True))
+			Msg(self.chksum)
+			return
+		elif infile:
 			self.data = self.parse_file(infile) # sets self.pw_id_str,self.pw_fmt,self.pw_len
 		else:
 			for k in seed,pw_idxs: assert chk_params_only or k
@@ -841,12 +1356,16 @@ Record this checksum: it will be used to verify the password file in the future
 		self.chk_pw_len()
 
 	def make_passwd(self,hex_sec):
+		return self.make_passwds([hex_sec])[0]
+
+	def make_passwds(self,hex_secs):
 		assert self.pw_fmt in self.pw_info
 		if self.pw_fmt == 'hex':
-			return hex_sec
+			return list(hex_secs)
 		else:
 			# we take least significant part
-			return baseconv.fromhex(hex_sec,self.pw_fmt,pad=self.pw_len,tostr=True)[-self.pw_len:]
+			return [p[-self.pw_len:] for p in
+				baseconv.fromhex_many(hex_secs,self.pw_fmt,pad=self.pw_len,tostr=True)]
 
 	def check_format(self,pw):
 		if not {'b58':is_b58_str,'b32':is_b32_str,'hex':is_hex_str}[self.pw_fmt](pw):
@@ -935,6 +1454,8 @@ re-import your addresses.
 		else:
 			raise TypeError, 'Error: object {!r} is not of type AddrList'.format(addrlist)
 
+	# each list looks up the addresses in its lazily built 'addr' index, which is rebuilt
+	# when the list changes
 	def make_reverse_dict(self,coinaddrs):
 		d = MMGenDict()
 		for al_id in self.al_ids:
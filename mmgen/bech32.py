@@ -10,6 +10,7 @@
 # Unaltered except for the following changes by the MMGen Project:
 #   'python3' changed to 'python' in the hashbang
 #   leading spaces converted to tabs
+#   table-driven and byte string versions of the functions added at end of file
 #
 """Reference implementation for Bech32 and segwit addresses."""
 
@@ -104,3 +105,88 @@ def encode(hrp, witver, witprog):
 	if decode(hrp, ret) == (None, None):
 		return None
 	return ret
+
+# Fast versions of the above, for address generation and verification.  The checksum
+# is computed with a table indexed by the top five bits of the state, and the state
+# for the HRP is computed only once.  Witness programs are byte strings, converted to
+# and from 5-bit values in a single step with Python's long integers.
+
+def _polymod_tbl_init():
+	generator = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+	ret = []
+	for top in range(32):
+		chk = 0
+		for i in range(5):
+			if (top >> i) & 1: chk ^= generator[i]
+		ret.append(chk)
+	return ret
+
+_polymod_tbl = _polymod_tbl_init()
+_hrp_states = {}
+
+def bech32_polymod_fast(values, chk=1):
+	tbl = _polymod_tbl
+	for value in values:
+		chk = (chk & 0x1ffffff) << 5 ^ value ^ tbl[chk >> 25]
+	return chk
+
+def _hrp_state(hrp):
+	if hrp not in _hrp_states:
+		_hrp_states[hrp] = bech32_polymod_fast(bech32_hrp_expand(hrp))
+	return _hrp_states[hrp]
+
+_charset_rev = dict((ch,chr(n)) for n,ch in enumerate(CHARSET))
+_charset_rev_tbl = ''.join(_charset_rev.get(chr(n),'\xff') for n in range(256))
+
+def convertbits_8to5(data):
+	"""Convert a byte string to 5-bit values, padding with zero bits."""
+	n = len(data) * 8
+	nvals = -(-n // 5)
+	acc = int(data.encode('hex'),16) << (nvals * 5 - n) if data else 0
+	return [(acc >> (5 * i)) & 31 for i in range(nvals-1,-1,-1)]
+
+def convertbits_5to8(values):
+	"""Convert 5-bit values to a byte string.  Return None if the padding is invalid."""
+	n = len(values) * 5
+	pad = n % 8
+	if pad >= 5: return None
+	acc = 0
+	for v in values: acc = acc << 5 | v
+	if acc & ((1 << pad) - 1): return None
+	return '{:0{}x}'.format(acc >> pad, n // 8 * 2).decode('hex') if n >= 8 else ''
+
+def encode_fast(hrp, witver, witprog):
+	"""Encode a segwit address from a byte string witness program."""
+	data = [witver] + convertbits_8to5(witprog)
+	polymod = bech32_polymod_fast(data + [0, 0, 0, 0, 0, 0], _hrp_state(hrp)) ^ 1
+	return hrp + '1' + ''.join([CHARSET[d] for d in data] +
+			[CHARSET[(polymod >> 5 * (5 - i)) & 31] for i in range(6)])
+
+def decode_fast(hrp, addr):
+	"""Decode a segwit address, returning the witness program as a byte string."""
+	if len(addr) > 90 or (addr.lower() != addr and addr.upper() != addr):
+		return (None, None)
+	addr = addr.lower()
+	pos = addr.rfind('1')
+	if pos < 1 or addr[:pos] != hrp or pos + 7 > len(addr):
+		return (None, None)
+	try: data = map(ord, str(addr[pos+1:]).translate(_charset_rev_tbl))
+	except UnicodeError: return (None, None)
+	if 0xff in data or bech32_polymod_fast(data, _hrp_state(hrp)) != 1:
+		return (None, None)
+	decoded = convertbits_5to8(data[1:-6])
+	if decoded is None or len(decoded) < 2 or len(decoded) > 40:
+		return (None, None)
+	if data[0] > 16:
+		return (None, None)
+	if data[0] == 0 and len(decoded) != 20 and len(decoded) != 32:
+		return (None, None)
+	return (data[0], decoded)
+
+def encode_many(hrp, witver, witprogs):
+	"""Encode a list of segwit addresses."""
+	return [encode_fast(hrp, witver, w) for w in witprogs]
+
+def verify_many(hrp, addrs):
+	"""Return True for each valid segwit address in a list."""
+	return [decode_fast(hrp, a) != (None, None) for a in addrs]
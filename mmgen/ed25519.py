@@ -55,3 +55,87 @@ def encodepoint(P):
 	y = P[1]
 	bits = [(y >> i) & 1 for i in range(b-1)] + [x & 1]
 	return b''.join([chr(sum([bits[i * 8 + j] << j for j in range(8)])) for i in range(b//8)])
+
+# Fast fixed-base scalar multiplication, for address generation.  Not part of the
+# reference software above.
+#
+# Points are added in extended coordinates (X:Y:Z:T, with x=X/Z, y=Y/Z, xy=T/Z)
+# using the complete formulas of Hisil et al. for a=-1, so no inversions are
+# needed until the result is converted back to affine form.  The multiples
+# j*16**i*B for all 64 radix-16 digit positions i are precomputed, so a scalar
+# multiplication of the base point needs only 64 additions and no doublings.
+# Conversion of a batch of points to affine form shares a single inversion.
+
+d2 = 2 * d % q
+
+def _add_ext(P,Q): # extended + extended
+	X1,Y1,Z1,T1 = P
+	X2,Y2,Z2,T2 = Q
+	A = (Y1-X1) * (Y2-X2) % q
+	B = (Y1+X1) * (Y2+X2) % q
+	C = T1 * d2 * T2 % q
+	D = 2 * Z1 * Z2 % q
+	E,F,G,H = B-A,D-C,D+C,B+A
+	return (E*F % q, G*H % q, F*G % q, E*H % q)
+
+def _batch_inv(xs):
+	"invert all elements of 'xs' using a single modular inversion (Montgomery's trick)"
+	acc,prods = 1,[]
+	for x in xs:
+		prods.append(acc)
+		acc = acc * x % q
+	acc = inv(acc)
+	ret = [0] * len(xs)
+	for i in range(len(xs)-1,-1,-1):
+		ret[i] = acc * prods[i] % q
+		acc = acc * xs[i] % q
+	return ret
+
+_base_table = None # _base_table[i][j] is (y+x, y-x, 2dxy) of j*16**i*B, affine
+
+def _get_base_table():
+	global _base_table
+	if not _base_table:
+		pts,P = [],(B[0],B[1],1,B[0]*B[1] % q)
+		for i in range(64):
+			row = [P]
+			for j in range(14): row.append(_add_ext(row[-1],P))
+			pts += row
+			P = _add_ext(row[-1],P) # 16**(i+1)*B
+		zinvs = _batch_inv([Z for X,Y,Z,T in pts])
+		tbl = []
+		for (X,Y,Z,T),zi in zip(pts,zinvs):
+			x,y = X*zi % q,Y*zi % q
+			tbl.append((y+x,y-x,d2*x*y % q))
+		_base_table = [[None] + tbl[i:i+15] for i in range(0,len(tbl),15)]
+	return _base_table
+
+def _scalarmultbase_ext(e):
+	tbl = _get_base_table()
+	e %= l
+	X1,Y1,Z1,T1 = 0,1,1,0
+	for row in tbl:
+		j = e & 15
+		e >>= 4
+		if not j: continue
+		yp,ym,t2d = row[j]
+		# mixed addition: the table point has Z=1
+		A = (Y1-X1) * ym % q
+		B_ = (Y1+X1) * yp % q
+		C = T1 * t2d % q
+		D = 2 * Z1
+		E,F,G,H = B_-A,D-C,D+C,B_+A
+		X1,Y1,Z1,T1 = E*F % q, G*H % q, F*G % q, E*H % q
+	return X1,Y1,Z1
+
+def scalarmultbase_many(es):
+	"return the affine points e*B for all scalars in 'es'"
+	pts = [_scalarmultbase_ext(e) for e in es]
+	zinvs = _batch_inv([Z for X,Y,Z in pts])
+	return [[X*zi % q, Y*zi % q] for (X,Y,Z),zi in zip(pts,zinvs)]
+
+def scalarmultbase(e):
+	return scalarmultbase_many([e])[0]
+
+def encodepoint_fast(P):
+	return '{:064x}'.format(P[1] | (P[0] & 1) << 255).decode('hex')[::-1]
@@ -51,6 +51,8 @@ class g(object):
 	max_int   = 0xffffffff
 	stdin_tty = bool(sys.stdin.isatty() or os.getenv('MMGEN_TEST_SUITE'))
 	http_timeout = 60
+	rpc_pool_size = 4 # max. idle keep-alive connections kept per RPC host and port
+	rpc_batch_chunk_size = 1000 # batch RPC calls are split into chunks of this many requests
 
 	# Variables - these might be altered at runtime:
 
@@ -68,6 +70,7 @@ class g(object):
 	debug                = False
 	debug_opts           = False
 	debug_rpc            = False
+	debug_rpc_stats      = False
 	debug_addrlist       = False
 	quiet                = False
 	no_license           = False
@@ -76,6 +79,7 @@ class g(object):
 	testnet              = False
 	regtest              = False
 	accept_defaults      = False
+	profile_startup      = False
 	chain                = None # set by first call to rpc_init()
 	chains               = 'mainnet','testnet','regtest'
 	daemon_version       = None # set by first call to rpc_init()
@@ -113,12 +117,13 @@ class g(object):
 	common_opts = (
 		'color','no_license','rpc_host','rpc_port','testnet','rpc_user','rpc_password',
 		'daemon_data_dir','force_256_color','regtest','coin','bob','alice',
-		'accept_defaults'
+		'accept_defaults','profile_startup'
 	)
 	required_opts = (
 		'quiet','verbose','debug','outdir','echo_passphrase','passwd_file','stdout',
 		'show_hash_presets','label','keep_passphrase','keep_hash_preset','yes',
-		'brain_params','b16','usr_randchars','coin','bob','alice','key_generator'
+		'brain_params','b16','usr_randchars','coin','bob','alice','key_generator','jobs',
+		'checkpoint_cache','check_keys','sign_method'
 	)
 	incompatible_opts = (
 		('base32','hex'), # mmgen-passgen
@@ -130,11 +135,11 @@ class g(object):
 		('batch','rescan') # still incompatible as of Core 0.15.0
 	)
 	cfg_file_opts = (
-		'color','debug','hash_preset','http_timeout','no_license','rpc_host','rpc_port',
+		'color','debug','hash_preset','http_timeout','rpc_pool_size','rpc_batch_chunk_size','no_license','rpc_host','rpc_port',
 		'quiet','tx_fee_adj','usr_randchars','testnet','rpc_user','rpc_password',
 		'daemon_data_dir','force_256_color','regtest',
 		'btc_max_tx_fee','ltc_max_tx_fee','bch_max_tx_fee',
-		'max_tx_file_size'
+		'max_tx_file_size','max_json_tx_file_size','tx_file_format','sign_method'
 	)
 	env_opts = (
 		'MMGEN_BOGUS_WALLET_DATA',
@@ -142,6 +147,7 @@ class g(object):
 		'MMGEN_DEBUG',
 		'MMGEN_DEBUG_OPTS',
 		'MMGEN_DEBUG_RPC',
+		'MMGEN_DEBUG_RPC_STATS',
 		'MMGEN_DEBUG_ADDRLIST',
 		'MMGEN_DEBUG_UTF8',
 		'MMGEN_QUIET',
@@ -150,6 +156,7 @@ class g(object):
 		'MMGEN_MIN_URANDCHARS',
 		'MMGEN_NO_LICENSE',
 		'MMGEN_RPC_HOST',
+		'MMGEN_TX_FILE_FORMAT',
 		'MMGEN_TESTNET',
 		'MMGEN_REGTEST'
 	)
@@ -157,10 +164,15 @@ class g(object):
 	min_screen_width = 80
 	minconf = 1
 	max_tx_file_size = 100000
+	max_json_tx_file_size = 10000000
+	tx_file_format = 'legacy' # format for writing transaction files: 'legacy' or 'json'
+	tx_file_formats = ('legacy','json')
+	sign_method = 'daemon'    # sign transactions with the coin daemon or in-process: 'daemon' or 'native'
+	sign_methods = ('daemon','native')
 
 	# Global var sets user opt:
 	global_sets_opt = ['minconf','seed_len','hash_preset','usr_randchars','debug',
-						'quiet','tx_confs','tx_fee_adj','key_generator']
+						'quiet','tx_confs','tx_fee_adj','key_generator','jobs','sign_method']
 
 	passwd_max_tries = 5
 
@@ -174,9 +186,13 @@ class g(object):
 	aesctr_iv_len  = 16
 	hincog_chk_len = 8
 
-	key_generators = 'python-ecdsa','secp256k1' # '1','2'
+	key_generators = 'python','secp256k1' # '1','2'
 	key_generator  = 2 # secp256k1 is default
 
+	jobs           = 1 # number of processes used for key/address generation
+
+	seed_chain_checkpoint_interval = 10000 # rounds between seed chain cache checkpoints
+
 	hash_presets = {
 	#   Scrypt params:
 	#   ID    N   p  r (N is an exponent of two)
@@ -20,6 +20,41 @@
 main.py - Script launcher for the MMGen suite
 """
 
+def profile_imports():
+	"time each module import and print a report on exit (--profile-startup)"
+	import sys,time,atexit,__builtin__
+	orig_import = __builtin__.__import__
+	t_start,times,stack = time.time(),[],[]
+
+	def timed_import(name,globals=None,locals=None,fromlist=None,level=-1):
+		if name in sys.modules:
+			return orig_import(name,globals,locals,fromlist,level)
+		n = len(times)
+		times.append(None) # keep entries in import order
+		stack.append(0.0)
+		t = time.time()
+		try:
+			return orig_import(name,globals,locals,fromlist,level)
+		finally:
+			elapsed,children = time.time() - t,stack.pop()
+			if stack: stack[-1] += elapsed
+			times[n] = (elapsed-children,elapsed,len(stack),name or '.'+','.join(fromlist or []))
+
+	def report():
+		w = sys.stderr.write
+		w('\nStartup import profile: {} imports, {:.1f} ms of {:.1f} ms total run time\n'.format(
+			len(times),sum(t[0] for t in times)*1000,(time.time()-t_start)*1000))
+		w('  {:>8} {:>8}  {}\n'.format('self ms','cum ms','module'))
+		for t_self,t_cum,depth,name in times:
+			if t_cum >= 0.0001:
+				w('  {:8.2f} {:8.2f}  {}{}\n'.format(t_self*1000,t_cum*1000,'  '*depth,name))
+		w('Slowest:\n')
+		for t_self,t_cum,depth,name in sorted(times,reverse=True)[:10]:
+			w('  {:8.2f}  {}\n'.format(t_self*1000,name))
+
+	__builtin__.__import__ = timed_import
+	atexit.register(report)
+
 def launch(what):
 
 	def my_dec(a):
@@ -32,6 +67,10 @@ def launch(what):
 	import sys
 	sys.argv = map(my_dec,sys.argv)
 
+	# must be done before any other modules are imported, i.e. before opts are parsed
+	if '--profile-startup' in sys.argv:
+		profile_imports()
+
 	if what in ('walletgen','walletchk','walletconv','passchg'):
 		what = 'wallet'
 	if what == 'keygen': what = 'addrgen'
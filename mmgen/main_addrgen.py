@@ -35,7 +35,7 @@ if sys.argv[0].split('-')[-1] == 'keygen':
 else:
 	gen_what = 'addresses'
 	gen_desc = 'addresses'
-	opt_filter = 'hbcdeEiHOKlpzPqrStv-'
+	opt_filter = 'hbcCdeEiHOjKlpzPqrStv-'
 	note_addrkey = ''
 note_secp256k1 = """
 If available, the secp256k1 library will be used for address generation.
@@ -50,15 +50,19 @@ opts_data = lambda: {
 -h, --help            Print this help message
 --, --longhelp        Print help message for long options (common options)
 -A, --no-addresses    Print only secret keys, no addresses
+-C, --checkpoint-cache Use an encrypted on-disk cache of seed chain checkpoints
+                      (speeds up generation of keys with high indexes)
 -c, --print-checksum  Print address list checksum and exit
 -d, --outdir=      d  Output files to directory 'd' instead of working dir
 -e, --echo-passphrase Echo passphrase or mnemonic to screen upon entry
--E, --use-internal-ed25519-mod  Use (slow) internal ed25519 module for Monero
+-E, --use-internal-ed25519-mod  Use internal ed25519 module for Monero
                       address generation, even if ed25519ll is installed
 -i, --in-fmt=      f  Input is from wallet format 'f' (see FMT CODES below)
 -H, --hidden-incog-input-params=f,o  Read hidden incognito data from file
                       'f' at offset 'o' (comma-separated)
 -O, --old-incog-fmt   Specify old-format incognito input
+-j, --jobs=        n  Use 'n' parallel processes for key and address generation
+                      (default: {g.jobs})
 -K, --key-generator=m Use method 'm' for public key generation
                       Options: {kgs} (default: {kg})
 -l, --seed-len=    l  Specify wallet seed length of 'l' bits.  This option
@@ -124,7 +128,7 @@ addr_type = MAT(opt.type or g.proto.dfl_mmtype,errmsg=errmsg)
 if len(cmd_args) < 1: opts.usage()
 
 if opt.use_internal_ed25519_mod:
-	msg('Using (slow) internal ed25519 module by user request')
+	msg('Using internal ed25519 module by user request')
 
 idxs = AddrIdxList(fmt_str=cmd_args.pop())
 
@@ -44,9 +44,11 @@ opts_data = lambda: {
 -m, --mountpoint=m  Specify an alternate mountpoint (default: '{mp}')
 -s, --stealth-led   Stealth LED mode - signal busy and error only, and only
                     after successful authorization.
+-S, --sign-method=m Sign with method 'm': 'daemon' or 'native' (in-process,
+                    no coin daemons needed) (default: '{sm}')
 -q, --quiet         Produce quieter output
 -v, --verbose       Produce more verbose output
-""".format(mp=mountpoint),
+""".format(mp=mountpoint,sm=g.sign_method),
 	'notes': """
 
                               COMMANDS
@@ -159,7 +161,7 @@ def sign_tx_file(txfile):
 		init_coin(mmgen.tx.MMGenTX(txfile,coin_sym_only=True).coin)
 		reload(sys.modules['mmgen.tx'])
 		tx = mmgen.tx.MMGenTX(txfile)
-		if tx.coin not in no_daemon_coins:
+		if tx.coin not in no_daemon_coins and opt.sign_method != 'native':
 			rpc_init(reinit=True)
 		txsign(tx,wfs,None,None)
 		tx.write_to_file(ask_write=False)
@@ -397,7 +399,8 @@ if len(cmd_args) == 1:
 check_wipe_present()
 wfs = get_wallet_files()
 
-check_daemons_running()
+if opt.sign_method != 'native':
+	check_daemons_running()
 
 def at_exit(exit_val,nl=False):
 	if nl: msg('')
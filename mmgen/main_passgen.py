@@ -43,12 +43,16 @@ opts_data = lambda: {
 --, --longhelp        Print help message for long options (common options)
 -b, --base32          Generate passwords in Base32 format instead of Base58
 -x, --hex             Generate passwords in raw hex format instead of Base58
+-C, --checkpoint-cache Use an encrypted on-disk cache of seed chain checkpoints
+                      (speeds up generation of keys with high indexes)
 -d, --outdir=      d  Output files to directory 'd' instead of working dir
 -e, --echo-passphrase Echo passphrase or mnemonic to screen upon entry
 -i, --in-fmt=      f  Input is from wallet format 'f' (see FMT CODES below)
 -H, --hidden-incog-input-params=f,o  Read hidden incognito data from file
                       'f' at offset 'o' (comma-separated)
 -O, --old-incog-fmt   Specify old-format incognito input
+-j, --jobs=        n  Use 'n' parallel processes for password generation
+                      (default: {g.jobs})
 -L, --passwd-len=  l  Specify length of generated passwords
                       (default: {d58} chars [base58], {d32} chars [base32],
                       {dhex} chars [hex]).  An argument of 'h' will generate
@@ -102,6 +102,8 @@ Mnemonic operations (choose 'electrum' (default), 'tirosh' or 'all'
   mn_printlist - print mnemonic wordlist
   hex2mn       - convert a 16, 24 or 32-byte number in hex format to a mnemonic
   mn2hex       - convert a 12, 18 or 24-word mnemonic to a number in hex format
+  hex2mn_many  - convert hex numbers, one per line (file or stdin), to mnemonics
+  mn2hex_many  - convert mnemonics, one per line (file or stdin), to hex numbers
 
   IMPORTANT NOTE: Though {pnm} mnemonics use the Electrum wordlist, they're
   computed using a different algorithm and are NOT Electrum-compatible!
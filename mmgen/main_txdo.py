@@ -64,6 +64,8 @@ opts_data = lambda: {
                        for password hashing (default: '{g.hash_preset}')
 -P, --passwd-file=   f Get {pnm} wallet passphrase from file 'f'
 -r, --rbf              Make transaction BIP 125 (replace-by-fee) replaceable
+-s, --sign-method=   m Sign with method 'm': 'daemon' or 'native' (in-process)
+                       (default: '{g.sign_method}')
 -q, --quiet            Suppress warnings; overwrite files without prompting
 -v, --verbose          Produce more verbose output
 -V, --vsize-adj=     f Adjust transaction's estimated vsize by factor 'f'
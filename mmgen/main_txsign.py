@@ -32,6 +32,10 @@ opts_data = lambda: {
 --, --longhelp        Print help message for long options (common options)
 -b, --brain-params=l,p Use seed length 'l' and hash preset 'p' for
                       brainwallet input
+-c, --check-keys      Check the key-to-address mappings of the key-address file
+                      without prompting (see '--mmgen-keys-from-file')
+-C, --checkpoint-cache Use an encrypted on-disk cache of seed chain checkpoints
+                      (speeds up generation of keys with high indexes)
 -d, --outdir=      d  Specify an alternate directory 'd' for output
 -D, --tx-id           Display transaction ID and exit
 -e, --echo-passphrase Print passphrase to screen when typing it
@@ -55,7 +59,12 @@ opts_data = lambda: {
                       mappings, so the user should record its checksum.
 -P, --passwd-file= f  Get {pnm} wallet or {dn} passphrase from file 'f'
 -q, --quiet           Suppress warnings; overwrite files without prompting
+-s, --sign-method= m  Sign with method 'm': 'daemon' (pass keys to the coin
+                      daemon) or 'native' (sign in-process, no daemon needed)
+                      (default: '{g.sign_method}')
 -I, --info            Display information about the transaction and exit
+-j, --jobs=        n  Use 'n' parallel processes for key generation and key-to-
+                      address checking (default: {g.jobs})
 -t, --terse-info      Like '--info', but produce more concise output
 -v, --verbose         Produce more verbose output
 -V, --vsize-adj=   f  Adjust transaction's estimated vsize by factor 'f'
@@ -75,7 +84,8 @@ infiles = opts.init(opts_data,add_opts=['b16'])
 if not infiles: opts.usage()
 for i in infiles: check_infile(i)
 
-rpc_init()
+if opt.sign_method != 'native':
+	rpc_init()
 
 if not opt.info and not opt.terse_info:
 	do_license_msg(immed=True)
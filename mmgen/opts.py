@@ -171,6 +171,15 @@ def override_from_env():
 			gname = name[idx:].lower()
 			setattr(g,gname,set_for_type(val.decode('utf8'),getattr(g,gname),name,invert_bool))
 
+# Check values set from the cfg file or environment.  User opts are checked by check_opts()
+def check_cfg_opts():
+	from mmgen.util import die
+	for name,choices in (('tx_file_format',g.tx_file_formats),('sign_method',g.sign_methods)):
+		val = getattr(g,name)
+		if val not in choices:
+			fs = "'{}': invalid value for '{}' in config file or environment\nValid choices: '{}'"
+			die(1,fs.format(val,name,"','".join(choices)))
+
 def warn_altcoins(trust_level):
 	if trust_level == None: return
 	tl = (red('COMPLETELY UNTESTED'),red('LOW'),yellow('MEDIUM'),green('HIGH'))
@@ -206,6 +215,7 @@ def init(opts_f,add_opts=[],opt_filter=None):
 --, --regtest=0|1         Disable or enable regtest mode
 --, --testnet=0|1         Disable or enable testnet
 --, --skip-cfg-file       Skip reading the configuration file
+--, --profile-startup     Print a report of module import times on exit
 --, --version             Print version information and exit
 --, --bob                 Switch to user "Bob" in MMGen regtest setup
 --, --alice               Switch to user "Alice" in MMGen regtest setup
@@ -250,6 +260,7 @@ def init(opts_f,add_opts=[],opt_filter=None):
 	if not opt.skip_cfg_file:
 		override_from_cfg_file(get_data_from_cfg_file())
 	override_from_env()
+	check_cfg_opts()
 
 	# User opt sets global var - do these here, before opt is set from g.global_sets_opt
 	for k in g.common_opts:
@@ -487,9 +498,13 @@ def check_opts(usr_opts):       # Returns false if any check fails
 		elif key == 'vsize_adj':
 			if not opt_is_float(val,desc): return False
 			ymsg('Adjusting transaction vsize by a factor of {:1.2f}'.format(float(val)))
+		elif key == 'jobs':
+			if not opt_compares(val,'>',0,desc): return False
 		elif key == 'key_generator':
 			if not opt_compares(val,'<=',len(g.key_generators),desc): return False
 			if not opt_compares(val,'>',0,desc): return False
+		elif key == 'sign_method':
+			if not opt_is_in_list(val,g.sign_methods,desc): return False
 		elif key == 'coin':
 			from mmgen.protocol import CoinProtocol
 			if not opt_is_in_list(val.lower(),CoinProtocol.coins.keys(),'coin'): return False
@@ -21,17 +21,23 @@ protocol.py: Coin protocol functions, classes and methods
 """
 
 import sys,os,hashlib
-from binascii import unhexlify
+from binascii import hexlify,unhexlify
 from mmgen.util import msg,pmsg,Msg,pdie
 from mmgen.obj import MMGenObject,BTCAmt,LTCAmt,BCHAmt,B2XAmt,ETHAmt
 from mmgen.globalvars import g
 import mmgen.bech32 as bech32
 
+def hash160_bin(data): # take bytes, return bytes - OP_HASH160
+	return hashlib.new('ripemd160',hashlib.sha256(data).digest()).digest()
+
+def hash256_bin(data): # take bytes, return bytes - OP_HASH256
+	return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
 def hash160(hexnum): # take hex, return hex - OP_HASH160
-	return hashlib.new('ripemd160',hashlib.sha256(unhexlify(hexnum)).digest()).hexdigest()
+	return hexlify(hash160_bin(unhexlify(hexnum)))
 
 def hash256(hexnum): # take hex, return hex - OP_HASH256
-	return hashlib.sha256(hashlib.sha256(unhexlify(hexnum)).digest()).hexdigest()
+	return hexlify(hash256_bin(unhexlify(hexnum)))
 
 # From en.bitcoin.it:
 #  The Base58 encoding used is home made, and has some differences.
@@ -40,25 +46,50 @@ def hash256(hexnum): # take hex, return hex - OP_HASH256
 # The 'zero address':
 # 1111111111111111111114oLvT2 (pubkeyhash = '\0'*20)
 _b58a='123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
-
-def _numtob58(num):
-	def b58enc(n):
-		while n:
-			yield _b58a[n % 58]
-			n /= 58
-	return ''.join(b58enc(num))[::-1]
-
-def _b58tonum(b58str):
-	return sum(_b58a.index(ch) * 58**n for n,ch in enumerate(b58str[::-1]))
-
-def _b58chk_encode(hexstr):
-	return _numtob58(int(hexstr+hash256(hexstr)[:8],16))
-
-def _b58chk_decode(s):
-	hexstr = '{:x}'.format(_b58tonum(s))
-	if hexstr[-8:] == hash256(hexstr[:-8])[:8]:
-		return hexstr[:-8]
-	raise ValueError,'_b58chk_decode(): checksum incorrect'
+_b58d = dict((ch,n) for n,ch in enumerate(_b58a))
+
+# Pure-Python fallbacks for the C base58 codec in extmod/base58mod.c
+def _b58encode_py(data):
+	n = int(hexlify(data),16) if data else 0
+	out = []
+	while n:
+		n,r = divmod(n,58)
+		out.append(_b58a[r])
+	return '1' * (len(data) - len(data.lstrip('\0'))) + ''.join(reversed(out))
+
+def _b58decode_py(s):
+	n = 0
+	for ch in s:
+		try: n = n * 58 + _b58d[ch]
+		except KeyError: raise ValueError,"'{}': invalid base58 character".format(ch)
+	h = '{:x}'.format(n) if n else ''
+	return '\0' * (len(s) - len(s.lstrip('1'))) + unhexlify(('','0')[len(h) % 2] + h)
+
+try:
+	from mmgen.base58 import encode as b58encode,decode as b58decode
+	from mmgen.base58 import encode_many as b58encode_many,decode_many as b58decode_many
+except ImportError:
+	b58encode,b58decode = _b58encode_py,_b58decode_py
+	def b58encode_many(datas): return [_b58encode_py(d) for d in datas]
+	def b58decode_many(strs): return [_b58decode_py(s) for s in strs]
+
+def _b58chk(data): # 4-byte Base58Check checksum
+	return hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+
+def b58chk_encode(data):
+	return b58encode(data + _b58chk(data))
+
+def b58chk_decode(s):
+	data = b58decode(s)
+	if _b58chk(data[:-4]) == data[-4:]:
+		return data[:-4]
+	raise ValueError,'b58chk_decode(): checksum incorrect'
+
+def b58chk_encode_many(datas):
+	return b58encode_many([d + _b58chk(d) for d in datas])
+
+def b58chk_decode_many(strs):
+	return [b58chk_decode(s) for s in strs]
 
 # chainparams.cpp
 class BitcoinProtocol(MMGenObject):
@@ -112,11 +143,11 @@ class BitcoinProtocol(MMGenObject):
 
 	@classmethod
 	def hex2wif(cls,hexpriv,pubkey_type,compressed):
-		return _b58chk_encode(cls.wif_ver_num[pubkey_type] + hexpriv + ('','01')[bool(compressed)])
+		return b58chk_encode(unhexlify(cls.wif_ver_num[pubkey_type] + hexpriv + ('','01')[bool(compressed)]))
 
 	@classmethod
 	def wif2hex(cls,wif):
-		key = _b58chk_decode(wif)
+		key = hexlify(b58chk_decode(wif))
 		pubkey_type = None
 		for k,v in cls.wif_ver_num.items():
 			if key[:len(v)] == v:
@@ -135,12 +166,12 @@ class BitcoinProtocol(MMGenObject):
 	def verify_addr(cls,addr,hex_width,return_dict=False):
 
 		if 'B' in cls.mmtypes and addr[:len(cls.bech32_hrp)] == cls.bech32_hrp:
-			ret = bech32.decode(cls.bech32_hrp,addr)
+			ret = bech32.decode_fast(cls.bech32_hrp,addr)
 			if ret[0] != cls.witness_vernum:
 				msg('{}: Invalid witness version number'.format(ret[0]))
 			elif ret[1]:
 				return {
-					'hex': ''.join(map(chr,ret[1])).encode('hex'),
+					'hex': hexlify(ret[1]),
 					'format': 'bech32'
 				} if return_dict else True
 			return False
@@ -150,16 +181,17 @@ class BitcoinProtocol(MMGenObject):
 			if type(pfx) == tuple:
 				if addr[0] not in pfx: continue
 			elif addr[:len(pfx)] != pfx: continue
-			num = _b58tonum(addr)
-			if num == False:
+			data = b58decode(addr).lstrip('\0')
+			if not data:
 				if g.debug: Msg('Address cannot be converted to base 58')
 				break
-			addr_hex = '{:0{}x}'.format(num,len(ver_num)+hex_width+8)
-#			pmsg(hex_width,len(addr_hex),addr_hex[:len(ver_num)],ver_num)
-			if addr_hex[:len(ver_num)] != ver_num: continue
-			if hash256(addr_hex[:-8])[:8] == addr_hex[-8:]:
+			vlen = len(ver_num) / 2
+			data = data.rjust(vlen+hex_width/2+4,'\0')
+#			pmsg(hex_width,len(data),hexlify(data[:vlen]),ver_num)
+			if hexlify(data[:vlen]) != ver_num: continue
+			if _b58chk(data[:-4]) == data[-4:]:
 				return {
-					'hex': addr_hex[len(ver_num):-8],
+					'hex': hexlify(data[vlen:-4]),
 					'format': {'p2pkh':'p2pkh','p2sh':'p2sh','p2sh2':'p2sh',
 								'zcash_z':'zcash_z','viewkey':'viewkey'}[addr_fmt]
 				} if return_dict else True
@@ -172,26 +204,47 @@ class BitcoinProtocol(MMGenObject):
 	@classmethod
 	def pubhash2addr(cls,pubkey_hash,p2sh):
 		assert len(pubkey_hash) == 40,'{}: invalid length for pubkey hash'.format(len(pubkey_hash))
-		s = cls.addr_ver_num[('p2pkh','p2sh')[p2sh]][0] + pubkey_hash
-		lzeroes = (len(s) - len(s.lstrip('0'))) / 2 # non-zero only for ver num '00' (BTC p2pkh)
-		return ('1' * lzeroes) + _b58chk_encode(s)
+		return cls.pubhash_bin2addr(unhexlify(pubkey_hash),p2sh)
 
 	# Segwit:
 	@classmethod
 	def pubhex2redeem_script(cls,pubhex):
+		return hexlify(cls.pubkey_bin2redeem_script(unhexlify(pubhex)))
+
+	@classmethod
+	def pubhex2segwitaddr(cls,pubhex):
+		return cls.pubkey_bin2segwitaddr(unhexlify(pubhex))
+
+	@classmethod
+	def pubhash2bech32addr(cls,pubhash):
+		return cls.pubhash_bin2bech32addr(unhexlify(pubhash))
+
+	# Byte string versions of the above, used for address generation.  Keys and hashes are
+	# converted from hex only once, when passed in by the caller.
+	@classmethod
+	def pubhash_bin2addr(cls,pubkey_hash,p2sh):
+		assert len(pubkey_hash) == 20,'{}: invalid length for pubkey hash'.format(len(pubkey_hash))
+		# leading zero bytes (ver num '00' for BTC p2pkh) are encoded as '1'
+		return b58chk_encode(unhexlify(cls.addr_ver_num[('p2pkh','p2sh')[p2sh]][0]) + pubkey_hash)
+
+	@classmethod
+	def pubkey_bin2redeem_script(cls,pubkey):
 		# https://bitcoincore.org/en/segwit_wallet_dev/
 		# The P2SH redeemScript is always 22 bytes. It starts with a OP_0, followed
 		# by a canonical push of the keyhash (i.e. 0x0014{20-byte keyhash})
-		return cls.witness_vernum_hex + '14' + hash160(pubhex)
+		return unhexlify(cls.witness_vernum_hex) + '\x14' + hash160_bin(pubkey)
 
 	@classmethod
-	def pubhex2segwitaddr(cls,pubhex):
-		return cls.pubhash2addr(hash160(cls.pubhex2redeem_script(pubhex)),p2sh=True)
+	def pubkey_bin2segwitaddr(cls,pubkey):
+		return cls.pubhash_bin2addr(hash160_bin(cls.pubkey_bin2redeem_script(pubkey)),p2sh=True)
 
 	@classmethod
-	def pubhash2bech32addr(cls,pubhash):
-		d = map(ord,pubhash.decode('hex'))
-		return bech32.bech32_encode(cls.bech32_hrp,[cls.witness_vernum]+bech32.convertbits(d,8,5))
+	def pubhash_bin2bech32addr(cls,pubhash):
+		return bech32.encode_fast(cls.bech32_hrp,cls.witness_vernum,pubhash)
+
+	@classmethod
+	def pubhashes_bin2bech32addrs(cls,pubhashes):
+		return bech32.encode_many(cls.bech32_hrp,cls.witness_vernum,pubhashes)
 
 class BitcoinTestnetProtocol(BitcoinProtocol):
 	addr_ver_num         = { 'p2pkh': ('6f',('m','n')), 'p2sh':  ('c4','2') }
@@ -218,9 +271,9 @@ class BitcoinCashProtocol(BitcoinProtocol):
 	max_tx_fee      = BCHAmt('0.1')
 
 	@classmethod
-	def pubhex2redeem_script(cls,pubhex): raise NotImplementedError
+	def pubkey_bin2redeem_script(cls,pubkey): raise NotImplementedError
 	@classmethod
-	def pubhex2segwitaddr(cls,pubhex):    raise NotImplementedError
+	def pubkey_bin2segwitaddr(cls,pubkey):    raise NotImplementedError
 
 class BitcoinCashTestnetProtocol(BitcoinCashProtocol):
 	rpc_port      = 18442
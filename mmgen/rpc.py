@@ -20,19 +20,122 @@
 rpc.py:  Cryptocoin RPC library for the MMGen suite
 """
 
-import httplib,base64,json
+import httplib,base64,json,time,threading,Queue,re,socket,errno,codecs
 
 from mmgen.common import *
 from decimal import Decimal
 
+# httplib encodes a unicode host name with the 'idna' codec, which Python 2 imports on first
+# use.  In an RPCFuture or request_chunked() thread, that import would deadlock on the import lock
+# held by the main thread while launch() runs the main_*.py module, so do it here instead
+u'localhost'.encode('idna')
+
 def dmsg_rpc(s):
 	if g.debug_rpc: msg(s)
 
 class RPCFailure(Exception): pass
 
+# on_fail is one of 'die', 'return', 'silent', 'raise' (see request() below)
+def rpc_fail(on_fail,*args):
+	if on_fail in ('return','silent'):
+		return 'rpcfail',args
+
+	try:    s = u'{}'.format(args[2])
+	except: s = repr(args[2])
+
+	if on_fail == 'raise':
+		raise RPCFailure,s
+	elif on_fail == 'die':
+		die(args[1],yellow(s))
+
+# True if the server closed or reset the connection before sending any reply data
+def conn_closed_before_reply(e):
+	if isinstance(e,httplib.BadStatusLine): # the message for an empty status line varies by version
+		return e.line in ('',"''") or e.line.startswith('No status line')
+	return isinstance(e,socket.error) and not isinstance(e,socket.timeout) and e.errno == errno.ECONNRESET
+
+class MyJSONEncoder(json.JSONEncoder):
+	def default(self,obj):
+		if isinstance(obj,g.proto.coin_amt):
+			return g.proto.get_rpc_coin_amt_type()(obj)
+		return json.JSONEncoder.default(self,obj)
+
+class RPCConnectionPool(object):
+	"""
+	Idle keep-alive HTTP connections to a coin daemon, shared by all RPC handles for the
+	same host and port.  At most 'size' idle connections are kept.  Thread-safe.
+	"""
+	pools = {}
+
+	def __new__(cls,host,port,size=None):
+		if (host,port) not in cls.pools:
+			me = object.__new__(cls)
+			me.host,me.port = host,port
+			me.idle = []
+			me.lock = threading.Lock()
+			cls.pools[(host,port)] = me
+		me = cls.pools[(host,port)]
+		me.size = size or g.rpc_pool_size
+		return me
+
+	def get(self,timeout):
+		with self.lock:
+			hc = self.idle.pop() if self.idle else None
+		if hc:
+			hc.timeout = timeout
+			if hc.sock: hc.sock.settimeout(timeout)
+			return hc
+		return httplib.HTTPConnection(self.host,self.port,False,timeout)
+
+	def put(self,hc):
+		with self.lock:
+			if len(self.idle) < self.size:
+				self.idle.append(hc)
+				return
+		hc.close()
+
+	def close(self):
+		with self.lock:
+			idle,self.idle = self.idle,[]
+		for hc in idle: hc.close()
+
+class RPCFuture(object):
+	"""
+	An RPC call running in its own thread.  The call is made with on_fail='return' (or
+	'silent'), and result() handles a failure in the calling thread according to the
+	caller's on_fail, so 'die' and 'raise' behave as with a blocking call.
+	"""
+	def __init__(self,conn,cmd,args,kwargs):
+		self.on_fail = kwargs.get('on_fail') or 'die'
+		kwargs['on_fail'] = ('return','silent')[self.on_fail in ('silent','raise')]
+		self.ret = None
+		self.thread = threading.Thread(target=self.run,args=(conn,cmd,args,kwargs))
+		self.thread.daemon = True
+		self.thread.start()
+
+	# NB: no imports here!  See the 'idna' codec note above
+	def run(self,conn,cmd,args,kwargs):
+		try:
+			self.ret = conn.request(cmd,*args,**kwargs)
+		except Exception as e:
+			self.ret = e
+
+	def done(self):
+		return not self.thread.is_alive()
+
+	def result(self):
+		while self.thread.is_alive(): self.thread.join(0.1) # join() with no timeout blocks KeyboardInterrupt
+		if isinstance(self.ret,Exception):
+			raise self.ret
+		if rpc_error(self.ret):
+			return rpc_fail(self.on_fail,*self.ret[1])
+		return self.ret
+
 class CoinDaemonRPCConnection(object):
 
 	auth = True
+	request_method = 'request' # called by the methods in 'rpcmethods'
+	stream_chunk_len = 65536   # bytes read at a time from streamed replies
 	db_fs = '    host [{h}] port [{p}] user [{u}] passwd [{pw}] auth_cookie [{c}]\n'
 
 	def __init__(self,host=None,port=None,user=None,passwd=None,auth_cookie=None):
@@ -40,11 +143,15 @@ class CoinDaemonRPCConnection(object):
 		dmsg_rpc('=== {}.__init__() debug ==='.format(type(self).__name__))
 		dmsg_rpc(self.db_fs.format(h=host,p=port,u=user,pw=passwd,c=auth_cookie))
 
-		import socket
+		# the first connection is opened here, so we fail early, and then reused
+		self.pool = RPCConnectionPool(host,port)
+		hc = self.pool.get(3)
 		try:
-			socket.create_connection((host,port),timeout=3).close()
+			if not hc.sock: hc.connect()
 		except:
+			hc.close()
 			die(1,'Unable to connect to {}:{}'.format(host,port))
+		self.pool.put(hc)
 
 		if not self.auth:
 			pass
@@ -69,12 +176,27 @@ class CoinDaemonRPCConnection(object):
 		self.host = host
 		self.port = port
 
+		self.http_hdr = { 'Content-Type': 'application/json' }
+		if self.auth:
+			fs = '    RPC AUTHORIZATION data ==> raw: [{}]\n{:>31}enc: [Basic {}]\n'
+			as_enc = base64.b64encode(self.auth_str)
+			dmsg_rpc(fs.format(self.auth_str,'',as_enc))
+			self.http_hdr.update({ 'Host':self.host, 'Authorization':'Basic {}'.format(as_enc) })
+
+		self.stats = {} # cmd: [calls,total time]
+		self.stats_lock = threading.Lock()
+		if g.debug_rpc_stats:
+			import atexit
+			atexit.register(self.print_stats)
+
 		for method in self.rpcmethods:
-			exec '{c}.{m} = lambda self,*args,**kwargs: self.request("{m}",*args,**kwargs)'.format(
-						c=type(self).__name__,m=method)
+			exec '{c}.{m} = lambda self,*args,**kwargs: self.{r}("{m}",*args,**kwargs)'.format(
+						c=type(self).__name__,m=method,r=self.request_method)
 
 	# Normal mode: call with arg list unrolled, exactly as with cli
 	# Batch mode:  call with list of arg lists as first argument
+	# Stream mode: with stream=True, returns an iterator over the items of the result
+	#              array, which are decoded incrementally as the reply is read
 	# kwargs are for local use and are not passed to server
 
 	# By default, dies with an error msg on all errors and exceptions
@@ -85,65 +207,73 @@ class CoinDaemonRPCConnection(object):
 		if os.getenv('MMGEN_RPC_FAIL_ON_COMMAND') == cmd:
 			cmd = 'badcommand_' + cmd
 
-		cf = { 'timeout':g.http_timeout, 'batch':False, 'on_fail':'die' }
+		cf = { 'timeout':g.http_timeout, 'batch':False, 'on_fail':'die', 'stream':False }
 
 		for k in cf:
 			if k in kwargs and kwargs[k]: cf[k] = kwargs[k]
 
-		hc = httplib.HTTPConnection(self.host, self.port, False, cf['timeout'])
+		if cf['batch'] and len(args[0]) > g.rpc_batch_chunk_size:
+			return self.request_chunked(cmd,args[0],cf)
 
 		if cf['batch']:
 			p = [{'method':cmd,'params':r,'id':n,'jsonrpc':'2.0'} for n,r in enumerate(args[0],1)]
 		else:
 			p = {'method':cmd,'params':args,'id':1,'jsonrpc':'2.0'}
 
-		def do_fail(*args):
-			if cf['on_fail'] in ('return','silent'):
-				return 'rpcfail',args
-
-			try:    s = u'{}'.format(args[2])
-			except: s = repr(args[2])
-
-			if cf['on_fail'] == 'raise':
-				raise RPCFailure,s
-			elif cf['on_fail'] == 'die':
-				die(args[1],yellow(s))
+		def do_fail(*args): return rpc_fail(cf['on_fail'],*args)
 
 		dmsg_rpc('=== request() debug ===')
 		dmsg_rpc('    RPC POST data ==> {}\n'.format(p))
 
-		class MyJSONEncoder(json.JSONEncoder):
-			def default(self,obj):
-				if isinstance(obj,g.proto.coin_amt):
-					return g.proto.get_rpc_coin_amt_type()(obj)
-				return json.JSONEncoder.default(self,obj)
-
-		http_hdr = { 'Content-Type': 'application/json' }
-		if self.auth:
-			fs = '    RPC AUTHORIZATION data ==> raw: [{}]\n{:>31}enc: [Basic {}]\n'
-			as_enc = base64.b64encode(self.auth_str)
-			dmsg_rpc(fs.format(self.auth_str,'',as_enc))
-			http_hdr.update({ 'Host':self.host, 'Authorization':'Basic {}'.format(as_enc) })
+		t_start = time.time()
+		data = json.dumps(p,cls=MyJSONEncoder)
 
-		try:
-			hc.request('POST','/',json.dumps(p,cls=MyJSONEncoder),http_hdr)
-		except Exception as e:
-			m = '{}\nUnable to connect to {} at {}:{}'
-			return do_fail(None,2,m.format(e,g.proto.daemon_name,self.host,self.port))
+		# An idle keep-alive connection may have been closed by the server.  If so, retry with
+		# another connection.  Retry only if sending failed or the connection was closed before
+		# any reply data arrived, never on a timeout, so that a request is not repeated after
+		# the server may have processed it
+		while True:
+			hc = self.pool.get(cf['timeout'])
+			reused = hc.sock is not None
+			try:
+				hc.request('POST','/',data,self.http_hdr)
+			except Exception as e:
+				hc.close()
+				if reused and not isinstance(e,socket.timeout): continue
+				m = '{}\nUnable to connect to {} at {}:{}'
+				return do_fail(None,2,m.format(e,g.proto.daemon_name,self.host,self.port))
 
-		try:
-			r = hc.getresponse() # returns HTTPResponse instance
-		except Exception:
-			m = 'Unable to connect to {} at {}:{} (but port is bound?)'
-			return do_fail(None,2,m.format(g.proto.daemon_name,self.host,self.port))
+			try:
+				r = hc.getresponse() # returns HTTPResponse instance
+			except Exception as e:
+				hc.close()
+				if reused and conn_closed_before_reply(e): continue
+				m = 'Unable to connect to {} at {}:{} (but port is bound?)'
+				return do_fail(None,2,m.format(g.proto.daemon_name,self.host,self.port))
+			break
 
 		dmsg_rpc('    RPC GETRESPONSE data ==> {}\n'.format(r.__dict__))
 
+		if cf['stream'] and r.status == 200:
+			r_data = r.read(self.stream_chunk_len)
+			m = re.match(r'\s*{\s*"result"\s*:\s*\[',r_data)
+			if m: # otherwise, fall back to decoding the complete reply
+				return self.stream_result(cmd,hc,r,r_data,m.end(),cf,t_start)
+			r_data += r.read()
+		else:
+			r_data = r.read()
+
+		# the response must be read in full before the connection can be reused
+		if r.will_close: hc.close()
+		else:            self.pool.put(hc)
+
+		self.add_stats(cmd,t_start)
+
 		if r.status != 200:
 			if cf['on_fail'] not in ('silent','raise'):
 				msg_r(yellow('{} RPC Error: '.format(g.proto.daemon_name.capitalize())))
 				msg(red('{} {}'.format(r.status,r.reason)))
-			e1 = r.read()
+			e1 = r_data
 			try:
 				e3 = json.loads(e1)['error']
 				e2 = '{} (code {})'.format(e3['message'],e3['code'])
@@ -151,7 +281,7 @@ class CoinDaemonRPCConnection(object):
 				e2 = str(e1)
 			return do_fail(r,1,e2)
 
-		r2 = r.read().decode('utf8')
+		r2 = r_data.decode('utf8')
 
 		dmsg_rpc(u'    RPC REPLY data ==> {}\n'.format(r2))
 
@@ -166,12 +296,136 @@ class CoinDaemonRPCConnection(object):
 				return do_fail(r,1,'{} returned an error: {}'.format(
 					g.proto.daemon_name.capitalize(),resp['error']))
 			elif 'result' not in resp:
-				return do_fail(r,1, 'Missing JSON-RPC result\n' + repr(resps))
+				return do_fail(r,1, 'Missing JSON-RPC result\n' + repr(resp))
 			else:
 				ret.append(resp['result'])
 
+		if cf['stream'] and type(ret[0]) == list:
+			return iter(ret[0])
+
 		return ret if cf['batch'] else ret[0]
 
+	def stream_result(self,cmd,hc,r,buf,pos,cf,t_start):
+		"""
+		Generator yielding the items of the reply's result array, which starts at 'pos' in
+		'buf', one at a time.  The reply is read 'stream_chunk_len' bytes at a time, and only
+		the undecoded part of it is kept in memory.  The connection is returned to the pool
+		when the reply has been read to the end, and closed if the caller stops iterating
+		before that.  An error in the reply's trailing fields can't be returned, so it's
+		raised as RPCFailure, or causes an exit if on_fail is 'die'.
+		"""
+		# with g.debug_rpc, the reply data is printed as it's read
+		udec = codecs.getincrementaldecoder('utf8')('replace')
+		def read(*args):
+			data = r.read(*args)
+			if g.debug_rpc: msg_r(udec.decode(data,final=not args))
+			return data
+
+		if g.debug_rpc: msg_r(u'    RPC REPLY data ==> ' + udec.decode(buf))
+		dec = json.JSONDecoder(parse_float=Decimal)
+		skip = re.compile(r'[\s,]*')
+		# an item at the end of the buffer may be incomplete, e.g. a number cut off before its
+		# fraction or exponent
+		partial = re.compile(r'(\.|[eE][-+]?)?\Z')
+		eof,done = False,False
+		try:
+			while True:
+				pos = skip.match(buf,pos).end()
+				if buf[pos:pos+1] == ']': break
+				try:
+					item,end = dec.raw_decode(buf,pos)
+					if not eof and partial.match(buf,end):
+						raise ValueError
+				except ValueError:
+					if eof:
+						raise RPCFailure,'Invalid JSON in {} reply'.format(cmd)
+					data = read(self.stream_chunk_len)
+					eof = not data
+					buf,pos = buf[pos:] + data,0
+					continue
+				yield item
+				pos = end
+
+			tail = (buf[pos+1:] + read()).strip() # remaining fields, if any, after the result
+			dmsg_rpc('\n')
+			try:
+				err = json.loads('{'+tail[1:]).get('error') if tail != '}' else None
+			except:
+				raise RPCFailure,'Invalid JSON in {} reply'.format(cmd)
+			if err != None:
+				rpc_fail(('raise','die')[cf['on_fail']=='die'],r,1,'{} returned an error: {}'.format(
+					g.proto.daemon_name.capitalize(),err))
+			done = True
+		finally:
+			if done and not r.will_close: self.pool.put(hc)
+			else: hc.close()
+			self.add_stats(cmd,t_start)
+
+	def add_stats(self,cmd,t_start):
+		with self.stats_lock: # calls may come from request_chunked() worker threads
+			s = self.stats.setdefault(cmd,[0,0.0])
+			s[0] += 1
+			s[1] += time.time() - t_start
+
+	# Like request(), but returns an RPCFuture at once.  Calls on one or more connections
+	# can thus run concurrently: fs = [c.getbalance() for c in conns]; [f.result() for f in fs]
+	def request_async(self,cmd,*args,**kwargs):
+		return RPCFuture(self,cmd,args,kwargs)
+
+	def request_chunked(self,cmd,arg_list,cf):
+		"""
+		Split a large batch call into chunks of g.rpc_batch_chunk_size requests, send them
+		concurrently over up to g.rpc_pool_size pooled connections and return the joined
+		results in order.  Chunks are requested with on_fail='return' (or 'silent'), and
+		the first failed chunk in order is then handled according to the caller's on_fail.
+		No further chunks are sent once a chunk has failed.
+		"""
+		n = g.rpc_batch_chunk_size
+		chunks = [arg_list[i:i+n] for i in range(0,len(arg_list),n)]
+		chunk_on_fail = ('return','silent')[cf['on_fail'] in ('silent','raise')]
+		results = [None] * len(chunks)
+		todo = Queue.Queue()
+		for i in range(len(chunks)): todo.put(i)
+		failed = threading.Event()
+
+		# NB: no imports in worker threads!  See the 'idna' codec note above
+		def worker():
+			while not failed.is_set():
+				try: i = todo.get_nowait()
+				except Queue.Empty: return
+				try:
+					ret = self.request(cmd,chunks[i],batch=True,timeout=cf['timeout'],on_fail=chunk_on_fail)
+				except Exception as e:
+					ret = e
+				if isinstance(ret,Exception) or rpc_error(ret): failed.set()
+				results[i] = ret
+
+		threads = [threading.Thread(target=worker) for i in range(min(g.rpc_pool_size,len(chunks)))]
+		for t in threads:
+			t.daemon = True
+			t.start()
+		for t in threads:
+			while t.is_alive(): t.join(0.1) # join() with no timeout blocks KeyboardInterrupt
+
+		ret = []
+		for r in results:
+			if isinstance(r,Exception):
+				raise r
+			if rpc_error(r):
+				return rpc_fail(cf['on_fail'],*r[1])
+			ret.extend(r)
+		return ret
+
+	def print_stats(self): msg(self.format_stats())
+
+	def format_stats(self):
+		fs = '  {:<32} {:>7} {:>10} {:>10}'
+		out = ['RPC call latency ({}:{}):'.format(self.host,self.port),
+				fs.format('Method','Calls','Total (s)','Avg (ms)')]
+		for cmd,(n,t) in sorted(self.stats.items(),key=lambda i: -i[1][1]):
+			out.append(fs.format(cmd,n,'{:.3f}'.format(t),'{:.2f}'.format(t/n*1000)))
+		return '\n'.join(out)
+
 	rpcmethods = (
 		'backupwallet',
 		'createrawtransaction',
@@ -243,6 +497,13 @@ class EthereumRPCConnection(CoinDaemonRPCConnection):
 		'parity_versionInfo',
 	)
 
+# The methods of these return an RPCFuture instead of blocking
+class CoinDaemonRPCConnectionAsync(CoinDaemonRPCConnection):
+	request_method = 'request_async'
+
+class EthereumRPCConnectionAsync(EthereumRPCConnection):
+	request_method = 'request_async'
+
 def rpc_error(ret):
 	return type(ret) is tuple and ret and ret[0] == 'rpcfail'
 
@@ -456,8 +456,9 @@ class Mnemonic (SeedSourceUnenc):
 					(len(mn),', '.join(map(str,self.mn_lens)))))
 			return False
 
+		rd = baseconv.get_rdigits(self.wl_id)
 		for n,w in enumerate(mn,1):
-			if w not in baseconv.digits[self.wl_id]:
+			if w not in rd:
 				msg('Invalid mnemonic: word #{} is not in the wordlist'.format(n))
 				return False
 
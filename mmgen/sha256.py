@@ -138,3 +138,13 @@ class Sha256(object):
 		# Intermediate hash value
 		for n,v in enumerate([a,b,c,d,e,f,g,h]):
 			self.H[n] = sumr(self.H[n],v)
+
+# Raw compression function: a single 64-byte block, standard initial hash values,
+# no padding.  The C extension is used if available.
+try:
+	from mmgen.sha256compress import compress as sha256_compress,compress_many as sha256_compress_many
+except ImportError:
+	def sha256_compress(block):
+		assert len(block) == 64,'{}: incorrect block length (must be 64)'.format(len(block))
+		return Sha256(block,preprocess=False).digest()
+	def sha256_compress_many(blocks): return [sha256_compress(b) for b in blocks]
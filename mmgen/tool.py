@@ -71,6 +71,8 @@ cmd_data = OrderedDict([
 
 	('Hex2mn',       ['<hexadecimal string> [str-]',"wordlist [str='electrum']"]),
 	('Mn2hex',       ['<mnemonic> [str-]', "wordlist [str='electrum']"]),
+	('Hex2mn_many',  ['<infile> [str]',"wordlist [str='electrum']"]),
+	('Mn2hex_many',  ['<infile> [str]',"wordlist [str='electrum']"]),
 	('Mn_rand128',   ["wordlist [str='electrum']"]),
 	('Mn_rand192',   ["wordlist [str='electrum']"]),
 	('Mn_rand256',   ["wordlist [str='electrum']"]),
@@ -227,8 +229,16 @@ def print_convert_results(indata,enc,dec,dtype):
 
 from mmgen.obj import MMGenAddrType
 at = MMGenAddrType((hasattr(opt,'type') and opt.type) or g.proto.dfl_mmtype)
-kg = KeyGenerator(at)
-ag = AddrGenerator(at)
+
+class LazyGenerator(object):
+	"create the generator on first use, so that commands not needing it start faster"
+	def __init__(self,cls): self.cls,self.gen = cls,None
+	def __getattr__(self,name):
+		if self.gen is None: self.gen = self.cls(at)
+		return getattr(self.gen,name)
+
+kg = LazyGenerator(KeyGenerator)
+ag = LazyGenerator(AddrGenerator)
 
 def Hexdump(infile,cols=8,line_nums=True):
 	Msg(pretty_hexdump(
@@ -321,6 +331,14 @@ def Mn_rand256(wordlist=dfl_wl_id): do_random_mn(32,wordlist)
 def Hex2mn(s,wordlist=dfl_wl_id): Msg(' '.join(baseconv.fromhex(s,wordlist)))
 def Mn2hex(s,wordlist=dfl_wl_id): Msg(baseconv.tohex(s.split(),wordlist))
 
+# one hex number or mnemonic per line of infile (or stdin, if infile is '-'); blank lines are skipped
+def get_lines_many(infile):
+	return [l for l in get_data_from_file(infile,dash=True,silent=True).splitlines() if l.strip()]
+def Hex2mn_many(infile,wordlist=dfl_wl_id):
+	Msg('\n'.join(' '.join(mn) for mn in baseconv.fromhex_many(get_lines_many(infile),wordlist)))
+def Mn2hex_many(infile,wordlist=dfl_wl_id):
+	Msg('\n'.join(baseconv.tohex_many([l.split() for l in get_lines_many(infile)],wordlist)))
+
 def Strtob58(s,pad=None): Msg(baseconv.fromhex(binascii.hexlify(s),'b58',pad,tostr=True))
 def Hextob58(s,pad=None): Msg(baseconv.fromhex(s,'b58',pad,tostr=True))
 def Hextob32(s,pad=None): Msg(baseconv.fromhex(s,'b32',pad,tostr=True))
@@ -86,7 +86,7 @@ watch-only wallet using '{}-addrimport' and then re-run this program.
 		return sum(i.amt for i in self.unspent)
 
 	def get_unspent_rpc(self):
-		return g.rpch.listunspent(self.minconf)
+		return g.rpch.listunspent(self.minconf,stream=True)
 
 	def get_unspent_data(self):
 		if g.bogus_wallet_data: # for debugging purposes only
@@ -96,10 +96,13 @@ watch-only wallet using '{}-addrimport' and then re-run this program.
 #		write_data_to_file('bogus_unspent.json', repr(us), 'bogus unspent data')
 #		sys.exit(0)
 
-		if not us_rpc: die(0,self.wmsg['no_spendable_outputs'])
+		# us_rpc may be an iterator, so outputs are filtered and converted as they're read
 		confs_per_day = 60*60*24 / g.proto.secs_per_block
-		tr_rpc = []
+		attrs = set(dir(self.MMGenTwUnspentOutput))
+		self.unspent = self.MMGenTwOutputList()
+		got_outputs = False
 		for o in us_rpc:
+			got_outputs = True
 			if not 'account' in o: continue          # coinbase outputs have no account field
 			l = TwLabel(o['account'],on_fail='silent')
 			if l:
@@ -111,13 +114,10 @@ watch-only wallet using '{}-addrimport' and then re-run this program.
 					'addr':   CoinAddr(o['address']),
 					'confs':  o['confirmations']
 				})
-				tr_rpc.append(o)
-		self.unspent = self.MMGenTwOutputList(
-						self.MMGenTwUnspentOutput(
-				**dict(i for i in o.items() if i[0] in dir(self.MMGenTwUnspentOutput))
-						) for o in tr_rpc)
-		for u in self.unspent:
-			if u.label == None: u.label = ''
+				u = self.MMGenTwUnspentOutput(**dict(i for i in o.items() if i[0] in attrs))
+				if u.label == None: u.label = ''
+				self.unspent.append(u)
+		if not got_outputs: die(0,self.wmsg['no_spendable_outputs'])
 		if not self.unspent:
 			die(1,'No tracked unspent outputs in tracking wallet!')
 
@@ -381,7 +381,7 @@ class TwAddrList(MMGenDict):
 		self.total = g.proto.coin_amt('0')
 		rpc_init()
 
-		for d in g.rpch.listunspent(0):
+		for d in g.rpch.listunspent(0,stream=True):
 			if not 'account' in d: continue  # skip coinbase outputs with missing account
 			if d['confirmations'] < minconf: continue
 			label = TwLabel(d['account'],on_fail='silent')
@@ -21,9 +21,10 @@
 tx.py:  Transaction routines for the MMGen suite
 """
 
-import sys,os
+import sys,os,json
 from stat import *
 from binascii import unhexlify
+from struct import unpack_from
 from mmgen.common import *
 from mmgen.obj import *
 
@@ -112,14 +113,9 @@ def segwit_is_active(exit_on_error=False):
 	else:
 		return False
 
-def bytes2int(hex_bytes):
-	r = hexlify(unhexlify(hex_bytes)[::-1])
-	if r[0] in '89abcdef':
-		die(3,"{}: Negative values not permitted in transaction!".format(hex_bytes))
-	return int(r,16)
-
-def bytes2coin_amt(hex_bytes):
-	return g.proto.coin_amt(bytes2int(hex_bytes) * g.proto.coin_amt.min_coin_unit)
+# compact, with sorted keys, for writing JSON transaction files
+def json_dumps(d):
+	return json.dumps(d,sort_keys=True,separators=(',',':'))
 
 def scriptPubKey2addr(s):
 	if len(s) == 50 and s[:6] == '76a914' and s[-4:] == '88ac':
@@ -133,76 +129,104 @@ def scriptPubKey2addr(s):
 
 from collections import OrderedDict
 class DeserializedTX(OrderedDict,MMGenObject): # need to add MMGen types
+	"""
+	The raw transaction is parsed in a single pass using offsets into the byte string.
+	The byte ranges making up the unsigned transaction (with empty scriptSigs) and the
+	txid preimage (without marker, flag and witness data) are collected as slices and
+	joined once at the end.
+	"""
 	def __init__(self,txhex):
-		tx = list(unhexlify(txhex))
-		tx_copy = tx[:]
-		d = { 'raw_tx':'' }
+		tx = unhexlify(txhex)
 
-		def hshift(l,n,reverse=False,skip=False):
-			ret = l[:n]
-			if not skip: d['raw_tx'] += ''.join(ret)
-			del l[:n]
-			return hexlify(''.join(ret[::-1] if reverse else ret))
+		def read_int(pos,n): # little-endian, non-negative
+			ret = unpack_from(('<I','<Q')[n==8],tx,pos)[0]
+			if ret >> (n*8-1):
+				die(3,"{}: Negative values not permitted in transaction!".format(hexlify(tx[pos:pos+n])))
+			return ret
 
 		# https://bitcoin.org/en/developer-reference#compactsize-unsigned-integers
 		# For example, the number 515 is encoded as 0xfd0302.
-		def readVInt(l,skip=False,sub_null=False):
-			s = int(hexlify(l[0]),16)
-			bytes_len = 1 if s < 0xfd else 2 if s == 0xfd else 4 if s == 0xfe else 8
-			if bytes_len != 1: del l[0]
-			ret = int(hexlify(''.join(l[:bytes_len][::-1])),16)
-			if sub_null: d['raw_tx'] += '\0'
-			elif not skip: d['raw_tx'] += ''.join(l[:bytes_len])
-			del l[:bytes_len]
-			return ret
-
-		d['version'] = bytes2int(hshift(tx,4))
-		has_witness = tx[0] == '\x00'
+		def read_vint(pos):
+			s = ord(tx[pos])
+			if s < 0xfd: return s,pos+1
+			n = (2,4,8)[s-0xfd]
+			return int(hexlify(tx[pos+1:pos+1+n][::-1]),16),pos+1+n
+
+		d = {}
+		d['version'] = read_int(0,4)
+		has_witness = tx[4:5] == '\x00'
 		if has_witness:
-			u = hshift(tx,2,skip=True)[2:]
+			u = hexlify(tx[5:6])
 			if u != '01':
 				die(2,"'{}': Illegal value for flag in transaction!".format(u))
-			del tx_copy[-len(tx)-2:-len(tx)]
-
-		d['num_txins'] = readVInt(tx)
-		d['txins'] = MMGenList([OrderedDict((
-			('txid',      hshift(tx,32,reverse=True)),
-			('vout',      bytes2int(hshift(tx,4))),
-			('scriptSig', hshift(tx,readVInt(tx,sub_null=True),skip=True)),
-			('nSeq',      hshift(tx,4,reverse=True))
-		)) for i in range(d['num_txins'])])
-
-		d['num_txouts'] = readVInt(tx)
-		d['txouts'] = MMGenList([OrderedDict((
-			('amount',       bytes2coin_amt(hshift(tx,8))),
-			('scriptPubKey', hshift(tx,readVInt(tx)))
-		)) for i in range(d['num_txouts'])])
-
-		for o in d['txouts']:
-			o['address'] = scriptPubKey2addr(o['scriptPubKey'])[0]
+		pos = (4,6)[has_witness]
+		txid_start = u_start = pos
+		u_slices = [tx[:4]]
+
+		d['num_txins'],pos = read_vint(pos)
+		txins = MMGenList()
+		for i in range(d['num_txins']):
+			ss_len,ss_pos = read_vint(pos+36)
+			u_slices += [tx[u_start:pos+36],'\0']
+			txins.append(OrderedDict((
+				('txid',      hexlify(tx[pos:pos+32][::-1])),
+				('vout',      read_int(pos+32,4)),
+				('scriptSig', hexlify(tx[ss_pos:ss_pos+ss_len])),
+				('nSeq',      hexlify(tx[ss_pos+ss_len:ss_pos+ss_len+4][::-1]))
+			)))
+			u_start = ss_pos + ss_len
+			pos = u_start + 4
+		d['txins'] = txins
+
+		d['num_txouts'],pos = read_vint(pos)
+		txouts = MMGenList()
+		coin_amt,min_unit = g.proto.coin_amt,g.proto.coin_amt.min_coin_unit
+		for i in range(d['num_txouts']):
+			spk_len,spk_pos = read_vint(pos+8)
+			spk = hexlify(tx[spk_pos:spk_pos+spk_len])
+			txouts.append(OrderedDict((
+				('amount',       coin_amt(read_int(pos,8) * min_unit)),
+				('scriptPubKey', spk),
+				('address',      scriptPubKey2addr(spk)[0])
+			)))
+			pos = spk_pos + spk_len
+		d['txouts'] = txouts
+		txid_end = pos
 
 		d['witness_size'] = 0
 		if has_witness:
 			# https://github.com/bitcoin/bips/blob/master/bip-0141.mediawiki
 			# A non-witness program (defined hereinafter) txin MUST be associated with an empty
 			# witness field, represented by a 0x00.
-			del tx_copy[-len(tx):-4]
-			wd,tx = tx[:-4],tx[-4:]
-			d['witness_size'] = len(wd) + 2 # add marker and flag
-			for i in range(len(d['txins'])):
-				if hexlify(wd[0]) == '00':
-					hshift(wd,1,skip=True)
+			wd_end = len(tx) - 4
+			d['witness_size'] = wd_end - pos + 2 # add marker and flag
+			for txin in txins:
+				if pos >= wd_end:
+					die(3,'Witness data truncated!')
+				if tx[pos] == '\x00':
+					pos += 1
 					continue
-				d['txins'][i]['witness'] = [
-					hshift(wd,readVInt(wd,skip=True),skip=True) for item in range(readVInt(wd,skip=True))
-				]
-			if wd:
+				nitems,pos = read_vint(pos)
+				witness = []
+				for j in range(nitems):
+					item_len,pos = read_vint(pos)
+					if pos + item_len > wd_end:
+						die(3,'Witness data truncated!')
+					witness.append(hexlify(tx[pos:pos+item_len]))
+					pos += item_len
+				txin['witness'] = witness
+			if pos != wd_end:
 				die(3,'More witness data than inputs with witnesses!')
 
-		d['lock_time'] = bytes2int(hshift(tx,4))
-		d['txid'] = hexlify(sha256(sha256(''.join(tx_copy)).digest()).digest()[::-1])
-		d['unsigned_hex'] = hexlify(d['raw_tx'])
-		del d['raw_tx']
+		d['lock_time'] = read_int(pos,4)
+		u_slices += [tx[u_start:txid_end],tx[pos:pos+4]]
+
+		if has_witness:
+			txid_pre = ''.join((tx[:4],tx[txid_start:txid_end],tx[pos:pos+4]))
+		else:
+			txid_pre = tx
+		d['txid'] = hexlify(sha256(sha256(txid_pre).digest()).digest()[::-1])
+		d['unsigned_hex'] = hexlify(''.join(u_slices))
 
 		keys = 'txid','version','lock_time','witness_size','num_txins','txins','num_txouts','txouts','unsigned_hex'
 		return OrderedDict.__init__(self, ((k,d[k]) for k in keys))
@@ -232,6 +256,7 @@ class MMGenTX(MMGenObject):
 	txview_hdr_fs = 'TRANSACTION DATA\n\nID={i} ({a} {c}) UTC={t} RBF={r} Sig={s} Locktime={l}\n'
 	txview_hdr_fs_short = 'TX {i} ({a} {c}) UTC={t} RBF={r} Sig={s} Locktime={l}\n'
 	usr_fee_prompt = 'Enter transaction fee: '
+	json_fmt_version = 2
 
 	class MMGenTxInput(MMGenListItem):
 		for k in txio_attrs: locals()[k] = txio_attrs[k] # in lieu of inheritance
@@ -303,12 +328,13 @@ class MMGenTX(MMGenObject):
 		# repeat with sign and send, because coin daemon could be restarted
 		self.check_correct_chain(on_fail='die')
 
-	def check_correct_chain(self,on_fail='return'):
+	def check_correct_chain(self,on_fail='return',chain=None):
 		assert on_fail in ('return','die'),"'{}': invalid value for 'on_fail'".format(on_fail)
-		m = 'Transaction is for {}, but current chain is {}!'.format(self.chain,g.chain)
-		bad = self.chain and g.chain and self.chain != g.chain
-		if bad and g.chain in g.proto.chain_aliases:
-			bad = self.chain not in g.proto.chain_aliases[g.chain]
+		chain = chain or g.chain
+		m = 'Transaction is for {}, but current chain is {}!'.format(self.chain,chain)
+		bad = self.chain and chain and self.chain != chain
+		if bad and chain in g.proto.chain_aliases:
+			bad = self.chain not in g.proto.chain_aliases[chain]
 		if bad:
 			msg(m) if on_fail == 'return' else die(2,m)
 		return not bad
@@ -392,11 +418,12 @@ class MMGenTX(MMGenObject):
 	def has_segwit_inputs(self):
 		return any(i.mmid and i.mmid.mmtype in ('S','B') for i in self.inputs)
 
-	def compare_size_and_estimated_size(self):
+	def compare_size_and_estimated_size(self,deserial_tx):
 		est_vsize = self.estimate_size()
-		d = g.rpch.decoderawtransaction(self.hex)
-		vsize = d['vsize'] if 'vsize' in d else d['size']
-		vmsg('\nSize: {}, Vsize: {} (true) {} (estimated)'.format(d['size'],vsize,est_vsize))
+		size = len(self.hex) / 2
+		ws = deserial_tx['witness_size']
+		vsize = (size * 4 - ws * 3 + 3) / 4 # ceil(weight / 4), where weight = base_size * 3 + size
+		vmsg('\nSize: {}, Vsize: {} (true) {} (estimated)'.format(size,vsize,est_vsize))
 		m1 = '\nERROR: Estimated transaction vsize is {:1.2f} times the true vsize\n'
 		m2 = 'Your transaction fee estimates will be inaccurate\n'
 		m3 = 'Please re-create and re-sign the transaction using the option --vsize-adj={:1.2f}'
@@ -643,6 +670,8 @@ class MMGenTX(MMGenObject):
 		self.outputs.check_coin_mismatch()
 		def amt_to_str(d):
 			return dict([(k,str(d[k]) if k == 'amt' else d[k]) for k in d])
+		if g.tx_file_format == 'json':
+			return self.format_json(amt_to_str)
 		lines = [
 			'{}{} {} {} {} {}{}'.format(
 				(g.coin+' ','')[g.coin=='BTC'],
@@ -668,6 +697,29 @@ class MMGenTX(MMGenObject):
 		assert len(self.fmt_data) <= g.max_tx_file_size,(
 			'Transaction file size exceeds limit ({} bytes)'.format(g.max_tx_file_size))
 
+	def format_json(self,amt_to_str):
+		d = {
+			'coin':       g.coin,
+			'chain':      self.chain,
+			'txid':       self.txid,
+			'send_amt':   str(self.send_amt),
+			'timestamp':  self.timestamp,
+			'blockcount': self.blockcount,
+			'locktime':   self.locktime,
+			'hex':        self.hex,
+			'inputs':     [amt_to_str(e.__dict__) for e in self.inputs],
+			'outputs':    [amt_to_str(e.__dict__) for e in self.outputs],
+			'label':      self.label or None,
+			'coin_txid':  self.coin_txid or None
+		}
+		data = json_dumps(d)
+		self.chksum = make_chksum_6(data)
+		hdr = json_dumps({'format':'MMGenTX','version':self.json_fmt_version,'chksum':self.chksum})
+		self.fmt_data = hdr + '\n' + data + '\n'
+
+		assert len(self.fmt_data) <= g.max_json_tx_file_size,(
+			'Transaction file size exceeds limit ({} bytes)'.format(g.max_json_tx_file_size))
+
 	def get_non_mmaddrs(self,desc):
 		return list(set(i.addr for i in getattr(self,desc) if not i.mmid))
 
@@ -678,7 +730,12 @@ class MMGenTX(MMGenObject):
 			msg('Transaction is already signed!')
 			return False
 
-		if not self.check_correct_chain(on_fail='return'):
+		# no daemon when signing natively, so check against the chain selected by the user
+		chain = None
+		if opt.sign_method == 'native':
+			chain = 'regtest' if g.regtest else ('mainnet','testnet')[bool(g.testnet)]
+
+		if not self.check_correct_chain(on_fail='return',chain=chain):
 			return False
 
 		if (self.has_segwit_inputs() or self.has_segwit_outputs()) and not g.proto.cap('segwit'):
@@ -687,6 +744,9 @@ class MMGenTX(MMGenObject):
 
 		self.check_pubkey_scripts()
 
+		if opt.sign_method == 'native':
+			return self.sign_native(tx_num_str,keys)
+
 		qmsg('Passing {} key{} to {}'.format(len(keys),suf(keys,'s'),g.proto.daemon_name))
 
 		if self.has_segwit_inputs():
@@ -723,11 +783,7 @@ class MMGenTX(MMGenObject):
 #				Msg(pretty_hexdump(unhexlify(self.hex),cols=16)) # DEBUG
 #				pmsg(make_chksum_6(unhexlify(self.hex)).upper())
 				self.hex = ret['hex']
-				self.compare_size_and_estimated_size()
-				dt = DeserializedTX(self.hex)
-				self.check_hex_tx_matches_mmgen_tx(dt)
-				self.coin_txid = CoinTxID(dt['txid'],on_fail='return')
-				self.check_sigs(dt)
+				self.check_signed_tx()
 				assert self.coin_txid == g.rpch.decoderawtransaction(self.hex)['txid'],(
 											'txid mismatch (after signing)')
 				msg('OK')
@@ -737,6 +793,25 @@ class MMGenTX(MMGenObject):
 				msg(repr(ret['errors']))
 				return False
 
+	def sign_native(self,tx_num_str,keys):
+		from mmgen.txsigner import NativeTxSigner
+		msg_r('Signing transaction{}...'.format(tx_num_str))
+		try:
+			self.hex = NativeTxSigner(self,keys).sign()
+		except Exception as e:
+			msg(yellow('failed\n{}'.format(e[0])))
+			return False
+		self.check_signed_tx()
+		msg('OK')
+		return True
+
+	def check_signed_tx(self):
+		dt = DeserializedTX(self.hex)
+		self.compare_size_and_estimated_size(dt)
+		self.check_hex_tx_matches_mmgen_tx(dt)
+		self.coin_txid = CoinTxID(dt['txid'],on_fail='return')
+		self.check_sigs(dt)
+
 	def mark_raw(self):
 		self.desc = 'transaction'
 		self.ext = self.raw_ext
@@ -1120,6 +1195,9 @@ class MMGenTX(MMGenObject):
 					ymsg('Warning: transaction data appears to be in old format')
 				import re
 				d = literal_eval(re.sub(r"[A-Za-z]+?\(('.+?')\)",r'\1',raw_data))
+			return make_io_list(d,desc)
+
+		def make_io_list(d,desc):
 			assert type(d) == list,'{} data not a list!'.format(desc)
 			assert len(d),'no {}!'.format(desc)
 			for e in d: e['amt'] = g.proto.coin_amt(e['amt'])
@@ -1131,6 +1209,9 @@ class MMGenTX(MMGenObject):
 
 		tx_data = get_data_from_file(infile,self.desc+' data',silent=silent_open)
 
+		if tx_data[:1] == '{':
+			return self.parse_json_tx_data(tx_data,make_io_list,coin_sym_only)
+
 		try:
 			desc = 'data'
 			assert len(tx_data) <= g.max_tx_file_size,(
@@ -1166,7 +1247,7 @@ class MMGenTX(MMGenObject):
 				desc = 'locktime'
 				self.locktime = int(metadata.pop()[3:])
 
-			self.coin = metadata.pop(0) if len(metadata) == 6 else 'BTC'
+			self.coin = str(metadata.pop(0)) if len(metadata) == 6 else 'BTC'
 			if coin_sym_only: return
 
 			if len(metadata) == 5:
@@ -1192,6 +1273,66 @@ class MMGenTX(MMGenObject):
 		except Exception as e:
 			die(2,'Invalid {} in transaction file: {}'.format(desc,e[0]))
 
+		self.set_chain_from_inputs()
+
+	def parse_json_tx_data(self,tx_data,make_io_list,coin_sym_only):
+		try:
+			desc = 'data'
+			assert len(tx_data) <= g.max_json_tx_file_size,(
+				'Transaction file size exceeds limit ({} bytes)'.format(g.max_json_tx_file_size))
+			hdr,data = tx_data.split('\n',1)
+			hdr = json.loads(hdr)
+			assert type(hdr) == dict and hdr.get('format') == 'MMGenTX','not an MMGen transaction file'
+			desc = 'version'
+			assert hdr['version'] == self.json_fmt_version,'unsupported version: {}'.format(hdr['version'])
+			desc = 'data'
+			self.chksum = HexStr(hdr['chksum'],on_fail='raise')
+			assert self.chksum == make_chksum_6(data.rstrip('\n')),'file data does not match checksum'
+			d = json.loads(data)
+			assert type(d) == dict,'data not a dictionary'
+
+			# convert the decoded values to the same types as parse_tx_file() does
+			desc = 'coin type in metadata'
+			assert type(d['coin']) == unicode and d['coin'].isalnum(),'invalid coin type'
+			self.coin = str(d['coin'])
+			if coin_sym_only: return
+
+			desc = 'chain'
+			assert d['chain'] == None or (d['chain'].isalnum() and d['chain'].islower()),(
+				'invalid chain: {}'.format(d['chain']))
+			self.chain = d['chain']
+			desc = 'locktime'
+			assert d['locktime'] == None or type(d['locktime']) in (int,long),'locktime not an integer'
+			self.locktime = d['locktime']
+			if d['coin_txid']:
+				desc = '{} TxID'.format(g.proto.name.capitalize())
+				self.coin_txid = CoinTxID(d['coin_txid'],on_fail='raise')
+			if d['label']:
+				desc = 'comment'
+				self.label = MMGenTXLabel(d['label'],on_fail='raise')
+			desc = 'metadata'
+			self.txid = MMGenTxID(d['txid'],on_fail='raise')
+			self.send_amt = g.proto.coin_amt(d['send_amt'],on_fail='raise')
+			assert type(d['timestamp']) == unicode and len(d['timestamp'].split()) == 1,'invalid timestamp'
+			self.timestamp = d['timestamp']
+			desc = 'block count in metadata'
+			assert type(d['blockcount']) in (int,long),'block count not an integer'
+			self.blockcount = d['blockcount']
+			desc = 'transaction hex data'
+			self.hex = d['hex']
+			self.check_tx_hex_data()
+			desc = 'coin type in metadata'
+			assert self.coin == g.coin,'invalid coin type: {}'.format(self.coin)
+			desc = 'inputs data'
+			self.inputs  = make_io_list(d['inputs'],'inputs')
+			desc = 'outputs data'
+			self.outputs = make_io_list(d['outputs'],'outputs')
+		except Exception as e:
+			die(2,'Invalid {} in transaction file: {}'.format(desc,e[0]))
+
+		self.set_chain_from_inputs()
+
+	def set_chain_from_inputs(self):
 		# test doesn't work for Ethereum
 		if not self.chain and not self.inputs[0].addr.is_for_chain('testnet'):
 			self.chain = 'mainnet'
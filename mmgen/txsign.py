@@ -39,6 +39,7 @@ ERROR: a key file must be supplied for the following non-{pnm} address{{}}:\n
 }
 
 saved_seeds = {}
+key_caches = {} # SeedKeyCache objects, by (coin,testnet,Seed ID)
 
 def get_seed_for_seed_id(sid,infiles,saved_seeds):
 
@@ -63,15 +64,19 @@ def generate_kals_for_mmgen_addrs(need_keys,infiles,saved_seeds):
 	sids = set(i.sid for i in mmids)
 	vmsg('Need seed{}: {}'.format(suf(sids,'s'),' '.join(sids)))
 	d = MMGenList()
-	from mmgen.addr import KeyAddrList
+	from mmgen.addr import SeedKeyCache
 	for sid in sids:
 		# Returns only if seed is found
 		seed = get_seed_for_seed_id(sid,infiles,saved_seeds)
+		# keys are cached for all transactions signed in this run.  Include the coin and
+		# network in the key, as mmgen-autosign signs for several coins in one process
+		ck = (g.coin,g.testnet,sid)
+		if ck not in key_caches:
+			key_caches[ck] = SeedKeyCache(seed)
 		for t in MMGenAddrType.mmtypes:
 			idx_list = [i.idx for i in mmids if i.sid == sid and i.mmtype == t]
 			if idx_list:
-				addr_idxs = AddrIdxList(idx_list=idx_list)
-				d.append(KeyAddrList(seed=seed,addr_idxs=addr_idxs,do_chksum=False,mmtype=MMGenAddrType(t)))
+				d.append(key_caches[ck].get_kal(t,idx_list))
 	return d
 
 def add_keys(tx,src,infiles=None,saved_seeds=None,keyaddr_list=None):
@@ -82,18 +87,22 @@ def add_keys(tx,src,infiles=None,saved_seeds=None,keyaddr_list=None):
 	qmsg('Checking {} -> {} address mappings for {} (from {})'.format(pnm,g.coin,src,desc))
 	d = MMGenList([keyaddr_list]) if keyaddr_list else \
 		generate_kals_for_mmgen_addrs(need_keys,infiles,saved_seeds)
+	# index the entries of each list by (AddrListID,idx) once, instead of formatting an
+	# MMGen ID for every entry and needed key
+	kal_idx = {}
+	for kal in d:
+		for f in kal.data:
+			kal_idx.setdefault((kal.al_id,f.idx),[]).append(f)
 	new_keys = []
 	for e in need_keys:
-		for kal in d:
-			for f in kal.data:
-				mmid = '{}:{}'.format(kal.al_id,f.idx)
-				if mmid == e.mmid:
-					if f.addr == e.addr:
-						e.have_wif = True
-						if src == 'inputs':
-							new_keys.append(f)
-					else:
-						die(3,wmsg['mapping_error'].format(m1,mmid,f.addr,'tx file:',e.mmid,e.addr))
+		for f in kal_idx.get((e.mmid.al_id,e.mmid.idx),()):
+			if f.addr == e.addr:
+				e.have_wif = True
+				if src == 'inputs':
+					new_keys.append(f)
+			else:
+				mmid = '{}:{}'.format(e.mmid.al_id,f.idx)
+				die(3,wmsg['mapping_error'].format(m1,mmid,f.addr,'tx file:',e.mmid,e.addr))
 	if new_keys:
 		vmsg('Added {} wif key{} from {}'.format(len(new_keys),suf(new_keys,'s'),desc))
 	return new_keys
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+txsigner.py:  In-process transaction signing for the MMGen suite
+"""
+
+from hashlib import sha256
+from binascii import hexlify,unhexlify
+from struct import pack
+from mmgen.common import *
+from mmgen.obj import MMGenObject
+from mmgen.protocol import hash160,hash256_bin as hash256
+
+sighash_types = { 'ALL': 0x01, 'ALL|FORKID': 0x41 }
+sighash_forkid = 0x40
+
+def ser_vint(n):
+	if n < 0xfd: return chr(n)
+	if n <= 0xffff: return '\xfd' + pack('<H',n)
+	if n <= 0xffffffff: return '\xfe' + pack('<I',n)
+	return '\xff' + pack('<Q',n)
+
+def ser_bytes(s): return ser_vint(len(s)) + s
+
+def push_data(s): # only short pushes are needed (sigs, pubkeys, redeem scripts)
+	assert len(s) < 0x4c,'data too long for direct push'
+	return chr(len(s)) + s
+
+class NativeTxSigner(MMGenObject):
+	"""
+	Sign the P2PKH, P2SH-P2WPKH and P2WPKH inputs of an MMGenTX using the secp256k1
+	extension module.  The BIP143 hashes of the prevouts, sequence numbers and outputs,
+	and the hash state of the constant part of the preimage, are computed once and
+	reused for every input.  For legacy inputs, the hash state of the serialized
+	inputs preceding the one being signed is carried forward in the same way.
+	"""
+	def __init__(self,tx,keys):
+		try:
+			from mmgen.secp256k1 import priv2pub,sign,verify
+		except:
+			raise ValueError,'the secp256k1 extension module is required for native signing'
+		self.priv2pub,self.sign_hash,self.verify = priv2pub,sign,verify
+
+		self.tx = tx
+		self.keys = dict((d.addr,d.sec) for d in keys)
+		self.hashtype = sighash_types[g.proto.sighash_type]
+
+		from mmgen.tx import DeserializedTX
+		dt = DeserializedTX(tx.hex)
+		self.version = pack('<I',dt['version'])
+		self.locktime = pack('<I',dt['lock_time'])
+		self.outpoints = [unhexlify(i['txid'])[::-1] + pack('<I',i['vout']) for i in dt['txins']]
+		self.nseqs = [unhexlify(i['nSeq'])[::-1] for i in dt['txins']]
+		self.outputs = ''.join(
+			pack('<Q',o['amount'].toSatoshi()) + ser_bytes(unhexlify(o['scriptPubKey'])) for o in dt['txouts'])
+		self.num_outputs = len(dt['txouts'])
+
+		# the transaction must be re-serialized exactly from the parsed data
+		assert self.serialize(['']*len(self.outpoints)) == unhexlify(tx.hex),'unsupported transaction hex data'
+
+		mm_inputs = dict(((i.txid,i.vout),i) for i in tx.inputs)
+		self.inputs = [mm_inputs[(i['txid'],i['vout'])] for i in dt['txins']]
+
+	def serialize(self,scriptsigs,witnesses=None):
+		return ''.join(
+			[self.version] +
+			(['\x00\x01'] if witnesses else []) +
+			[ser_vint(len(self.outpoints))] +
+			[o + ser_bytes(s) + n for o,s,n in zip(self.outpoints,scriptsigs,self.nseqs)] +
+			[ser_vint(self.num_outputs),self.outputs] +
+			(witnesses or []) +
+			[self.locktime] )
+
+	def get_key(self,txi):
+		if txi.addr not in self.keys:
+			raise ValueError,'no key for address {}'.format(txi.addr)
+		sec = self.keys[txi.addr]
+		return unhexlify(sec),self.priv2pub(unhexlify(sec),int(sec.compressed))
+
+	# Classify the input by its scriptPubKey, returning the script code for the sighash
+	# and the redeem script (P2SH-P2WPKH only).  The key must hash to the scriptPubKey.
+	def get_script_data(self,txi,pubkey):
+		spk,pkh = txi.scriptPubKey,hash160(hexlify(pubkey))
+		p2pkh_script = unhexlify('76a914' + pkh + '88ac')
+		if spk == '76a914' + pkh + '88ac':
+			return 'p2pkh',p2pkh_script,None
+		if spk == g.proto.witness_vernum_hex + '14' + pkh:
+			return 'p2wpkh',p2pkh_script,None
+		redeem_script = g.proto.witness_vernum_hex + '14' + pkh
+		if spk == 'a914' + hash160(redeem_script) + '87':
+			return 'p2sh-p2wpkh',p2pkh_script,unhexlify(redeem_script)
+		raise ValueError,'{}: unsupported scriptPubKey or wrong key for input {}'.format(spk,txi.addr)
+
+	def sign(self):
+		ht = self.hashtype
+		ht4 = pack('<I',ht)
+		n = len(self.outpoints)
+
+		# BIP143 (also used with SIGHASH_FORKID)
+		hash_prevouts = hash256(''.join(self.outpoints))
+		hash_sequence = hash256(''.join(self.nseqs))
+		hash_outputs  = hash256(self.outputs)
+		bip143_mid = sha256(self.version + hash_prevouts + hash_sequence)
+		bip143_tail = hash_outputs + self.locktime + ht4
+
+		# legacy
+		empty_ins = [o + '\x00' + s for o,s in zip(self.outpoints,self.nseqs)]
+		legacy_tail = ''.join(empty_ins + [ser_vint(self.num_outputs),self.outputs,self.locktime,ht4])
+		legacy_pos = 0
+		legacy_mid = sha256(self.version + ser_vint(n))
+
+		scriptsigs,witnesses = [],[]
+		for i in range(n):
+			txi = self.inputs[i]
+			privkey,pubkey = self.get_key(txi)
+			stype,script_code,redeem_script = self.get_script_data(txi,pubkey)
+			amt = pack('<Q',txi.amt.toSatoshi())
+
+			if stype != 'p2pkh' or ht & sighash_forkid:
+				h = bip143_mid.copy()
+				h.update(self.outpoints[i] + ser_bytes(script_code) + amt + self.nseqs[i] + bip143_tail)
+			else:
+				h = legacy_mid.copy()
+				h.update(self.outpoints[i] + ser_bytes(unhexlify(txi.scriptPubKey)) + self.nseqs[i])
+				h.update(buffer(legacy_tail,legacy_pos+len(empty_ins[i])))
+			msghash = sha256(h.digest()).digest()
+
+			sig = self.sign_hash(msghash,privkey)
+			assert self.verify(sig,msghash,pubkey),'signature verification failed for input {}'.format(txi.addr)
+			sig += chr(ht)
+
+			if stype == 'p2pkh':
+				scriptsigs.append(push_data(sig) + push_data(pubkey))
+				witnesses.append('\x00')
+			else:
+				scriptsigs.append(push_data(redeem_script) if redeem_script else '')
+				witnesses.append('\x02' + ser_bytes(sig) + ser_bytes(pubkey))
+
+			legacy_mid.update(empty_ins[i])
+			legacy_pos += len(empty_ins[i])
+
+		has_witness = any(w != '\x00' for w in witnesses)
+		return hexlify(self.serialize(scriptsigs,witnesses if has_witness else None))
@@ -252,26 +252,42 @@ def is_ascii(s,enc='ascii'):
 
 def is_utf8(s): return is_ascii(s,enc='utf8')
 
+class _baseconv_digits(dict):
+	"mnemonic wordlists (None-valued keys) are loaded and checked on first access"
+	def __getitem__(self,key):
+		ret = dict.__getitem__(self,key)
+		if ret is None:
+			ret = baseconv.load_wordlist(key)
+			self[key] = ret
+		return ret
+
 class baseconv(object):
 
 	mn_base = 1626 # tirosh list is 1633 words long!
-	digits = {
-		'electrum': tuple(__import__('mmgen.mn_electrum',fromlist=['words']).words.split()),
-		'tirosh': tuple(__import__('mmgen.mn_tirosh',fromlist=['words']).words.split()[:mn_base]),
+	digits = _baseconv_digits({
+		'electrum': None,
+		'tirosh': None,
 		'b58': tuple('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'),
 		'b32': tuple('ABCDEFGHIJKLMNOPQRSTUVWXYZ234567'),
 		'b16': tuple('0123456789abcdef'),
 		'b10': tuple('0123456789'),
 		'b8':  tuple('01234567'),
-	}
+	})
 	wl_chksums = {
 		'electrum': '5ca31424',
 		'tirosh':   '48f05e1f', # tirosh truncated to mn_base (1626)
 		# 'tirosh1633': '1a5faeff'
 	}
+	rdigits = {} # reverse lookup tables for 'digits', built on demand by get_rdigits()
 	b58pad_lens =     [(16,22), (24,33), (32,44)]
 	b58pad_lens_rev = [(v,k) for k,v in b58pad_lens]
 
+	@classmethod
+	def get_rdigits(cls,wl_id):
+		if wl_id not in cls.rdigits:
+			cls.rdigits[wl_id] = dict((w,n) for n,w in enumerate(cls.digits[wl_id]))
+		return cls.rdigits[wl_id]
+
 	@classmethod
 	def b58encode(cls,s,pad=None):
 		pad = cls.get_pad(s,pad,'en',cls.b58pad_lens,[bytes])
@@ -294,6 +310,15 @@ class baseconv(object):
 		else:
 			return None
 
+	@classmethod
+	def load_wordlist(cls,wl_id):
+		wl = tuple(__import__('mmgen.mn_'+wl_id,fromlist=['words']).words.split()[:cls.mn_base])
+		chk = sha256(' '.join(wl)).hexdigest()[:8]
+		if chk != cls.wl_chksums[wl_id]:
+			m = "ERROR: checksum ({}) of wordlist '{}' doesn't match saved checksum ({})"
+			die(3,m.format(chk,wl_id,cls.wl_chksums[wl_id]))
+		return wl
+
 	@classmethod
 	def get_wordlist_chksum(cls,wl_id):
 		return sha256(' '.join(cls.digits[wl_id])).hexdigest()[:8]
@@ -318,36 +343,51 @@ class baseconv(object):
 
 	@classmethod
 	def tohex(cls,words_arg,wl_id,pad=None):
+		return cls.tohex_many([words_arg],wl_id,pad)[0]
+
+	@classmethod
+	def fromhex(cls,hexnum,wl_id,pad=None,tostr=False):
+		return cls.fromhex_many([hexnum],wl_id,pad,tostr)[0]
 
-		words = words_arg if type(words_arg) in (list,tuple) else tuple(words_arg.strip())
+	# The batch versions look up the wordlist and its reverse lookup table only once
+	@classmethod
+	def tohex_many(cls,words_args,wl_id,pad=None):
 
-		wl = cls.digits[wl_id]
-		base = len(wl)
+		rd = cls.get_rdigits(wl_id)
+		base = len(rd)
+		ret = []
 
-		if not set(words) <= set(wl):
-			die(2,'{} is not in {} (base{}) format'.format(repr(words_arg),wl_id,base))
+		for words_arg in words_args:
+			words = words_arg if type(words_arg) in (list,tuple) else tuple(words_arg.strip())
+			num = 0
+			try:
+				for w in words: num = num * base + rd[w]
+			except KeyError:
+				die(2,'{} is not in {} (base{}) format'.format(repr(words_arg),wl_id,base))
+			h = '{:0{w}x}'.format(num,w=pad or 0)
+			ret.append(('','0')[len(h) % 2] + h)
 
-		deconv =  [wl.index(words[::-1][i])*(base**i) for i in range(len(words))]
-		ret = ('{:0{w}x}'.format(sum(deconv),w=pad or 0))
-		return ('','0')[len(ret) % 2] + ret
+		return ret
 
 	@classmethod
-	def fromhex(cls,hexnum,wl_id,pad=None,tostr=False):
-
-		hexnum = hexnum.strip()
-		if not is_hex_str(hexnum):
-			die(2,"'{}': not a hexadecimal number".format(hexnum))
+	def fromhex_many(cls,hexnums,wl_id,pad=None,tostr=False):
 
 		wl = cls.digits[wl_id]
 		base = len(wl)
-		num,ret = int(hexnum,16),[]
-		while num:
-			ret.append(num % base)
-			num /= base
-		o = [wl[n] for n in [0] * ((pad or 0)-len(ret)) + ret[::-1]]
-		return ''.join(o) if tostr else o
+		ret = []
+
+		for hexnum in hexnums:
+			hexnum = hexnum.strip()
+			if not is_hex_str(hexnum):
+				die(2,"'{}': not a hexadecimal number".format(hexnum))
+			num,digits = int(hexnum,16),[]
+			while num:
+				num,r = divmod(num,base)
+				digits.append(r)
+			o = [wl[n] for n in [0] * ((pad or 0)-len(digits)) + digits[::-1]]
+			ret.append(''.join(o) if tostr else o)
 
-baseconv.check_wordlists()
+		return ret
 
 def match_ext(addr,ext):
 	return addr.split('.')[-1] == ext
@@ -393,7 +433,7 @@ def decode_pretty_hexdump(data):
 		return False
 
 def strip_comments(line):
-	return re.sub(ur'\s+$',u'',re.sub(ur'#.*',u'',line,1))
+	return line.split(u'#',1)[0].rstrip(u' \t\n\r\f\v')
 
 def remove_comments(lines):
 	return [m for m in [strip_comments(l) for l in lines] if m != '']
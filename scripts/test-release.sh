@@ -16,7 +16,8 @@ python='python'
 rounds=100 rounds_low=20 rounds_spec=500 gen_rounds=10
 monero_addrs='3,99,2,22-24,101-104'
 
-dfl_tests='obj sha256 alts monero eth autosign btc btc_tn btc_rt bch bch_rt ltc ltc_tn ltc_rt tool gen'
+dfl_tests='obj sha256 unit alts monero eth autosign btc btc_tn btc_rt bch bch_rt ltc ltc_tn ltc_rt tool gen'
+extra_tests='bench'
 PROGNAME=$(basename $0)
 while getopts hCfilnPt OPT
 do
@@ -34,6 +35,7 @@ do
 		echo   "  AVAILABLE TESTS:"
 		echo   "     obj      - data objects"
 		echo   "     sha256   - MMGen sha256 implementation"
+		echo   "     unit     - unit tests for library modules"
 		echo   "     alts     - operations for all supported gen-only altcoins"
 		echo   "     monero   - operations for Monero"
 		echo   "     eth      - operations for Ethereum"
@@ -50,7 +52,8 @@ do
 		echo   "     ltc_rt   - litecoin regtest"
 		echo   "     tool     - tooltest (all supported coins)"
 		echo   "     gen      - gentest (all supported coins)"
-		echo   "  By default, all tests are run"
+		echo   "     bench    - address generation benchmarks"
+		echo   "  By default, all tests except 'bench' are run"
 		exit ;;
 	C)  mkdir -p 'test/trace'
 		touch 'test/trace.acc'
@@ -65,7 +68,7 @@ do
 		rounds=2 rounds_low=2 rounds_spec=2 gen_rounds=2 monero_addrs='3,23,105' ;;
 	f)  rounds=2 rounds_low=2 rounds_spec=2 gen_rounds=2 monero_addrs='3,23,105' ;;
 	i)  INSTALL_ONLY=1 ;;
-	l)  echo $dfl_tests; exit ;;
+	l)  echo $dfl_tests $extra_tests; exit ;;
 	n)  NO_INSTALL=1 ;;
 	P)  NO_PAUSE=1 ;;
 	t)  TESTING=1 ;;
@@ -135,6 +138,31 @@ s_sha256='Testing sha256 implementation'
 t_sha256=("$python test/sha256test.py $rounds_spec")
 f_sha256='Sha256 test complete'
 
+i_unit='Unit'
+s_unit='The following tests will test individual library modules without a coin daemon'
+t_unit=(
+	"$python test/chaincachetest.py -q -i 1000 1 999 1000 1001 20000"
+	"$python test/addrlisttest.py -q 10000"
+	"$python test/txdeserializetest.py -q 1000 10000"
+	"$python test/txsigntest.py -q"
+	"$python test/rpctest.py -q"
+	"$python test/startuptest.py -q"
+	"$python test/txfiletest.py -q"
+	"$python test/base58test.py -q"
+	"$python test/baseconvtest.py -q"
+	"$python test/bech32test.py -q"
+	"$python test/ed25519test.py -q")
+[ "$MINGW" ] || { # no parallel address generation on MSWin
+	t_unit_len=${#t_unit[*]}
+	t_unit[$t_unit_len]="$python test/addrgenjobstest.py -q"
+}
+f_unit='Unit tests completed'
+
+i_bench='Benchmark'
+s_bench='The following tests will benchmark address generation'
+t_bench=("$python test/addrgenspeedtest.py -q 10000")
+f_bench='Benchmarks completed'
+
 i_alts='Gen-only altcoin'
 s_alts='The following tests will test generation operations for all supported altcoins'
 t_alts=(
@@ -211,6 +239,7 @@ i_eth='Ethereum'
 s_eth='Testing transaction and tracking wallet operations for Ethereum'
 t_eth=(
 	"$test_py -On --coin=eth ref_tx_chk"
+	"$test_py -On --coin=eth ref_tx_chk_json"
 	"$test_py -On ethdev"
 )
 f_eth='Ethereum tests completed'
@@ -363,7 +392,7 @@ run_tests() {
 
 check_args() {
 	for i in $tests; do
-		echo "$dfl_tests" | grep -q "\<$i\>" || { echo "$i: unrecognized argument"; exit; }
+		echo "$dfl_tests $extra_tests" | grep -q "\<$i\>" || { echo "$i: unrecognized argument"; exit; }
 	done
 }
 
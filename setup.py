@@ -87,6 +87,16 @@ module1 = Extension(
 	include_dirs = ['/usr/local/include',r'c:\msys\local\include'],
 	)
 
+module2 = Extension(
+	name         = 'mmgen.base58',
+	sources      = ['extmod/base58mod.c'],
+	)
+
+module3 = Extension(
+	name         = 'mmgen.sha256compress',
+	sources      = ['extmod/sha256compressmod.c'],
+	)
+
 
 from mmgen.globalvars import g
 setup(
@@ -100,7 +110,7 @@ setup(
 		platforms    = 'Linux, MS Windows, Raspberry Pi/Raspbian, Orange Pi/Armbian',
 		keywords     = g.keywords,
 		cmdclass     = { 'build_ext': my_build_ext, 'install_data': my_install_data },
-		ext_modules  = [module1],
+		ext_modules  = [module1,module2,module3],
 		data_files = [('share/mmgen', [
 				'data_files/mmgen.cfg',     # source files must have 0644 mode
 				'data_files/mn_wordlist.c',
@@ -156,6 +166,7 @@ setup(
 			'mmgen.main_txsign',
 			'mmgen.main_wallet',
 			'mmgen.txsign',
+			'mmgen.txsigner',
 
 			'mmgen.share.__init__',
 			'mmgen.share.Opts',
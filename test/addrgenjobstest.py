@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/addrgenjobstest.py:  Parallel address generation tests for the MMGen suite
+"""
+
+import sys,os,time
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+from hashlib import sha256
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test that parallel address generation runs its workers concurrently',
+	'usage':'[options] [jobs]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+Key-address lists are generated serially and by 'jobs' (default: 4) worker
+processes, using a dummy key generator that sleeps for a fixed time per batch.
+The results must be identical, and the workers must sleep concurrently: the
+parallel run may take no longer than the serial run without the delay plus
+2/jobs of the total delay.
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if len(cmd_args) > 1: opts.usage()
+
+from mmgen.obj import *
+from mmgen.addr import AddrGenerator,KeyAddrList,AddrListEntry
+
+jobs = int(cmd_args[0]) if cmd_args else 4
+if jobs < 4: opts.usage()
+
+batch_delay = 0.1
+pubhex = PubKey('02' + sha256('pubkey').hexdigest(),compressed=True)
+
+# The key generator returns a fixed pubkey after a delay standing in for the CPU
+# time of key generation, so the test doesn't depend on the number of cores
+class SlowKeyGenerator(object):
+	def __init__(self,delay): self.delay = delay
+	def to_pubhexes(self,privkeys):
+		time.sleep(self.delay)
+		return [pubhex] * len(privkeys)
+
+def make_list():
+	al_id = AddrListID(SeedID(sid='DEADBEEF'),MMGenAddrType('C'))
+	return KeyAddrList(al_id=al_id,adata=AddrListList([AddrListEntry(idx=1)])) # data unused
+
+def test_parallel():
+	al = make_list()
+	# several chunks per worker, each much larger than the pipe buffer
+	num = al.mp_chunk_len * 2 * jobs
+	secs = [(i+1,sha256(str(i)).digest()) for i in range(num)]
+	ag = AddrGenerator(al.al_id.mmtype)
+	delay = num / al.kg_batch_len * batch_delay
+
+	msg_r('Generating {} keys serially without delay... '.format(num))
+	t = time.time()
+	ref = list(al.gen_entries(secs,SlowKeyGenerator(0),ag))
+	t_work = time.time() - t
+	msg('{:.2f}s'.format(t_work))
+
+	msg_r('Generating {} keys with {} jobs and {:.0f}s total delay... '.format(num,jobs,delay))
+	t = time.time()
+	ret = al.generate_parallel(iter(secs),num,SlowKeyGenerator(batch_delay),ag,jobs)
+	t_par = time.time() - t
+	msg('\rGenerating {} keys with {} jobs and {:.0f}s total delay... {:.2f}s{}'.format(
+		num,jobs,delay,t_par,' '*20))
+
+	msg_r('Comparing results... ')
+	fields = lambda d: [(e.idx,e.addr,e.sec.wif) for e in d]
+	assert fields(ret) == fields(ref),'parallel and serial results differ'
+	msg('OK')
+
+	msg_r('Checking concurrency... ')
+	if t_par - t_work > delay * 2 / jobs:
+		die(2,'Parallel run took {:.2f}s longer than serial run without delay: workers are not running concurrently!'.format(t_par - t_work))
+	msg('OK')
+
+msg(green('Testing parallel address generation'))
+test_parallel()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/addrgenspeedtest.py:  Address derivation benchmark for the MMGen suite
+"""
+
+import sys,os,time
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Benchmark key-to-address derivation for each address type of a coin',
+	'usage':'[options] [num addrs] [address type]...',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+For each address type (default: all types supported by the coin), 'num addrs'
+(default: {n}) random private keys are converted to public keys and addresses
+in batches, as during address list generation, and the rate reported.
+""".format(n=10000)
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data,add_opts=['use_internal_ed25519_mod'])
+
+from mmgen.obj import MMGenAddrType,PrivKey
+from mmgen.addr import KeyGenerator,AddrGenerator,AddrList
+
+num = int(cmd_args.pop(0)) if cmd_args else 10000
+mmtypes = cmd_args or g.proto.mmtypes
+
+def test(mmtype):
+	at = MMGenAddrType(mmtype)
+	kg,ag = KeyGenerator(at),AddrGenerator(at)
+	n = AddrList.kg_batch_len
+	secs = [PrivKey(os.urandom(32),compressed=at.compressed,pubkey_type=at.pubkey_type) for i in range(num)]
+	t = time.time()
+	for i in range(0,num,n):
+		ag.to_addrs(kg.to_pubhexes(secs[i:i+n]))
+	return time.time() - t
+
+fs = '{:>5} {:>10} {:>8} {:>10} {:>12}'
+msg(green('Testing address derivation speed for coin {}'.format(g.coin)))
+msg(fs.format('Type','Format','Addrs','Time','Addrs/sec'))
+for mmtype in mmtypes:
+	t = test(mmtype)
+	msg(fs.format(mmtype,MMGenAddrType(mmtype).name,num,'{:.3f}s'.format(t),'{:.0f}'.format(num/t)))
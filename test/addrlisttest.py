@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/addrlisttest.py:  AddrList key merging tests and benchmark for the MMGen suite
+"""
+
+import sys,os,time,gc
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+from hashlib import sha256
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test and benchmark AddrList.remove_dup_keys(), AddrList.add_wifs() and reverse address lookups',
+	'usage':'[options] [max list size]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+The results of reverse address lookups in small lists are checked against the
+reference code.  Then lists of 1000 entries and up, increasing tenfold, and of
+'max list size' (default: 1000000) entries are merged and searched, and the
+time per entry compared.  The test fails if the
+time per entry for the largest list is more than {} times that for the smallest.
+"""
+}
+
+max_slowdown = 5
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if len(cmd_args) > 1: opts.usage()
+
+from mmgen.obj import *
+from mmgen.addr import AddrList,KeyAddrList,AddrListEntry,AddrData
+
+max_size = int(cmd_args[0]) if cmd_args else 10**6
+if max_size < 1: opts.usage()
+sizes = [10**n for n in range(3,len(str(max_size))) if 10**n < max_size] + [max_size]
+
+# Keys, addresses and list entries are created only once, lists are built from slices
+def make_entries(n):
+	ret = []
+	for i in range(n):
+		if not i % 10000:
+			msg_r('\rCreating list entries: {}/{}'.format(i,n))
+		d = sha256(str(i)).digest()
+		ret.append(AddrListEntry(
+			idx  = i + 1,
+			addr = CoinAddr(g.proto.pubhash2addr(d[:20].encode('hex'),False)),
+			sec  = PrivKey(d,compressed=True,pubkey_type='std')))
+	msg('\rCreated {} list entries{}'.format(n,' '*10))
+	return ret
+
+def make_list(data):
+	al_id = AddrListID(SeedID(sid='DEADBEEF'),MMGenAddrType('C'))
+	return KeyAddrList(al_id=al_id,adata=AddrListList(data))
+
+def test_remove_dup_keys(n):
+	kl,kal = make_list(entries[:n]),make_list(entries[n/2:n+n/2])
+	t = time.time()
+	kl.remove_dup_keys(kal)
+	t = time.time() - t
+	assert kl.data == entries[:n/2],'remove_dup_keys(): incorrect result'
+	return t
+
+def test_add_wifs(n):
+	tmp = make_list([AddrListEntry(idx=e.idx,addr=e.addr) for e in entries[:n]])
+	kl = make_list(entries[n-1::-1])
+	t = time.time()
+	tmp.add_wifs(kl)
+	t = time.time() - t
+	assert [e.sec for e in tmp.data] == [e.sec for e in entries[:n]],'add_wifs(): incorrect result'
+	return t
+
+def make_addrlist(sid,data):
+	al_id = AddrListID(SeedID(sid=sid),MMGenAddrType('C'))
+	return AddrList(al_id=al_id,adata=AddrListList(data))
+
+def test_make_reverse_dict(n):
+	ad = AddrData()
+	ad.add(make_addrlist('DEADBEEF',[AddrListEntry(idx=e.idx,addr=e.addr) for e in entries[:n]]))
+	addrs = [e.addr for e in entries[n/2:n+n/2]]
+	t = time.time()
+	d = ad.make_reverse_dict(addrs)
+	t = time.time() - t
+	assert len(d) == n - n/2,'make_reverse_dict(): incorrect result'
+	return t
+
+# the reverse lookups as implemented with a linear search
+def ref_reverse_dict(ad,coinaddrs):
+	d = MMGenDict()
+	for al_id in ad.al_ids:
+		for e in ad.al_ids[al_id].data:
+			if e.addr in coinaddrs:
+				d[e.addr] = MMGenID('{}:{}'.format(al_id,e.idx)),e.label
+	return d
+
+def test_reverse_lookups():
+	msg_r('Testing reverse address lookups... ')
+	e = entries
+	# duplicate addresses within and across lists: the last entry wins
+	al1 = make_addrlist('DEADBEEF',
+			[AddrListEntry(idx=n+1,addr=e[i].addr,label=TwComment(str(n))) for n,i in enumerate((0,1,2,1))])
+	al2 = make_addrlist('BEEFCAFE',[AddrListEntry(idx=n+1,addr=e[i].addr) for n,i in enumerate((2,3))])
+	ad = AddrData()
+	ad.add(al1)
+	ad.add(al2)
+	addrs = [e[i].addr for i in range(6)]
+	assert ad.make_reverse_dict(addrs) == ref_reverse_dict(ad,addrs),'make_reverse_dict(): incorrect result'
+	assert al1.make_reverse_dict(addrs)[e[1].addr][0] == MMGenID('DEADBEEF:C:4'),'duplicate: last entry must win'
+	for a in addrs:
+		d = ref_reverse_dict(ad,[a])
+		assert ad.coinaddr2mmaddr(a) == (d.values()[0][0] if d else None),'coinaddr2mmaddr(): incorrect result'
+	# the lookups must see changes made to lists already added
+	kl = make_addrlist('CAFEBABE',[AddrListEntry(idx=1,sec=e[4].sec)])
+	ad.add(kl)
+	assert ad.coinaddr2mmaddr(e[4].addr) == None
+	kl.generate_addrs_from_keys()
+	assert ad.coinaddr2mmaddr(kl.data[0].addr) == MMGenID('CAFEBABE:C:1'),'stale index after generate_addrs_from_keys()'
+	al1.data.append(AddrListEntry(idx=9,addr=e[5].addr))
+	al1.reset_indexes()
+	assert ad.coinaddr2mmaddr(e[5].addr) == MMGenID('DEADBEEF:C:9'),'stale index after adding entry'
+	msg('OK')
+
+# The lists built here hold millions of objects, so keep the cyclic garbage
+# collector from repeatedly traversing them
+gc.disable()
+
+entries = make_entries(sizes[-1] + sizes[-1]/2)
+
+test_reverse_lookups()
+
+fs = '{:>8} {:>10} {:>12}'
+for desc,test in (
+		('AddrList.remove_dup_keys()',test_remove_dup_keys),
+		('AddrList.add_wifs()',test_add_wifs),
+		('AddrData.make_reverse_dict()',test_make_reverse_dict) ):
+	msg(green('Testing {}'.format(desc)))
+	msg(fs.format('Entries','Time','us/entry'))
+	per_entry = []
+	for n in sizes:
+		t = test(n)
+		per_entry.append(t / n)
+		msg(fs.format(n,'{:.4f}s'.format(t),'{:.3f}'.format(per_entry[-1]*1000000)))
+	if per_entry[-1] > per_entry[0] * max_slowdown:
+		die(2,'Time per entry increased {:.1f}-fold: scaling is not linear!'.format(per_entry[-1]/per_entry[0]))
+	msg('OK')
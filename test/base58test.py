@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/base58test.py:  Base58 tests for the MMGen suite
+"""
+
+import sys,os,random
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test the C base58 codec against the pure-Python reference code',
+	'usage':'[options] [random rounds]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+'random rounds' (default: 10000) random byte strings of up to 100 bytes, some
+with leading zero bytes, are encoded and decoded, with and without checksum,
+by the C and the Python functions and the results compared.
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if len(cmd_args) > 1: opts.usage()
+
+try:
+	import mmgen.base58 as c58
+except ImportError:
+	die(1,"The 'mmgen.base58' extension module is not built.  Run 'python setup.py build_ext'")
+
+from mmgen.protocol import _b58encode_py,_b58decode_py,_b58chk,_b58a
+from mmgen.protocol import b58chk_encode,b58chk_decode,b58chk_encode_many,b58chk_decode_many
+
+def random_data():
+	return '\0' * random.choice((0,0,1,2,5,21)) + os.urandom(random.randint(0,100))
+
+def test_vectors():
+	msg_r('Testing fixed vectors... ')
+	for data,enc in (
+			('',''),
+			('\0','1'),
+			('\0'*20,'1'*20),
+			('\0\0\xff','115Q'),
+			('\x01','2'),
+			('\x39','z'),
+			('\x3a','21'),
+			('\xff'*4,'7YXq9G'),
+			('\0\0\x01\x02','115T'),
+		):
+		assert c58.encode(data) == _b58encode_py(data) == enc,'{!r}: incorrect encoding'.format(data)
+		assert c58.decode(enc) == _b58decode_py(enc) == data,'{!r}: incorrect decoding'.format(enc)
+	zero_addr = '1111111111111111111114oLvT2'
+	assert b58chk_encode('\0'*21) == zero_addr and b58chk_decode(zero_addr) == '\0'*21
+	msg('OK')
+
+def test_random(rounds):
+	msg_r('Testing {} random byte strings... '.format(rounds))
+	datas = [random_data() for i in range(rounds)]
+	encs = c58.encode_many(datas)
+	assert encs == [c58.encode(d) for d in datas],'encode_many() mismatch'
+	assert c58.decode_many(encs) == datas,'decode_many() mismatch'
+	for data,enc in zip(datas,encs):
+		assert enc == _b58encode_py(data),'{}: encoding mismatch'.format(data.encode('hex'))
+		assert c58.decode(enc) == _b58decode_py(enc) == data,'{}: decoding mismatch'.format(enc)
+		s = ''.join(random.choice(_b58a) for i in range(random.randint(0,60)))
+		assert c58.decode(s) == _b58decode_py(s),'{}: decoding mismatch'.format(s)
+	chk_encs = b58chk_encode_many(datas)
+	assert b58chk_decode_many(chk_encs) == datas,'b58chk_decode_many() mismatch'
+	for data,enc in zip(datas,chk_encs):
+		assert enc == b58chk_encode(data) == _b58encode_py(data + _b58chk(data)),'checksummed encoding mismatch'
+	msg('OK')
+
+def test_bad_input(rounds):
+	msg_r('Testing bad characters and checksums... ')
+	for s in ('0','O','I','l','+','/','abc0','1 2','\0','\xff','abc\x80'):
+		for f in (c58.decode,_b58decode_py):
+			try: f(s)
+			except ValueError: pass
+			else: raise AssertionError('{!r}: invalid character accepted by {}'.format(s,f.__name__))
+	try: c58.decode_many(['abc','abc0'])
+	except ValueError: pass
+	else: raise AssertionError('invalid character accepted by decode_many()')
+	for i in range(rounds):
+		data = random_data()
+		enc = b58chk_encode(data)
+		bad = list(enc)
+		pos = random.randrange(len(bad))
+		bad[pos] = random.choice(_b58a.replace(bad[pos],''))
+		bad = ''.join(bad)
+		# the Python reference check of a checksum
+		raw = _b58decode_py(bad)
+		ref_ok = _b58chk(raw[:-4]) == raw[-4:]
+		try:
+			ret = b58chk_decode(bad)
+		except ValueError:
+			assert not ref_ok,'{}: valid checksum rejected'.format(bad)
+		else:
+			assert ref_ok and ret == raw[:-4],'{}: bad checksum accepted'.format(bad)
+	msg('OK')
+
+rounds = int(cmd_args[0]) if cmd_args else 10000
+msg(green('Testing C base58 codec'))
+test_vectors()
+test_random(rounds)
+test_bad_input(rounds)
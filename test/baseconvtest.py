@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/baseconvtest.py:  Base conversion tests for the MMGen suite
+"""
+
+import sys,os
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test the batch base conversion functions against the per-item reference code',
+	'usage':'[options] [random rounds]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+'random rounds' (default: 200) random hex numbers are converted to and from
+each base by both the batch and the reference functions and the results
+compared.
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if len(cmd_args) > 1: opts.usage()
+
+from mmgen.addr import PasswordList
+
+# the original per-item conversion code
+def ref_tohex(words_arg,wl_id,pad=None):
+	words = words_arg if type(words_arg) in (list,tuple) else tuple(words_arg.strip())
+	wl = baseconv.digits[wl_id]
+	base = len(wl)
+	deconv = [wl.index(words[::-1][i])*(base**i) for i in range(len(words))]
+	ret = ('{:0{w}x}'.format(sum(deconv),w=pad or 0))
+	return ('','0')[len(ret) % 2] + ret
+
+def ref_fromhex(hexnum,wl_id,pad=None,tostr=False):
+	wl = baseconv.digits[wl_id]
+	base = len(wl)
+	num,ret = int(hexnum.strip(),16),[]
+	while num:
+		ret.append(num % base)
+		num /= base
+	o = [wl[n] for n in [0] * ((pad or 0)-len(ret)) + ret[::-1]]
+	return ''.join(o) if tostr else o
+
+def ref_make_passwd(pw_fmt,pw_len,hex_sec):
+	if pw_fmt == 'hex': return hex_sec
+	return ref_fromhex(hex_sec,pw_fmt,pad=pw_len,tostr=True)[-pw_len:]
+
+def rand_hexnums(rounds):
+	# include zero, leading zero bytes and odd lengths
+	ret = ['00','0001','f','00ff'+'00'*15]
+	return ret + [os.urandom(1+i%40).encode('hex')[i%2:] for i in range(rounds)]
+
+def test_baseconv(rounds):
+	msg_r('Testing tohex_many() and fromhex_many() against reference code... ')
+	hexnums = rand_hexnums(rounds)
+	for wl_id in ('electrum','tirosh','b58','b32','b16','b10','b8'):
+		for pad in (None,0,10,64):
+			for tostr in (False,True):
+				res = baseconv.fromhex_many(hexnums,wl_id,pad=pad,tostr=tostr)
+				ref = [ref_fromhex(h,wl_id,pad=pad,tostr=tostr) for h in hexnums]
+				assert res == ref,'{}: fromhex_many(pad={},tostr={}) mismatch'.format(wl_id,pad,tostr)
+				for i,h in enumerate(hexnums):
+					assert baseconv.fromhex(h,wl_id,pad=pad,tostr=tostr) == ref[i]
+			mns = [ref_fromhex(h,wl_id,pad=pad) for h in hexnums]
+			for words in (mns,[''.join(w) for w in mns]) if wl_id not in ('electrum','tirosh') else (mns,):
+				res = baseconv.tohex_many(words,wl_id,pad=pad)
+				assert res == [ref_tohex(w,wl_id,pad=pad) for w in words],'{}: tohex_many(pad={}) mismatch'.format(wl_id,pad)
+	msg('OK')
+
+def test_passwds(rounds):
+	msg_r('Testing PasswordList.make_passwds() against reference code... ')
+	hex_secs = [os.urandom(32).encode('hex') for i in range(rounds)]
+	for pw_fmt,pw_lens in (('b58',(8,20,36)),('b32',(10,24,42)),('hex',(64,))):
+		for pw_len in pw_lens:
+			pl = PasswordList(pw_id_str='foo',pw_fmt=pw_fmt,pw_len=pw_len,chk_params_only=True)
+			ref = [ref_make_passwd(pw_fmt,pw_len,h) for h in hex_secs]
+			assert pl.make_passwds(hex_secs) == ref,'{}:{}: make_passwds() mismatch'.format(pw_fmt,pw_len)
+			assert [pl.make_passwd(h) for h in hex_secs] == ref,'{}:{}: make_passwd() mismatch'.format(pw_fmt,pw_len)
+	msg('OK')
+
+msg(green('Testing batch base conversion functions'))
+rounds = int(cmd_args[0]) if cmd_args else 200
+test_baseconv(rounds)
+test_passwds(rounds)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/bech32test.py:  Bech32 tests for the MMGen suite
+"""
+
+import sys,os,time
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test the fast Bech32 functions against BIP173 vectors and the reference code',
+	'usage':'[options] [random rounds]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+After the BIP173 test vectors are checked, 'random rounds' (default: 1000)
+random witness programs are encoded and decoded by both the fast and the
+reference functions and the results compared.
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if len(cmd_args) > 1: opts.usage()
+
+import mmgen.bech32 as bech32
+
+# https://github.com/bitcoin/bips/blob/master/bip-0173.mediawiki#test-vectors
+valid_checksum = (
+	'A12UEL5L',
+	'an83characterlonghumanreadablepartthatcontainsthenumber1andtheexcludedcharactersbio1tt5tgs',
+	'abcdef1qpzry9x8gf2tvdw0s3jn54khce6mua7lmqqqxw',
+	'11' + 'q'*82 + 'c8247j',
+	'split1checkupstagehandshakeupstreamerranterredcaperred2y9e3w',
+)
+
+invalid_checksum = (
+	' 1nwldj5',
+	'\x7f1axkwrx',
+	'an84characterslonghumanreadablepartthatcontainsthenumber1andtheexcludedcharactersbio1569pvx',
+	'pzry9x0s0muk',
+	'1pzry9x0s0muk',
+	'x1b4n0q5v',
+	'li1dgmt3',
+	'de1lg7wt\xff',
+)
+
+valid_address = ( # address, scriptPubKey
+	('BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4','0014751e76e8199196d454941c45d1b3a323f1433bd6'),
+	('tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7',
+		'00201863143c14c5166804bd19203356da136c985678cd4d27a1b8c6329604903262'),
+	('bc1pw508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7k7grplx',
+		'5128751e76e8199196d454941c45d1b3a323f1433bd6751e76e8199196d454941c45d1b3a323f1433bd6'),
+	('BC1SW50QA3JX3S','6002751e'),
+	('bc1zw508d6qejxtdg4y5r3zarvaryvg6kdaj','5210751e76e8199196d454941c45d1b3a323'),
+	('tb1qqqqqp399et2xygdj5xreqhjjvcmzhxw4aywxecjdzew6hylgvsesrxh6hy',
+		'0020000000c4a5cad46221b2a187905e5266362b99d5e91c6ce24d165dab93e86433'),
+)
+
+invalid_address = (
+	'tc1qw508d6qejxtdg4y5r3zarvary0c5xw7kg3g4ty',
+	'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5',
+	'BC13W508D6QEJXTDG4Y5R3ZARVARY0C5XW7KN40WF2',
+	'bc1rw5uspcuh',
+	'bc10w508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7kw5rljs90',
+	'BC1QR508D6QEJXTDG4Y5R3ZARVARYV98GJ9P',
+	'tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sL5k7',
+	'bc1zw508d6qejxtdg4y5r3zarvaryvqyzf3du',
+	'tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3pjxtptv',
+	'bc1gmk9yu',
+)
+
+def test_checksums():
+	msg_r('Testing BIP173 checksum vectors... ')
+	for s in valid_checksum:
+		hrp,data = bech32.bech32_decode(s)
+		assert hrp is not None,'{}: valid checksum rejected'.format(s)
+		chk = bech32.bech32_polymod_fast(data + bech32.bech32_create_checksum(hrp,data),bech32._hrp_state(hrp))
+		assert chk == 1,'{}: fast polymod failed'.format(s)
+	for s in invalid_checksum:
+		assert bech32.bech32_decode(s) == (None,None),'{!r}: invalid checksum accepted'.format(s)
+	msg('OK')
+
+def spk(witver,witprog):
+	return (chr(witver + 0x50 if witver else 0) + chr(len(witprog)) + witprog).encode('hex')
+
+def test_addresses():
+	msg_r('Testing BIP173 address vectors... ')
+	for addr,script in valid_address:
+		hrp = addr[:2].lower()
+		witver,witprog = bech32.decode_fast(hrp,addr)
+		assert witver is not None,'{}: valid address rejected'.format(addr)
+		assert spk(witver,witprog) == script,'{}: incorrect scriptPubKey'.format(addr)
+		ref = bech32.decode(hrp,addr)
+		assert (ref[0],''.join(map(chr,ref[1]))) == (witver,witprog),'{}: reference mismatch'.format(addr)
+		assert bech32.encode_fast(hrp,witver,witprog) == addr.lower(),'{}: re-encoding failed'.format(addr)
+	for addr in invalid_address:
+		for hrp in ('bc','tb'):
+			assert bech32.decode_fast(hrp,addr) == (None,None),'{}: invalid address accepted'.format(addr)
+			assert bech32.decode(hrp,addr) == (None,None),'{}: reference accepted invalid address'.format(addr)
+	assert bech32.verify_many('bc',[a for a,s in valid_address]) == [True,False,True,True,True,False]
+	assert not any(bech32.verify_many('bc',invalid_address))
+	msg('OK')
+
+def test_random(rounds):
+	msg_r('Testing {} random witness programs against reference code... '.format(rounds))
+	progs = [os.urandom((20,32)[i % 2]) for i in range(rounds)]
+	t = time.time()
+	addrs = bech32.encode_many('bc',0,progs)
+	assert all(bech32.verify_many('bc',addrs)),'verify_many() failed'
+	t = time.time() - t
+	for prog,addr in zip(progs,addrs):
+		assert addr == bech32.encode('bc',0,map(ord,prog)),'{}: reference mismatch'.format(addr)
+		assert bech32.decode_fast('bc',addr) == (0,prog),'{}: decoding failed'.format(addr)
+	msg('OK')
+	vmsg('Encoded and verified {} addresses in {:.4f}s'.format(rounds,t))
+
+msg(green('Testing fast Bech32 functions'))
+test_checksums()
+test_addresses()
+test_random(int(cmd_args[0]) if cmd_args else 1000)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/chaincachetest.py:  Seed chain checkpoint cache tests and benchmark for the MMGen suite
+"""
+
+import sys,os,time
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test and benchmark the seed chain checkpoint cache',
+	'usage':'[options] [index]...',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-i, --interval=n Save a checkpoint every 'n' rounds (default: {g.seed_chain_checkpoint_interval})
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""".format(g=g),
+	'notes': """
+For each index (default: {dfl}), the key at that index is generated without the
+cache, with a cold (empty) cache and with a warm cache, and the results compared.
+""".format(dfl=' '.join(map(str,(10**4,10**5,10**6))))
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+from mmgen.addr import KeyAddrList,AddrIdxList
+from mmgen.obj import MMGenAddrType
+from mmgen.seed import Seed
+
+if opt.interval: g.seed_chain_checkpoint_interval = int(opt.interval)
+
+import tempfile,shutil
+g.data_dir = tempfile.mkdtemp()
+
+def gen_key(seed,idx,cache):
+	opt.checkpoint_cache = cache
+	t = time.time()
+	al = KeyAddrList(seed=seed,addr_idxs=AddrIdxList(str(idx)),mmtype=MMGenAddrType('C'))
+	return al.data[0].sec,time.time() - t
+
+try:
+	seed = Seed(os.urandom(32))
+	fs = '{:>8} {:>9} {:>9} {:>9}  {}'
+	msg(green('Testing seed chain checkpoint cache (interval {})'.format(g.seed_chain_checkpoint_interval)))
+	msg(fs.format('Index','No cache','Cold','Warm','Result'))
+	for idx in map(int,cmd_args) or (10**4,10**5,10**6):
+		k1,t1 = gen_key(seed,idx,False)
+		for fn in os.listdir(os.path.join(g.data_dir,'seed_chain_cache')) \
+				if os.path.exists(os.path.join(g.data_dir,'seed_chain_cache')) else []:
+			os.unlink(os.path.join(g.data_dir,'seed_chain_cache',fn))
+		k2,t2 = gen_key(seed,idx,True)
+		k3,t3 = gen_key(seed,idx,True)
+		if not k1 == k2 == k3:
+			die(2,'Key mismatch at index {}!'.format(idx))
+		msg(fs.format(idx,'{:.4f}s'.format(t1),'{:.4f}s'.format(t2),'{:.4f}s'.format(t3),green('OK')))
+finally:
+	shutil.rmtree(g.data_dir)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/ed25519test.py:  Ed25519 tests for the MMGen suite
+"""
+
+import sys,os,time
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test the fast fixed-base Ed25519 scalar multiplication against the reference code',
+	'usage':'[options] [random rounds]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+After the edge-case scalars are checked, 'random rounds' (default: 5) random
+scalars are multiplied by the base point with both the fast and the reference
+functions and the encoded points compared.
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if len(cmd_args) > 1: opts.usage()
+
+from mmgen.ed25519 import B,l,scalarmult,encodepoint,scalarmultbase,scalarmultbase_many,encodepoint_fast
+
+def ref(e): return encodepoint(scalarmult(B,e % l))
+
+def test_scalars(desc,scalars):
+	msg_r('Testing {}... '.format(desc))
+	t = time.time()
+	fast = [encodepoint_fast(P) for P in scalarmultbase_many(scalars)]
+	t = time.time() - t
+	for e,f in zip(scalars,fast):
+		assert f == ref(e),'{}: reference mismatch'.format(e)
+		assert encodepoint_fast(scalarmultbase(e)) == f,'{}: single and batch results differ'.format(e)
+	msg('OK')
+	vmsg('Multiplied {} scalars in {:.4f}s'.format(len(scalars),t))
+
+msg(green('Testing fast Ed25519 functions'))
+test_scalars('edge-case scalars',[0,1,2,l-1,l,l+1,2**256-1])
+rounds = int(cmd_args[0]) if cmd_args else 5
+test_scalars('{} random scalars'.format(rounds),[int(os.urandom(32).encode('hex'),16) for i in range(rounds)])
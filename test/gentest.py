@@ -50,12 +50,12 @@ opts_data = lambda: {
        Speed:   {prog} a [rounds]    (test speed of one key generator)
        Compare: {prog} a <dump file> (compare output of a key generator against wallet dump)
           where a and b are one of:
-             '1' - native Python ecdsa library (very slow)
+             '1' - native Python secp256k1 code
              '2' - bitcoincore.org's secp256k1 library (default from v0.8.6)
 
 EXAMPLES:
   {prog} 1:2 100
-    (compare output of native Python ECDSA with secp256k1 library, 100 rounds)
+    (compare output of native Python code with secp256k1 library, 100 rounds)
   {prog} 2:ext 100
     (compare output of secp256k1 library with external library (see below), 100 rounds)
   {prog} 2 1000
@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/rpctest.py:  RPC connection tests for the MMGen suite
+"""
+
+import sys,os,time,socket,struct,threading,json,random,imp
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test the RPC connection pool, request retry logic, chunked batch and non-blocking requests and streamed replies',
+	'usage':'[options]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if cmd_args: opts.usage()
+
+from mmgen.rpc import CoinDaemonRPCConnection,CoinDaemonRPCConnectionAsync,RPCConnectionPool,RPCFuture,RPCFailure,rpc_error
+from decimal import Decimal
+from StringIO import StringIO
+
+class FakeDaemon(object):
+	"""
+	An HTTP server on localhost answering each request with its request number, and each
+	request of a batch with its params.  How each request is handled is set by the next item of 'actions' (default: 'ok'):
+	  ok       - reply, and keep the connection open
+	  ok_close - reply, and then close the connection, as with a keep-alive timeout
+	  drop     - close the connection without replying
+	  reset    - reset the connection without replying
+	  slow     - reply after 'slow_secs' seconds
+	  partial  - send part of the status line, and then close the connection
+	An action may also be a tuple (action,reply body).
+	"""
+	slow_secs = 1.5
+
+	def __init__(self):
+		self.sock = socket.socket(socket.AF_INET,socket.SOCK_STREAM)
+		self.sock.setsockopt(socket.SOL_SOCKET,socket.SO_REUSEADDR,1)
+		self.sock.bind(('127.0.0.1',0))
+		self.sock.listen(8)
+		self.port = self.sock.getsockname()[1]
+		self.actions = []
+		self.nreq = 0
+		self.nconn = 0
+		self.lock = threading.Lock()
+		t = threading.Thread(target=self.serve)
+		t.daemon = True
+		t.start()
+
+	def serve(self):
+		while True:
+			s,addr = self.sock.accept()
+			with self.lock: self.nconn += 1
+			t = threading.Thread(target=self.handle,args=(s,))
+			t.daemon = True
+			t.start()
+
+	def reply(self,body):
+		return 'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n{}'.format(
+					len(body),body)
+
+	def handle(self,s):
+		f = s.makefile('rb')
+		try:
+			while True:
+				line = f.readline()
+				if not line: return
+				clen = 0
+				while line not in ('\r\n','\n',''):
+					if line.lower().startswith('content-length:'):
+						clen = int(line.split(':')[1])
+					line = f.readline()
+				req = json.loads(f.read(clen))
+				with self.lock:
+					self.nreq += 1
+					n = self.nreq
+					action = self.actions.pop(0) if self.actions else 'ok'
+				if type(req) == list:
+					body = json.dumps([{'result':r['params'],'error':None,'id':r['id']} for r in req])
+				else:
+					body = json.dumps({'result':n,'error':None,'id':1})
+				if type(action) == tuple: action,body = action
+				if action == 'drop':
+					return
+				elif action == 'reset':
+					s.setsockopt(socket.SOL_SOCKET,socket.SO_LINGER,struct.pack('ii',1,0))
+					return
+				elif action == 'partial':
+					s.sendall('HTTP/1.1 20')
+					return
+				elif action == 'slow':
+					time.sleep(self.slow_secs)
+				s.sendall(self.reply(body))
+				if action == 'ok_close':
+					return
+		except socket.error:
+			pass
+		finally:
+			f.close()
+			s.close()
+
+d = FakeDaemon()
+c = CoinDaemonRPCConnection('127.0.0.1',d.port,user='user',passwd='passwd')
+
+def request(actions,**kwargs):
+	d.actions = actions
+	nreq = d.nreq
+	ret = c.request('getblockcount',on_fail='return',**kwargs)
+	return ret,d.nreq - nreq
+
+def test_pool():
+	msg_r('Testing connection pool... ')
+	assert RPCConnectionPool('127.0.0.1',d.port) is c.pool
+	for i in range(5):
+		ret,n = request(['ok'])
+		assert (ret,n) == (d.nreq,1),'request failed'
+	assert d.nconn == 1,'{} connections opened for sequential requests'.format(d.nconn)
+	assert len(c.pool.idle) == 1
+	hcs = [c.pool.get(3) for i in range(c.pool.size + 2)]
+	for hc in hcs: c.pool.put(hc)
+	assert len(c.pool.idle) == c.pool.size,'pool size exceeded'
+	assert all(hc.sock is None for hc in hcs[c.pool.size:]),'surplus connection not closed'
+	c.pool.close()
+	assert c.pool.idle == []
+	msg('OK')
+
+def test_retry():
+	msg_r('Testing retry of requests on closed keep-alive connections... ')
+	vmsg('')
+	for actions,desc in (
+			(['ok_close','ok'],'connection closed by server while idle'),
+			(['ok','drop','ok'],'connection closed before reply'),
+			(['ok','reset','ok'],'connection reset before reply') ):
+		c.pool.close()
+		ret,n = request(actions[:1])
+		assert not rpc_error(ret)
+		ret,n = request(actions[1:])
+		assert not rpc_error(ret),'{}: request not retried'.format(desc)
+		assert ret == d.nreq,'{}: wrong result'.format(desc)
+		vmsg('  {}: OK ({} request{} received)'.format(desc,n,suf(n,'s')))
+	msg('OK')
+
+def test_no_retry():
+	msg_r('Testing that requests are not repeated after a timeout or partial reply... ')
+	vmsg('')
+	for actions,kwargs,desc in (
+			(['ok','slow'],{'timeout':0.5},'timeout on reused connection'),
+			(['ok','partial'],{},'partial reply on reused connection'),
+			([],{},'connection closed on new connection') ):
+		c.pool.close()
+		if actions:
+			request(actions[:1])
+			d.actions = actions[1:]
+		else:
+			d.actions = ['drop']
+		nreq = d.nreq
+		ret = c.request('getblockcount',on_fail='silent',**kwargs)
+		assert rpc_error(ret),'{}: request succeeded'.format(desc)
+		assert d.nreq - nreq == 1,'{}: request sent {} times'.format(desc,d.nreq - nreq)
+		vmsg('  {}: OK'.format(desc))
+	time.sleep(d.slow_secs) # let the slow reply complete
+	msg('OK')
+
+def test_chunked():
+	msg_r('Testing chunked batch requests... ')
+	# a unicode host name, as read from the config file, requires the 'idna' codec
+	c = CoinDaemonRPCConnection(u'127.0.0.1',d.port,user='user',passwd='passwd')
+	g.rpc_batch_chunk_size = 3
+	arg_list = [[i,'foo'] for i in range(10)]
+	ret = []
+	def run(on_fail):
+		try:    ret.append(c.request('getblockhash',arg_list,batch=True,on_fail=on_fail))
+		except Exception as e: ret.append(e)
+	# the import lock is held by the main thread while launch() runs a main_*.py module, so
+	# no worker thread may import anything
+	err = [('ok','[{"result":null,"error":"foo","id":1}]')] * 4
+	for actions,on_fail,chk,desc in (
+			([],'return',lambda r: r == arg_list,'results joined in order'),
+			(err,'return',rpc_error,'failed chunk returned'),
+			(err,'raise',lambda r: isinstance(r,RPCFailure),'failed chunk raised') ):
+		d.actions,nreq,ret = list(actions),d.nreq,[]
+		imp.acquire_lock()
+		try:
+			t = threading.Thread(target=run,args=(on_fail,))
+			t.daemon = True
+			t.start()
+			t.join(10)
+		finally:
+			imp.release_lock()
+		assert ret,'{}: chunked request deadlocked'.format(desc)
+		assert chk(ret[0]),'{}: incorrect result {!r}'.format(desc,ret[0])
+		if not actions:
+			assert d.nreq - nreq == 4,'{}: {} requests sent'.format(desc,d.nreq - nreq)
+	msg('OK')
+
+def test_async():
+	msg_r('Testing non-blocking requests... ')
+	ca = CoinDaemonRPCConnectionAsync('127.0.0.1',d.port,user='user',passwd='passwd')
+	assert all(hasattr(ca,m) for m in ca.rpcmethods)
+	n = 4
+	d.actions = ['slow'] * n
+	nreq,t = d.nreq,time.time()
+	fs = [ca.getblockcount() for i in range(n)]
+	assert all(type(f) == RPCFuture for f in fs)
+	assert time.time() - t < d.slow_secs,'requests not made in the background'
+	ret = [f.result() for f in fs]
+	assert time.time() - t < d.slow_secs * 2,'requests not run concurrently'
+	assert all(f.done() for f in fs)
+	assert sorted(ret) == range(nreq+1,nreq+n+1),'incorrect results {}'.format(ret)
+	assert ca.request_async('getblockhash',[[1],[2]],batch=True).result() == [[1],[2]]
+	err = ('ok','{"result":null,"error":"foo","id":1}')
+	d.actions = [err]
+	assert rpc_error(ca.getblockcount(on_fail='return').result()),'failed request not returned'
+	d.actions = [err]
+	f = ca.getblockcount(on_fail='raise')
+	try: f.result()
+	except RPCFailure: pass
+	else: raise AssertionError,'failed request not raised'
+	d.actions = [err]
+	f = ca.getblockcount()
+	stderr_save,sys.stderr = sys.stderr,StringIO()
+	try: f.result()
+	except SystemExit: pass
+	else: raise AssertionError,'no exit on failed request'
+	finally: sys.stderr = stderr_save
+	msg('OK')
+
+class FakeResponse(object):
+	"an HTTP response whose body is read in chunks of at most 'chunk_len' bytes"
+	will_close = False
+	def __init__(self,data,chunk_len):
+		self.data,self.chunk_len = data,chunk_len
+	def read(self,n=None):
+		n = len(self.data) if n is None else min(n,random.randint(1,self.chunk_len))
+		ret,self.data = self.data[:n],self.data[n:]
+		return ret
+
+class FakeConnection(object):
+	closed = False
+	def close(self): self.closed = True
+
+stream_items = (
+	r'{"txid": "ab12", "amount": 1.23456789, "label": "\u03b1\u03b2 ],{\"x"}',
+	'12345678901234567890', '"\xe2\x82\xac\xe2\x82\xac"', '[1, [2.5, []]]', '{}', 'null', 'true', '-0.00000001', '1.5E-8'
+)
+stream_reply = '{ "result" : [\n' + ' ,'.join(stream_items) + ' ], "error": null, "id": 1}'
+stream_prefix_len = stream_reply.index('[') + 1
+
+def stream(reply,chunk_len,first_len=0,on_fail='raise'):
+	hc,r = FakeConnection(),FakeResponse(reply[stream_prefix_len+first_len:],chunk_len)
+	c.stream_chunk_len = chunk_len
+	return hc,c.stream_result('listunspent',hc,r,reply[:stream_prefix_len+first_len],stream_prefix_len,
+								{'on_fail':on_fail},time.time())
+
+def test_stream_result():
+	msg_r('Testing streamed replies split at chunk boundaries... ')
+	c.pool.close()
+	res = json.loads(stream_reply,parse_float=Decimal)['result']
+	for chunk_len in range(1,len(stream_reply)+1):
+		hc,it = stream(stream_reply,chunk_len,random.randint(0,chunk_len))
+		assert list(it) == res,'incorrect result (chunk length {})'.format(chunk_len)
+		assert c.pool.idle == [hc] and not hc.closed,'connection not returned to pool'
+		c.pool.idle = []
+	hc,it = stream(stream_reply,5)
+	assert it.next() == res[0]
+	it.close()
+	assert hc.closed and c.pool.idle == [],'connection not closed'
+	for reply,desc in (
+			(stream_reply.replace('"error": null','"error": {"code": -1}'),'error'),
+			(stream_reply[:-30],'truncated reply'),
+			(stream_reply.replace(' ,null',' ,nul'),'invalid item') ):
+		hc,it = stream(reply,7)
+		try: list(it)
+		except RPCFailure: pass
+		else: raise AssertionError('{}: no exception raised'.format(desc))
+		assert hc.closed,'{}: connection not closed'.format(desc)
+	msg('OK')
+
+def test_stream_debug():
+	msg_r('Testing debug output of streamed replies... ')
+	stderr,sys.stderr = sys.stderr,StringIO()
+	g.debug_rpc = True
+	try:
+		hc,it = stream(stream_reply,1)
+		list(it)
+		out = sys.stderr.getvalue()
+	finally:
+		g.debug_rpc = False
+		sys.stderr = stderr
+	assert out == '    RPC REPLY data ==> ' + stream_reply + '\n\n','incorrect debug output'
+	msg('OK')
+
+def test_stream_request():
+	msg_r('Testing streamed requests... ')
+	vmsg('')
+	res = json.loads(stream_reply,parse_float=Decimal)['result']
+	for reply,chunk_len,ret,desc in (
+			(stream_reply,4096,res,'whole reply in first chunk'),
+			(stream_reply,stream_prefix_len,res,'reply streamed'),
+			(stream_reply,stream_prefix_len-1,res,'prefix split (fallback)'),
+			('{"error":null,"id":1,"result":[1,2]}',4096,[1,2],'result not first (fallback)'),
+			('{"result":5,"error":null,"id":1}',4096,5,'result not a list (fallback)') ):
+		c.pool.close()
+		c.stream_chunk_len = chunk_len
+		d.actions = [('ok',reply)]
+		r = c.request('listunspent',on_fail='raise',stream=True)
+		assert (list(r) if type(r) != int else r) == ret,'{}: incorrect result'.format(desc)
+		assert len(c.pool.idle) == 1,'{}: connection not returned to pool'.format(desc)
+		vmsg('  {}: OK'.format(desc))
+	msg('OK')
+
+msg(green('Testing RPC connections'))
+test_pool()
+test_retry()
+test_no_retry()
+test_chunked()
+test_async()
+test_stream_result()
+test_stream_debug()
+test_stream_request()
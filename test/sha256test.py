@@ -2,7 +2,7 @@
 
 
 import sys,os,hashlib
-from mmgen.sha256 import Sha256
+from mmgen.sha256 import Sha256,sha256_compress,sha256_compress_many
 
 random_rounds = int(sys.argv[1]) if len(sys.argv) == 2 else 500
 
@@ -43,7 +43,22 @@ def test_random(rounds):
 		compare_hashes(dlen,os.urandom(dlen))
 	msg('OK\n')
 
+# A message of less than 56 bytes, padded to one block, compresses to its SHA256 hash
+def test_compress(rounds):
+	def pad(data):
+		return data + '\x80' + '\0'*(55-len(data)) + '{:016x}'.format(len(data)*8).decode('hex')
+	msg('Testing raw compression function: ')
+	for dlen in range(56):
+		data = os.urandom(dlen)
+		assert sha256_compress(pad(data)) == hashlib.sha256(data).digest(),'Compressed block does not match!'
+	blocks = [os.urandom(64) for i in range(rounds)]
+	res = sha256_compress_many(blocks)
+	for i,block in enumerate(blocks):
+		assert res[i] == sha256_compress(block) == Sha256(block,preprocess=False).digest(),'Compressed block does not match!'
+	msg('OK\n')
+
 msg(green('Testing MMGen implementation of Sha256()\n'))
 test_K()
 test_ref()
 test_random(random_rounds)
+test_compress(random_rounds)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/startuptest.py:  Startup profiling and lazy loading tests for the MMGen suite
+"""
+
+import sys,os,subprocess
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test the --profile-startup report and the lazy loading of wordlists and key generators',
+	'usage':'[options]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if cmd_args: opts.usage()
+
+def run_tool(args):
+	cmd = ['python',os.path.join('cmds','mmgen-tool'),'--skip-cfg-file','--profile-startup'] + args
+	env = dict(os.environ,PYTHONPATH=os.path.abspath(os.curdir))
+	p = subprocess.Popen(cmd,stdout=subprocess.PIPE,stderr=subprocess.PIPE,env=env)
+	out,err = p.communicate()
+	assert p.returncode == 0,'{}: command failed:\n{}'.format(' '.join(args),err)
+	vmsg('\n' + err.strip())
+	return out.strip(),err
+
+# returns the indentation depth of each module in the report's import tree
+def parse_report(err):
+	lines = err.split('\nStartup import profile: ')[1].splitlines()
+	assert lines[1].split() == ['self','ms','cum','ms','module'],'incorrect report header'
+	mods = {}
+	for l in lines[2:lines.index('Slowest:')]:
+		t_self,t_cum,name = l.split()
+		assert float(t_self) <= float(t_cum),'{}: self time greater than cumulative time'.format(name)
+		mods[name] = (len(l[21:]) - len(l[21:].lstrip())) / 2
+	return mods
+
+def test_profile_startup():
+	msg_r('Testing --profile-startup... ')
+	out,err = run_tool(['hexreverse','deadbeef'])
+	assert out == 'efbeadde','incorrect command output'
+	mods = parse_report(err)
+	assert mods['mmgen.main_tool'] == 0 and mods['mmgen.tool'] == 1,'incorrect import tree'
+	# the key generator and the ecdsa module are not loaded if not needed
+	assert 'mmgen.secp256k1' not in mods and 'ecdsa' not in mods,'unneeded module imported'
+	out,err = run_tool(['-r0','randpair'])
+	assert 'mmgen.secp256k1' in parse_report(err),'key generator module not imported'
+	msg('OK')
+
+def test_lazy_generator():
+	msg_r('Testing LazyGenerator... ')
+	import mmgen.tool as tool
+	from mmgen.obj import PrivKey
+	from mmgen.addr import KeyGenerator,AddrGenerator
+	assert tool.kg.gen is None and tool.ag.gen is None,'generator created on import'
+	pk = PrivKey(os.urandom(32),compressed=tool.at.compressed,pubkey_type=tool.at.pubkey_type)
+	pubhex = tool.kg.to_pubhex(pk)
+	assert tool.kg.gen is not None and tool.ag.gen is None
+	addr = tool.ag.to_addr(pubhex)
+	assert pubhex == KeyGenerator(tool.at).to_pubhex(pk),'incorrect public key'
+	assert addr == AddrGenerator(tool.at).to_addr(pubhex),'incorrect address'
+	gen = tool.kg.gen
+	tool.kg.to_pubhex(pk)
+	assert tool.kg.gen is gen,'generator created twice'
+	msg('OK')
+
+def test_lazy_wordlists():
+	from StringIO import StringIO
+	msg_r('Testing lazy loading of wordlists... ')
+	assert 'mmgen.mn_electrum' not in sys.modules and 'mmgen.mn_tirosh' not in sys.modules
+	assert len(baseconv.digits['electrum']) == baseconv.mn_base
+	assert 'mmgen.mn_electrum' in sys.modules and 'mmgen.mn_tirosh' not in sys.modules
+	chk,baseconv.wl_chksums['tirosh'] = baseconv.wl_chksums['tirosh'],'deadbeef'
+	stderr,sys.stderr = sys.stderr,StringIO()
+	try:
+		baseconv.digits['tirosh']
+	except SystemExit as e:
+		assert e.code == 3 and "doesn't match" in sys.stderr.getvalue(),'incorrect error'
+	else:
+		raise AssertionError('wordlist with bad checksum accepted')
+	finally:
+		sys.stderr = stderr
+		baseconv.wl_chksums['tirosh'] = chk
+	assert len(baseconv.digits['tirosh']) == baseconv.mn_base
+	msg('OK')
+
+msg(green('Testing startup profiling and lazy loading'))
+test_lazy_wordlists()
+test_lazy_generator()
+test_profile_startup()
@@ -730,6 +730,7 @@ cmd_group['ref'] = (
 	('refkeyaddrgen',  (['mmdat',pwfile],'new refwallet key-addr chksum')),
 	('refaddrgen_compressed',    (['mmdat',pwfile],'new refwallet addr chksum (compressed)')),
 	('refkeyaddrgen_compressed', (['mmdat',pwfile],'new refwallet key-addr chksum (compressed)')),
+	('refkeyaddrgen_parallel',   (['mmdat',pwfile],'new refwallet key-addr chksum (parallel generation)')),
 	('refpasswdgen',   (['mmdat',pwfile],'new refwallet passwd file chksum')),
 	('ref_b32passwdgen',(['mmdat',pwfile],'new refwallet passwd file chksum (base32)')),
 	('ref_hexpasswdgen',(['mmdat',pwfile],'new refwallet passwd file chksum (base32)')),
@@ -745,6 +746,8 @@ cmd_group['ref_files'] = (
 #	Create the fake inputs:
 #	('txcreate8',          'transaction creation (8)'),
 	('ref_tx_chk',         'saved reference tx file'),
+	('ref_tx_chk_json',    'saved reference tx file (JSON format)'),
+	('ref_tx_chk_native',  'saved reference tx file (native signing)'),
 	('ref_brain_chk_spc3', 'saved brainwallet (non-standard spacing)'),
 	('ref_tool_decrypt',   'decryption of saved MMGen-encrypted file'),
 )
@@ -1976,10 +1979,10 @@ class MMGenTestSuite(object):
 		self.addrgen_incog(name,[],'',in_fmt='hi',desc='hidden incognito data',
 			args=['-H',u'{},{}'.format(rf,hincog_offset),'-l',str(hincog_seedlen)])
 
-	def keyaddrgen(self,name,wf,pf=None,check_ref=False,mmtype=None):
+	def keyaddrgen(self,name,wf,pf=None,check_ref=False,mmtype=None,extra_args=[]):
 		if cfg['segwit'] and not mmtype:
 			mmtype = ('segwit','bech32')[bool(opt.bech32)]
-		args = ['-d',cfg['tmpdir'],usr_rand_arg,wf,cfg['addr_idx_list']]
+		args = ['-d',cfg['tmpdir'],usr_rand_arg] + extra_args + [wf,cfg['addr_idx_list']]
 		t = MMGenExpect(name,'mmgen-keygen',
 				([],['--type='+str(mmtype)])[bool(mmtype)] + args,
 				extra_desc='({})'.format(mmtype) if mmtype in ('segwit','bech32') else '')
@@ -2005,6 +2008,9 @@ class MMGenTestSuite(object):
 			msg('Skipping non-Segwit key-address generation'); return True
 		self.keyaddrgen(name,wf,pf,check_ref=True,mmtype='compressed')
 
+	def refkeyaddrgen_parallel(self,name,wf,pf):
+		self.keyaddrgen(name,wf,pf,check_ref=True,extra_args=['--jobs=3'])
+
 	def refpasswdgen(self,name,wf,pf):
 		self.addrgen(name,wf,pf,check_ref=True,ftype='pass',id_str='alice@crypto.org')
 
@@ -2349,8 +2355,9 @@ class MMGenTestSuite(object):
 		coin_arg = [] if coin == None else ['--coin='+coin]
 		tool_cmd = ftype.replace('segwit','').replace('bech32','')+'file_chksum'
 		t = MMGenExpect(name,'mmgen-tool',coin_arg+[tool_cmd,af]+add_args)
-		if ftype == 'keyaddr':
-			t.do_decrypt_ka_data(hp=ref_kafile_hash_preset,pw=ref_kafile_pass)
+		if ftype == 'keyaddr': # checksum-only parsing, so no key-to-address check
+			t.hash_preset('key-address data',ref_kafile_hash_preset)
+			t.passphrase('key-address data',ref_kafile_pass)
 		o = t.read().strip().split('\n')[-1]
 		rc = cfg[   'ref_' + ftype + 'file_chksum' +
 					('_'+coin.lower() if coin else '') +
@@ -2473,12 +2480,15 @@ class MMGenTestSuite(object):
 #	def txcreate8(self,name,addrfile):
 #		self.txcreate_common(name,sources=['8'])
 
-	def ref_tx_chk(self,name):
-		tf = os.path.join(ref_dir,ref_subdir,cfg['ref_tx_file'][g.coin.lower()][bool(tn_ext)])
+	def ref_tx_chk(self,name,fmt_subdir='',extra_opts=[]):
+		tf = os.path.join(ref_dir,ref_subdir,fmt_subdir,cfg['ref_tx_file'][g.coin.lower()][bool(tn_ext)])
 		wf = dfl_words
 		write_to_tmpfile(cfg,pwfile,cfg['wpasswd'])
 		pf = get_tmpfile_fn(cfg,pwfile)
-		self.txsign(name,tf,wf,pf,save=False,has_label=True,do_passwd=False)
+		self.txsign(name,tf,wf,pf,save=False,has_label=True,do_passwd=False,extra_opts=extra_opts)
+
+	def ref_tx_chk_json(self,name): self.ref_tx_chk(name,fmt_subdir='json')
+	def ref_tx_chk_native(self,name): self.ref_tx_chk(name,extra_opts=['--sign-method=native'])
 
 	def ref_tool_decrypt(self,name):
 		f = os.path.join(ref_dir,ref_enc_fn)
@@ -3185,6 +3195,7 @@ class MMGenTestSuite(object):
 			'refkeyaddrgen',
 			'refaddrgen_compressed',
 			'refkeyaddrgen_compressed',
+			'refkeyaddrgen_parallel',
 			'refpasswdgen',
 			'ref_b32passwdgen',
 			'ref_hexpasswdgen'
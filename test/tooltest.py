@@ -110,6 +110,8 @@ cmd_data = OrderedDict([
 			'cmd_data': OrderedDict([
 				('Hex2mn',       ()),
 				('Mn2hex',       ('Hex2mn','io3')),
+				('Hex2mn_many',  ('Hex2mn','io3')),
+				('Mn2hex_many',  ('Hex2mn','io3')),
 				('Mn_rand128',   ()),
 				('Mn_rand192',   ()),
 				('Mn_rand256',   ()),
@@ -458,6 +460,20 @@ class MMGenToolTestSuite(object):
 	def Mn2hex(self,name,f1,f2,f3,f4,f5,f6):
 		for f_i,f_o,m in ((f1,f2,'128-bit'),(f3,f4,'192-bit'),(f5,f6,'256-bit')):
 			self.run_cmd_chk(name,f_i,f_o,extra_msg=m,strip_hex=True)
+	# the batch commands must produce the same output as the single-item ones
+	def Hex2mn_many(self,name,f1,f2,f3,f4,f5,f6): self.run_cmd_many(name,(f1,f3,f5),(f2,f4,f6))
+	def Mn2hex_many(self,name,f1,f2,f3,f4,f5,f6): self.run_cmd_many(name,(f2,f4,f6),(f1,f3,f5),strip_hex=True)
+	def run_cmd_many(self,name,in_files,out_files,strip_hex=False):
+		fn = name+'.in'
+		write_to_tmpfile(cfg,fn,''.join(read_from_file(f) for f in in_files))
+		ret = self.run_cmd(name,[get_tmpfile_fn(cfg,fn)]).splitlines()
+		chk = [read_from_file(f).rstrip() for f in out_files]
+		vmsg('Out:  ' + repr(ret))
+		if strip_hex: ret,chk = [[a.lstrip('0') for a in b] for b in (ret,chk)]
+		if ret == chk: ok()
+		else:
+			fs = "Error: values don't match:\nExpected: {!r}\nOut:      {!r}"
+			rdie(3,fs.format(chk,ret))
 	def Mn_rand128(self,name): self.run_cmd_out(name)
 	def Mn_rand192(self,name): self.run_cmd_out(name)
 	def Mn_rand256(self,name): self.run_cmd_out(name)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/txdeserializetest.py:  DeserializedTX tests and benchmark for the MMGen suite
+"""
+
+import sys,os,time
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+from hashlib import sha256
+from struct import pack
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test and benchmark DeserializedTX with large synthetic transactions',
+	'usage':'[options] [num inputs]...',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+For each input count (default: {dfl}), a legacy and a segwit transaction are
+built, deserialized and the txid, unsigned hex and inputs checked.  In the
+segwit transaction every other input spends a P2WPKH output.
+""".format(dfl=' '.join(map(str,(10**3,10**4,10**5))))
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+from mmgen.tx import DeserializedTX
+
+def vint(n):
+	if n < 0xfd: return chr(n)
+	if n <= 0xffff: return '\xfd' + pack('<H',n)
+	return '\xfe' + pack('<I',n)
+
+def script(s): return vint(len(s)) + s
+
+def make_tx(n,segwit):
+	txins,u_txins,witness = [],[],[]
+	for i in range(n):
+		outpoint = sha256(str(i)).digest() + pack('<I',i % 7)
+		if segwit and i % 2:
+			ss,wit = '','\x02' + script('\x30'*72) + script('\x02'*33)
+		else:
+			ss,wit = script('\x30'*72) + script('\x02'*33),'\x00'
+		txins.append(outpoint + script(ss) + '\xff\xff\xff\xfe')
+		u_txins.append(outpoint + '\x00' + '\xff\xff\xff\xfe')
+		witness.append(wit)
+	pkh = '\x76\xa9\x14' + sha256('out').digest()[:20] + '\x88\xac'
+	txouts = vint(2) + (pack('<Q',1234567) + script(pkh)) * 2
+	ver,lt = pack('<I',2),pack('<I',1320969600)
+	body = vint(n) + ''.join(txins) + txouts
+	tx = ver + ('\x00\x01' if segwit else '') + body + (''.join(witness) if segwit else '') + lt
+	txid = sha256(sha256(ver + body + lt).digest()).digest()[::-1].encode('hex')
+	unsigned = ver + vint(n) + ''.join(u_txins) + txouts + lt
+	return tx.encode('hex'),txid,unsigned.encode('hex'),len(''.join(witness)) + 2 if segwit else 0
+
+def test(n,segwit):
+	txhex,txid,u_hex,ws = make_tx(n,segwit)
+	t = time.time()
+	d = DeserializedTX(txhex)
+	t = time.time() - t
+	assert d['txid'] == txid,'incorrect txid'
+	assert d['unsigned_hex'] == u_hex,'incorrect unsigned hex'
+	assert d['witness_size'] == ws,'incorrect witness size'
+	assert d['num_txins'] == n == len(d['txins']),'incorrect number of inputs'
+	assert d['lock_time'] == 1320969600,'incorrect lock time'
+	assert [len(i.get('witness',[])) for i in d['txins'][:2]] == ([0,2] if segwit else [0,0]),'incorrect witness'
+	return len(txhex)/2,t
+
+# Remove from 1 byte up to all of the last input's witness, which is a P2WPKH one
+def test_truncated():
+	from StringIO import StringIO
+	txhex = make_tx(4,True)[0]
+	tx,lt = txhex[:-8].decode('hex'),txhex[-8:].decode('hex')
+	wlen = 1 + len(script('\x30'*72) + script('\x02'*33))
+	for k in range(1,wlen+1):
+		stderr,sys.stderr = sys.stderr,StringIO()
+		try:
+			DeserializedTX((tx[:-k] + lt).encode('hex'))
+		except SystemExit as e:
+			assert e.code == 3 and 'truncated' in sys.stderr.getvalue(),'incorrect error'
+		else:
+			raise AssertionError('truncated witness accepted')
+		finally:
+			sys.stderr = stderr
+
+fs = '{:>8} {:>8} {:>10} {:>10}  {}'
+msg(green('Testing DeserializedTX'))
+msg_r('Testing truncated witness data... ')
+test_truncated()
+msg('OK')
+msg(fs.format('Inputs','Type','Size','Time','Result'))
+for n in map(int,cmd_args) or (10**3,10**4,10**5):
+	for segwit in (False,True):
+		size,t = test(n,segwit)
+		msg(fs.format(n,('legacy','segwit')[segwit],size,'{:.4f}s'.format(t),green('OK')))
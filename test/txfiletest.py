@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/txfiletest.py:  Transaction file format tests for the MMGen suite
+"""
+
+import sys,os,subprocess
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Test that the legacy and JSON transaction file formats are equivalent',
+	'usage':'[options]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+The reference transactions are read in both formats and the resulting
+transaction objects compared, along with the types of all their attributes.
+Each transaction is then written in the other format and compared with the
+reference file.
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data)
+
+if cmd_args: opts.usage()
+
+from mmgen.protocol import init_coin
+import mmgen.tx
+
+ref_dir = os.path.join('test','ref')
+
+# coin,testnet,subdir,file
+ref_txs = (
+	('btc',False,'',        '0B8D5A[15.31789,14,tl=1320969600].rawtx'),
+	('btc',True, '',        '0C7115[15.86255,14,tl=1320969600].testnet.rawtx'),
+	('ltc',False,'litecoin','AF3CDF-LTC[620.76194,1453,tl=1320969600].rawtx'),
+	('ltc',True, 'litecoin','A5A1E0-LTC[1454.64322,1453,tl=1320969600].testnet.rawtx'),
+	('bch',False,'',        '460D4D-BCH[10.19764,tl=1320969600].rawtx'),
+	('bch',True, '',        '359FD5-BCH[6.68868,tl=1320969600].testnet.rawtx'),
+)
+
+tmp_fn = os.path.join('test','tmp1','txfiletest.rawtx')
+
+# attributes depending on the file format or name
+skip_attrs = ('chksum','fmt_data','fn')
+
+# (type,value) pairs of the attributes of a transaction and its inputs and outputs
+def get_state(tx):
+	def io_state(io_list):
+		return [sorted((k,type(v),v) for k,v in e.__dict__.items()) for e in io_list]
+	d = dict((k,(type(v),v)) for k,v in tx.__dict__.items() if k not in skip_attrs+('inputs','outputs'))
+	return d,io_state(tx.inputs),io_state(tx.outputs)
+
+def test_formats(coin,testnet,subdir,fn):
+	msg_r('Testing {} {} transaction... '.format(coin.upper(),('mainnet','testnet')[testnet]))
+	g.testnet = testnet
+	init_coin(coin)
+	reload(sys.modules['mmgen.tx'])
+	MMGenTX = sys.modules['mmgen.tx'].MMGenTX
+	fns = {
+		'legacy': os.path.join(ref_dir,subdir,fn),
+		'json':   os.path.join(ref_dir,subdir,'json',fn) }
+	txs = dict((k,MMGenTX(fns[k],silent_open=True)) for k in fns)
+	a,b = [get_state(txs[k]) for k in ('legacy','json')]
+	for k in set(a[0]) | set(b[0]):
+		assert a[0].get(k) == b[0].get(k),'{}: attribute mismatch: {!r} != {!r}'.format(k,a[0].get(k),b[0].get(k))
+	assert a[1:] == b[1:],'inputs or outputs mismatch'
+	g.tx_file_format = 'json'
+	txs['legacy'].format()
+	assert txs['legacy'].fmt_data == open(fns['json']).read(),'legacy -> json: file data mismatch'
+	# the order of the items of the inputs and outputs in a legacy file may differ, so re-read it
+	g.tx_file_format = 'legacy'
+	txs['json'].format()
+	with open(tmp_fn,'w') as f: f.write(txs['json'].fmt_data)
+	assert get_state(MMGenTX(tmp_fn,silent_open=True)) == a,'json -> legacy: transaction mismatch'
+	msg('OK')
+
+def test_cfg_check():
+	msg_r('Testing check of tx_file_format value... ')
+	cmd = ['python',os.path.join('cmds','mmgen-tool'),'--skip-cfg-file','hexreverse','ab']
+	env = dict(os.environ,PYTHONPATH=os.path.abspath(os.curdir))
+	for val,ret in (('json',0),('bogus',1)):
+		env['MMGEN_TX_FILE_FORMAT'] = val
+		p = subprocess.Popen(cmd,stdout=subprocess.PIPE,stderr=subprocess.PIPE,env=env)
+		out,err = p.communicate()
+		assert p.returncode == ret,'{}: incorrect return code {}'.format(val,p.returncode)
+		if ret: assert "'bogus': invalid value for 'tx_file_format'" in err,'incorrect error message'
+	msg('OK')
+
+msg(green('Testing transaction file formats'))
+check_or_create_dir(os.path.dirname(tmp_fn))
+for d in ref_txs: test_formats(*d)
+os.unlink(tmp_fn)
+test_cfg_check()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+#
+# mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+# Copyright (C)2013-2018 The MMGen Project <mmgen@tuta.io>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+test/txsigntest.py:  Multi-coin native transaction signing test for the MMGen suite
+"""
+
+import sys,os
+from StringIO import StringIO
+pn = os.path.dirname(sys.argv[0])
+os.chdir(os.path.join(pn,os.pardir))
+sys.path.__setitem__(0,os.path.abspath(os.curdir))
+os.environ['MMGEN_TEST_SUITE'] = '1'
+
+# Import these _after_ local path's been added to sys.path
+from mmgen.common import *
+
+opts_data = lambda: {
+	'desc': 'Sign the reference transactions of several coins in one process, as mmgen-autosign does',
+	'usage':'[options]',
+	'options': """
+-h, --help       Print this help message
+--, --longhelp   Print help message for long options (common options)
+-q, --quiet      Produce quieter output
+-v, --verbose    Produce more verbose output
+""",
+	'notes': """
+The seed key cache is tested first.  Then the transactions are signed natively (without a coin daemon) with keys
+generated from the reference seed.  Keys are cached across transactions,
+so each coin and network must get its own keys.
+"""
+}
+
+sys.argv = [sys.argv[0]] + ['--skip-cfg-file'] + sys.argv[1:]
+
+cmd_args = opts.init(opts_data,add_opts=['mmgen_keys_from_file','in_fmt','sign_method'])
+
+if cmd_args: opts.usage()
+
+opt.sign_method = 'native'
+
+from mmgen.protocol import init_coin
+from mmgen.txsign import txsign
+
+ref_dir = os.path.join('test','ref')
+seed_file = os.path.join(ref_dir,'98831F3A.mmwords')
+
+# coin,testnet,subdir,file
+ref_txs = (
+	('btc',False,'',        '0B8D5A[15.31789,14,tl=1320969600].rawtx'),
+	('ltc',False,'litecoin','AF3CDF-LTC[620.76194,1453,tl=1320969600].rawtx'),
+	('bch',False,'',        '460D4D-BCH[10.19764,tl=1320969600].rawtx'),
+	('btc',True, '',        '0C7115[15.86255,14,tl=1320969600].testnet.rawtx'),
+	('ltc',True, 'litecoin','A5A1E0-LTC[1454.64322,1453,tl=1320969600].testnet.rawtx'),
+	('bch',True, '',        '359FD5-BCH[6.68868,tl=1320969600].testnet.rawtx'),
+	('btc',False,'',        '0B8D5A[15.31789,14,tl=1320969600].rawtx'),
+)
+
+def test_key_cache():
+	msg_r('Testing seed key cache... ')
+	from mmgen.addr import SeedKeyCache,KeyAddrList,AddrIdxList
+	from mmgen.seed import Seed
+	from mmgen.obj import MMGenAddrType
+	init_coin('btc')
+	seed = Seed(os.urandom(32))
+	ref = KeyAddrList(seed=seed,addr_idxs=AddrIdxList('3,5,7'),mmtype=MMGenAddrType('C')).data
+	kc = SeedKeyCache(seed)
+	keys = kc.get_keys('C',[5,3])
+	assert [e.sec for e in keys] == [ref[0].sec,ref[1].sec],'incorrect keys'
+	assert not any(e.addr for e in keys),'addresses derived for key-only entries'
+	kal = kc.get_kal('C',[3,7])
+	assert [(e.idx,e.sec,e.addr) for e in kal.data] == [(e.idx,e.sec,e.addr) for e in (ref[0],ref[2])],'incorrect entries'
+	assert not kc.get_keys('C',[5])[0].addr,'address derived for an entry not requested'
+	assert all(a is b for a,b in zip(kc.get_kal('C',[3,7]).data,kal.data)),'entries regenerated'
+	msg('OK')
+
+test_key_cache()
+
+msg(green('Testing native signing of transactions for several coins in one process'))
+for coin,testnet,subdir,fn in ref_txs:
+	msg('{} {}:'.format(coin.upper(),('mainnet','testnet')[testnet]))
+	g.testnet = testnet
+	init_coin(coin)
+	reload(sys.modules['mmgen.tx'])
+	tx = sys.modules['mmgen.tx'].MMGenTX(os.path.join(ref_dir,subdir,fn))
+	tx = txsign(tx,[seed_file],None,None)
+	assert tx.marked_signed(),'{}: transaction not signed'.format(fn)
+msg('OK')
+
+msg(green('Testing rejection of transactions for the wrong chain'))
+for coin,testnet,subdir,fn in ref_txs[:2] + ref_txs[3:5]:
+	msg('{} {} tx, {} selected:'.format(coin.upper(),*[('mainnet','testnet')[i] for i in (testnet,not testnet)]))
+	g.testnet = testnet
+	init_coin(coin)
+	reload(sys.modules['mmgen.tx'])
+	tx = sys.modules['mmgen.tx'].MMGenTX(os.path.join(ref_dir,subdir,fn))
+	g.testnet = not testnet
+	ss,sys.stderr = sys.stderr,StringIO()
+	try:
+		ret = tx.sign('',[])
+	finally:
+		out,sys.stderr = sys.stderr.getvalue(),ss
+	assert ret is False,'{}: transaction signed on the wrong chain'.format(fn)
+	assert 'Transaction is for {}'.format(('mainnet','testnet')[testnet]) in out,out
+	msg('OK')
+g.testnet = False